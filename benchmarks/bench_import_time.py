@@ -0,0 +1,117 @@
+"""
+Cold start cost of the application: time to import it and create one exporter.
+
+Each run is a fresh interpreter started with -X importtime; the median over
+the runs is reported with the modules that took longest to import. The
+command exits with status 1 when the median is above --max-ms, when creating
+the exporter imported another format's module, or when a module that only
+some runs need (process pools, manifests, the HTTP server, the profiler) was
+imported at start.
+
+Run from the repository root:
+    python -m benchmarks.bench_import_time --format csv --runs 20
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+TARGET_MODULE = "json_reader.application"
+EXPORTER_MODULES = {
+    "json": "json_reader.exporters.json_exporter",
+    "ndjson": "json_reader.exporters.json_exporter",
+    "csv": "json_reader.exporters.csv_exporter",
+    "xml": "json_reader.exporters.xml_exporter",
+}
+# Imported only by the runs that use them: --workers, --manifest, --serve and --profile.
+DEFERRED_MODULES = (
+    "multiprocessing", "concurrent.futures.process", "tomllib", "http.server", "cProfile", "tracemalloc",
+    "json_reader.services.batch_runner", "json_reader.services.room_service", "json_reader.services.profiler",
+)
+# Medians on the development machine: 65-80 ms for the application before compression, the parse
+# cache and parallel loading were added, which all normal runs import, and 100-110 ms with them and
+# the exporter. The budget leaves about 20% headroom over that for noisier CI machines.
+DEFAULT_MAX_MS = 130.0
+STARTUP_SCRIPT = """
+import sys
+import {module}
+from json_reader.exporters.exporter_factory import ExporterFactory
+ExporterFactory.create_exporter({format_type!r})
+print(",".join(sorted(name for name in sys.modules if name.startswith("json_reader.exporters."))))
+print(",".join(sorted(name for name in {deferred!r} if name in sys.modules)))
+"""
+
+
+def run_once(format_type: str) -> tuple[dict[str, tuple[int, int]], set[str], set[str]]:
+    """
+    Start a fresh interpreter that imports the application and creates an exporter.
+
+    Returns:
+        tuple: ({module: (self microseconds, cumulative microseconds)}, exporter modules imported,
+        deferred modules imported)
+    """
+    script = STARTUP_SCRIPT.format(module=TARGET_MODULE, format_type=format_type, deferred=DEFERRED_MODULES)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=SOURCE_DIR, capture_output=True, text=True, check=True,
+    )
+    timings = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        timings.setdefault(name.strip(), (int(self_us), int(cumulative_us)))
+    exporter_modules, deferred_modules = completed.stdout.split("\n")[:2]
+    return timings, set(filter(None, exporter_modules.split(","))), set(filter(None, deferred_modules.split(",")))
+
+
+def total_microseconds(timings: dict[str, tuple[int, int]]) -> int:
+    """Import time of the application and of the exporter module imported after it."""
+    exporter_time = sum(
+        cumulative for name, (_, cumulative) in timings.items() if name in EXPORTER_MODULES.values()
+    )
+    return timings[TARGET_MODULE][1] + exporter_time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="measure application import time")
+    parser.add_argument("--format", dest="format_type", choices=sorted(EXPORTER_MODULES), default="json")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=15, help="number of slowest modules listed")
+    parser.add_argument("--max-ms", type=float, default=DEFAULT_MAX_MS, help="fail when the median is above this")
+    arguments = parser.parse_args()
+
+    runs = [run_once(arguments.format_type) for _ in range(arguments.runs)]
+    runs.sort(key=lambda run: total_microseconds(run[0]))
+    median_timings, exporter_modules, deferred_modules = runs[len(runs) // 2]
+    median_ms = statistics.median(total_microseconds(timings) for timings, _, _ in runs) / 1000
+
+    print(f"import {TARGET_MODULE} + create {arguments.format_type} exporter: "
+          f"median {median_ms:.1f} ms over {arguments.runs} runs")
+    print(f"{'self ms':>8} {'total ms':>9}  module")
+    slowest = sorted(median_timings.items(), key=lambda item: item[1][0], reverse=True)[:arguments.top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"{self_us / 1000:8.1f} {cumulative_us / 1000:9.1f}  {name}")
+
+    failed = False
+    unexpected = {
+        module for module in exporter_modules
+        if module in EXPORTER_MODULES.values() and module != EXPORTER_MODULES[arguments.format_type]
+    }
+    if unexpected:
+        print(f"FAIL other exporter modules were imported: {', '.join(sorted(unexpected))}")
+        failed = True
+    if deferred_modules:
+        print(f"FAIL modules only some runs need were imported at start: {', '.join(sorted(deferred_modules))}")
+        failed = True
+    if median_ms > arguments.max_ms:
+        print(f"FAIL median {median_ms:.1f} ms is above {arguments.max_ms:.1f} ms")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
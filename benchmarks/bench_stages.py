@@ -0,0 +1,254 @@
+"""
+Throughput and peak memory of each pipeline stage on synthetic data.
+
+Every stage runs in a fresh interpreter, so its peak RSS is not inflated by
+the stages before it. Its input is built in that interpreter before the
+measurement; on Linux the kernel's peak RSS is reset after that, so the
+stage RSS is the peak reached while the stage runs over the memory already
+in use. Elsewhere the peak cannot be reset, and a stage only shows memory
+growth beyond the peak reached while its input was built. The results are written as JSON; given a baseline
+written by an earlier run, the suite exits with status 1 when a stage got
+slower or needs more memory than the allowed margin.
+
+Run from the repository root:
+    python -m benchmarks.bench_stages --students 1000000 --rooms 2000 --skew 2 --output results.json
+    python -m benchmarks.bench_stages --students 1000000 --rooms 2000 --skew 2 --baseline results.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import resource
+import sys
+import tempfile
+import time
+from collections import deque
+from typing import Any, Callable
+
+from benchmarks.synthetic_data import add_dataset_arguments, dataset_options, write_dataset
+from src.json_reader.exporters.exporter_factory import ExporterFactory
+from src.json_reader.exporters.parallel_exporter import ParallelExporter
+from src.json_reader.services.data_combiner import DataCombiner
+from src.json_reader.services.data_filter import DataFilter
+from src.json_reader.services.file_loader import FileLoader
+from src.json_reader.services.rejection_sink import RejectionSink
+
+EXPORT_FORMATS = ("json", "xml", "ndjson", "csv")
+PARALLEL_EXPORT_FORMATS = ("json", "xml")
+PARALLEL_SUFFIX = "_parallel"
+STAGES = (
+    ("file_loader", "data_filter", "data_combiner")
+    + tuple(f"export_{name}" for name in EXPORT_FORMATS)
+    + tuple(f"export_{name}{PARALLEL_SUFFIX}" for name in PARALLEL_EXPORT_FORMATS)
+)
+
+DEFAULT_MAX_SLOWDOWN = 0.2
+DEFAULT_MAX_MEMORY_GROWTH = 0.2
+# Peak RSS moves in page-sized steps and with allocator noise; smaller growth is never a regression.
+MEMORY_SLACK_BYTES = 8 * 1024 * 1024
+RESULT_POLL_SECONDS = 1.0
+PROC_STATUS_PATH = "/proc/self/status"
+PROC_CLEAR_REFS_PATH = "/proc/self/clear_refs"
+# writing this to clear_refs resets the peak RSS (VmHWM) to the current RSS
+RESET_PEAK_RSS = "5"
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def proc_rss_bytes() -> tuple[int, int] | None:
+    """Current and peak resident set size from /proc, or None where it is not available."""
+    sizes = {}
+    try:
+        with open(PROC_STATUS_PATH, encoding="ascii") as file:
+            for line in file:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "VmHWM"):
+                    sizes[key] = int(value.split()[0]) * 1024
+    except (OSError, ValueError):
+        return None
+    return (sizes["VmRSS"], sizes["VmHWM"]) if len(sizes) == 2 else None
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's peak RSS of this process to its current RSS; return False where that is not possible."""
+    try:
+        with open(PROC_CLEAR_REFS_PATH, "w", encoding="ascii") as file:
+            file.write(RESET_PEAK_RSS)
+    except OSError:
+        return False
+    return proc_rss_bytes() is not None
+
+
+def consume(iterable) -> None:
+    """Exhaust an iterable without keeping its items."""
+    deque(iterable, maxlen=0)
+
+
+def load_valid(path: str, data_type: str) -> list[dict]:
+    return list(DataFilter.filter_data(FileLoader.load_file_data(path), data_type, sink=RejectionSink(0)))
+
+
+def prepare_stage(stage: str, students_path: str, rooms_path: str, output_dir: str) -> tuple[Callable[[], Any], int]:
+    """
+    Build the input of a stage outside the measurement.
+
+    Returns:
+        tuple: (function running the stage and returning the bytes it wrote, number of records it handles)
+    """
+    if stage == "file_loader":
+        return lambda: consume(FileLoader.load_file_data(students_path)), 0
+
+    if stage == "data_filter":
+        students = list(FileLoader.load_file_data(students_path))
+        return lambda: consume(DataFilter.filter_data(iter(students), "student", sink=RejectionSink(0))), len(students)
+
+    students = load_valid(students_path, "student")
+    rooms = load_valid(rooms_path, "room")
+    if stage == "data_combiner":
+        return lambda: consume(DataCombiner.combine_students_with_rooms(iter(students), iter(rooms))), len(students)
+
+    combined = list(DataCombiner.combine_students_with_rooms(iter(students), iter(rooms)))
+    format_type = stage.removeprefix("export_").removesuffix(PARALLEL_SUFFIX)
+    exporter = ExporterFactory.create_exporter(format_type)
+    output_path = os.path.join(output_dir, "rooms" + exporter.extension)
+    # Parallel stages render on one process per CPU; the wall time is what scales, not cpu_seconds.
+    target = ParallelExporter(exporter, os.cpu_count() or 1) if stage.endswith(PARALLEL_SUFFIX) else exporter
+
+    def export() -> int:
+        target.export_file(iter(combined), output_path)
+        return os.path.getsize(output_path)
+
+    return export, len(students)
+
+
+def run_stage(stage: str, students_path: str, rooms_path: str, output_dir: str, results) -> None:
+    """Measure one stage; runs in a child process and sends its result back."""
+    run, records = prepare_stage(stage, students_path, rooms_path, output_dir)
+    peak_reset = reset_peak_rss()
+    rss_before = proc_rss_bytes()[0] if peak_reset else peak_rss_bytes()
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    bytes_written = run() or 0
+    seconds, cpu_seconds = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+    if stage == "file_loader":
+        records = sum(1 for _ in FileLoader.load_file_data(students_path))
+    peak = peak_rss_bytes()
+    stage_peak = proc_rss_bytes()[1] if peak_reset else peak
+    results.put({
+        "seconds": seconds,
+        "cpu_seconds": cpu_seconds,
+        "records": records,
+        "records_per_second": records / seconds if seconds else 0.0,
+        "bytes_in": os.path.getsize(students_path) if stage == "file_loader" else 0,
+        "bytes_out": bytes_written,
+        "peak_rss_bytes": peak,
+        "stage_rss_bytes": max(stage_peak - rss_before, 0),
+    })
+
+
+def wait_for_result(stage: str, process: multiprocessing.Process, results) -> dict:
+    """Wait for the result of a stage process, failing instead of hanging if it dies without one."""
+    while True:
+        try:
+            return results.get(timeout=RESULT_POLL_SECONDS)
+        except queue.Empty:
+            if process.is_alive():
+                continue
+        # The result may have been sent just before the process exited.
+        try:
+            return results.get(timeout=RESULT_POLL_SECONDS)
+        except queue.Empty:
+            process.join()
+            raise RuntimeError(f"stage {stage} exited with code {process.exitcode} without a result")
+
+
+def measure(stage: str, students_path: str, rooms_path: str, output_dir: str, repeat: int) -> dict:
+    """Run a stage repeat times in fresh processes and keep the fastest run."""
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    for _ in range(repeat):
+        results = context.Queue()
+        process = context.Process(target=run_stage, args=(stage, students_path, rooms_path, output_dir, results))
+        process.start()
+        runs.append(wait_for_result(stage, process, results))
+        process.join()
+        if process.exitcode:
+            raise RuntimeError(f"stage {stage} failed with exit code {process.exitcode}")
+    return min(runs, key=lambda run: run["seconds"])
+
+
+def find_regressions(results: dict, baseline: dict, max_slowdown: float, max_memory_growth: float) -> list[str]:
+    """Describe every stage slower or bigger than its baseline allows."""
+    if results["dataset"] != baseline["dataset"]:
+        return [f"baseline dataset {baseline['dataset']} differs from {results['dataset']}"]
+
+    regressions = []
+    for stage, current in results["stages"].items():
+        previous = baseline["stages"].get(stage)
+        if previous is None:
+            continue
+        if current["seconds"] > previous["seconds"] * (1 + max_slowdown):
+            regressions.append(
+                f"{stage}: {current['seconds']:.3f}s vs baseline {previous['seconds']:.3f}s "
+                f"(allowed +{max_slowdown:.0%})"
+            )
+        allowed_rss = previous["stage_rss_bytes"] * (1 + max_memory_growth) + MEMORY_SLACK_BYTES
+        if current["stage_rss_bytes"] > allowed_rss:
+            regressions.append(
+                f"{stage}: {current['stage_rss_bytes'] / 1e6:.1f} MB vs baseline "
+                f"{previous['stage_rss_bytes'] / 1e6:.1f} MB (allowed +{max_memory_growth:.0%})"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="benchmark every pipeline stage")
+    add_dataset_arguments(parser)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--data-dir", default=None, help="keep the generated files here instead of a temp dir")
+    parser.add_argument("--output", default=None, help="write the results as JSON")
+    parser.add_argument("--baseline", default=None, help="results of an earlier run to compare against")
+    parser.add_argument("--max-slowdown", type=float, default=DEFAULT_MAX_SLOWDOWN)
+    parser.add_argument("--max-memory-growth", type=float, default=DEFAULT_MAX_MEMORY_GROWTH)
+    arguments = parser.parse_args()
+
+    options = dataset_options(arguments)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        students_path, rooms_path = write_dataset(arguments.data_dir or temp_dir, options)
+        stages = {}
+        for stage in arguments.stages:
+            stages[stage] = measure(stage, students_path, rooms_path, temp_dir, arguments.repeat)
+            result = stages[stage]
+            print(f"{stage:20} {result['seconds']:8.3f}s {result['records_per_second']:12.0f} records/s "
+                  f"{result['stage_rss_bytes'] / 1e6:8.1f} MB stage RSS {result['peak_rss_bytes'] / 1e6:8.1f} MB peak")
+
+    results = {
+        "dataset": options._asdict(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "stages": stages,
+    }
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if arguments.baseline:
+        with open(arguments.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = find_regressions(results, baseline, arguments.max_slowdown, arguments.max_memory_growth)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compare the streaming XMLExporter with the ElementTree reference exporter.
+
+Run from the repository root:
+    python -m benchmarks.bench_xml_exporter --rooms 2000 --students-per-room 500
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from src.json_reader.exporters.exporter import ElementTreeXMLExporter, XMLExporter
+
+
+def make_rooms(room_count: int, students_per_room: int) -> list[dict]:
+    """Build combined room records with escapable characters in some names."""
+    return [
+        {
+            "id": room_id,
+            "name": f"Room {room_id}" if room_id % 10 else f"R&D <{room_id}>",
+            "students": [
+                {"id": room_id * students_per_room + index, "name": f"Student {index} Ünïcode"}
+                for index in range(students_per_room)
+            ],
+        }
+        for room_id in range(room_count)
+    ]
+
+
+def time_export(exporter, rooms: list[dict], output_path: str) -> float:
+    """Export the rooms once and return the elapsed seconds."""
+    start = time.perf_counter()
+    exporter.export_file((room for room in rooms), output_path)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="benchmark XML exporters")
+    parser.add_argument("--rooms", type=int, default=1000)
+    parser.add_argument("--students-per-room", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args()
+
+    rooms = make_rooms(arguments.rooms, arguments.students_per_room)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        streaming_path = os.path.join(temp_dir, "streaming.xml")
+        reference_path = os.path.join(temp_dir, "reference.xml")
+
+        reference = min(time_export(ElementTreeXMLExporter(), rooms, reference_path) for _ in range(arguments.repeat))
+        streaming = min(time_export(XMLExporter(), rooms, streaming_path) for _ in range(arguments.repeat))
+
+        identical = Path(streaming_path).read_bytes() == Path(reference_path).read_bytes()
+        size = os.path.getsize(streaming_path)
+
+    print(f"ElementTree: {reference:.3f}s ({size / reference / 1e6:.1f} MB/s)")
+    print(f"streaming:   {streaming:.3f}s ({size / streaming / 1e6:.1f} MB/s)")
+    print(f"speedup:     {reference / streaming:.2f}x, byte-identical: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Deterministic synthetic student and room files.
+
+The same options and seed always produce the same bytes, so benchmark runs
+compare like with like. Students are streamed to disk, which keeps memory flat
+even for tens of millions of records.
+
+Run from the repository root:
+    python -m benchmarks.synthetic_data --students 10000000 --rooms 20000 --skew 2 --output-dir data/
+"""
+import argparse
+import json
+import os
+import random
+from typing import NamedTuple
+
+ASCII_SYLLABLES = ("an", "be", "co", "da", "el", "fi", "go", "ha", "ir", "jo", "ka", "lu", "mi", "no", "or", "pa")
+UNICODE_SYLLABLES = ("Ål", "ñe", "Zoë", "Łu", "Çe", "δα", "Жо", "李", "明", "さく", "ら", "한", "글", "𝒜", "é", "ü")
+
+# Each invalid student breaks one rule: a negative id, an empty name, a non-integer room or a missing room.
+INVALID_STUDENTS = (
+    '{{"id": {negative_id}, "name": {name}, "room": {room}}}',
+    '{{"id": {id}, "name": "", "room": {room}}}',
+    '{{"id": {id}, "name": {name}, "room": "{room}"}}',
+    '{{"id": {id}, "name": {name}}}',
+)
+VALID_STUDENT = '{{"id": {id}, "name": {name}, "room": {room}}}'
+VALID_ROOM = '{{"id": {id}, "name": {name}}}'
+
+WRITE_CHUNK_RECORDS = 10_000
+
+
+class DatasetOptions(NamedTuple):
+    """Shape of a synthetic dataset."""
+
+    students: int = 100_000
+    rooms: int = 1_000
+    skew: float = 1.0
+    invalid_ratio: float = 0.0
+    name_length: int = 12
+    unicode_names: bool = False
+    seed: int = 0
+
+
+def make_name(rng: random.Random, length: int, unicode_names: bool) -> str:
+    """Build a name of about length characters from random syllables."""
+    syllables = UNICODE_SYLLABLES if unicode_names else ASCII_SYLLABLES
+    parts = []
+    size = 0
+    while size < length:
+        syllable = rng.choice(syllables)
+        parts.append(syllable)
+        size += len(syllable)
+    return "".join(parts).capitalize()
+
+
+def pick_room(rng: random.Random, rooms: int, skew: float) -> int:
+    """
+    Pick a room id in [0, rooms).
+
+    A skew of 1 spreads students evenly; larger values crowd them into the
+    low room ids, e.g. with skew 3 half of the students share the first 12.5%
+    of the rooms.
+    """
+    return min(rooms - 1, int(rooms * rng.random() ** skew))
+
+
+def write_rooms(path: str, options: DatasetOptions) -> None:
+    """Write options.rooms valid rooms as a JSON array."""
+    rng = random.Random(f"rooms-{options.seed}")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("[")
+        file.write(", ".join(
+            VALID_ROOM.format(
+                id=room_id,
+                name=json.dumps(make_name(rng, options.name_length, options.unicode_names), ensure_ascii=False),
+            )
+            for room_id in range(options.rooms)
+        ))
+        file.write("]")
+
+
+def write_students(path: str, options: DatasetOptions) -> int:
+    """
+    Stream options.students students to a JSON array file.
+
+    Returns:
+        int: Number of invalid students written
+    """
+    rng = random.Random(f"students-{options.seed}")
+    invalid = 0
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("[")
+        for start in range(0, options.students, WRITE_CHUNK_RECORDS):
+            records = []
+            for student_id in range(start, min(start + WRITE_CHUNK_RECORDS, options.students)):
+                name = json.dumps(make_name(rng, options.name_length, options.unicode_names), ensure_ascii=False)
+                room = pick_room(rng, options.rooms, options.skew)
+                if rng.random() < options.invalid_ratio:
+                    template = INVALID_STUDENTS[invalid % len(INVALID_STUDENTS)]
+                    invalid += 1
+                else:
+                    template = VALID_STUDENT
+                records.append(template.format(id=student_id, negative_id=-student_id - 1, name=name, room=room))
+            if start:
+                file.write(", ")
+            file.write(", ".join(records))
+        file.write("]")
+    return invalid
+
+
+def write_dataset(directory: str, options: DatasetOptions) -> tuple[str, str]:
+    """
+    Write students.json and rooms.json into directory.
+
+    Returns:
+        tuple: (students path, rooms path)
+    """
+    os.makedirs(directory, exist_ok=True)
+    students_path = os.path.join(directory, "students.json")
+    rooms_path = os.path.join(directory, "rooms.json")
+    write_rooms(rooms_path, options)
+    write_students(students_path, options)
+    return students_path, rooms_path
+
+
+def add_dataset_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the DatasetOptions flags to a parser."""
+    defaults = DatasetOptions()
+    parser.add_argument("--students", type=int, default=defaults.students)
+    parser.add_argument("--rooms", type=int, default=defaults.rooms)
+    parser.add_argument("--skew", type=float, default=defaults.skew,
+                        help="1 spreads students evenly over rooms, larger values crowd the first rooms")
+    parser.add_argument("--invalid-ratio", type=float, default=defaults.invalid_ratio,
+                        help="fraction of students breaking a validation rule")
+    parser.add_argument("--name-length", type=int, default=defaults.name_length)
+    parser.add_argument("--unicode-names", action="store_true")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def dataset_options(arguments: argparse.Namespace) -> DatasetOptions:
+    """Build DatasetOptions from parsed add_dataset_arguments flags."""
+    return DatasetOptions(
+        arguments.students, arguments.rooms, arguments.skew, arguments.invalid_ratio,
+        arguments.name_length, arguments.unicode_names, arguments.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="write synthetic student and room files")
+    add_dataset_arguments(parser)
+    parser.add_argument("--output-dir", default="benchmark-data")
+    arguments = parser.parse_args()
+
+    students_path, rooms_path = write_dataset(arguments.output_dir, dataset_options(arguments))
+    print(f"wrote {students_path} ({os.path.getsize(students_path)} bytes) and {rooms_path}")
+
+
+if __name__ == "__main__":
+    main()
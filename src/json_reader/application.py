@@ -1,40 +1,246 @@
+from __future__ import annotations
+
 import logging
+from collections.abc import Iterator
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
 
+from .exporters.exporter import Exporter
 from .exporters.exporter_factory import ExporterFactory
-from .services.cli_parser import CLIParser
+from .services.cli_parser import CLIArguments, CLIParser
 from .services.data_combiner import DataCombiner
-from .services.data_filter import DataFilter
+from .services.deduplicator import Deduplicator
 from .services.file_loader import FileLoader
+from .services.join_planner import JoinPlanner
+from .services.parallel_loader import ParallelLoader
+from .services.parse_cache import ParseCache
+from .services.metrics import RunMetrics
+from .services.pipeline import Pipeline
+from .services.rejection_sink import RejectionSink
+from .services.room_selection import RoomSelection
+from .constants.batch_constants import BatchConstants
+from .constants.cache_constants import CacheConstants
 from .constants.errors_messages import ErrorMessages
+from .constants.exporter_constants import ExporterConstants
+from .constants.loader_constants import LoaderConstants
+from .constants.metrics_constants import MetricsConstants
+from .constants.pipeline_constants import PipelineConstants
+from .constants.profiler_constants import ProfilerConstants
+
+if TYPE_CHECKING:
+    from .services.batch_runner import SharedRoomFiles
+    from .services.profiler import Profiler
 
 logging.getLogger().setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def start_application() -> None:
+def start_application() -> int:
     """
     Run the main application workflow:
     1. Parse CLI arguments.
     2. Load input data from files.
     3. Combine students with rooms.
     4. Export the result in the specified format.
+
+    With --manifest, steps 2 to 4 run once per job of the manifest. With
+    --serve, the loaded and combined data is served until interrupted.
+
+    Returns:
+        int: Exit status, non-zero if a batch job failed
     """
     try:
-        student_file, room_file, output_format, output_destination = (
-            CLIParser.parse_cli()
-        )
-        logger.info(student_file, room_file, output_format, output_destination)
+        arguments = CLIParser.parse_cli()
+        if arguments.serve_address:
+            # Imported here so that exports do not pay for the HTTP server.
+            from .services.room_service import RoomService
 
-        rooms = DataFilter.filter_data(FileLoader.load_file_data(room_file), "room")
+            RoomService(arguments).serve_forever()
+            return BatchConstants.EXIT_SUCCESS
 
-        students = DataFilter.filter_data(
-            FileLoader.load_file_data(student_file), "student"
-        )
+        if arguments.manifest:
+            # Imported here so that single exports do not pay for tomllib and process pools.
+            from .services.batch_runner import BatchRunner
 
-        combined_data = DataCombiner.combine_students_with_rooms(students, rooms)
+            # Jobs would overwrite each other's metrics and profiles; each job may set its own instead.
+            jobs = BatchRunner.load_manifest(arguments.manifest, arguments._replace(metrics=None, profile=None))
+            results = BatchRunner.run(jobs, arguments.batch_workers, run_job)
+            return BatchRunner.exit_status(results)
 
-        exporter = ExporterFactory.create_exporter(output_format)
-        exporter.export_file(combined_data, output_destination)
+        logger.info(
+            LoaderConstants.LOG_STARTING,
+            arguments.student_file_path,
+            arguments.room_file_path,
+            arguments.output_format,
+            arguments.output_destination,
+        )
+        run_job(arguments)
+        return BatchConstants.EXIT_SUCCESS
     except Exception as e:
         logger.error(ErrorMessages.APPLICATION_FAILED.format(e))
         raise
+
+
+def run_job(arguments: CLIArguments, shared_rooms: SharedRoomFiles | None = None) -> None:
+    """
+    Load, combine and export the files of one job.
+
+    Args:
+        arguments: Validated options of the job
+        shared_rooms: Rooms already loaded by earlier jobs of a batch worker
+    """
+    if not arguments.profile:
+        _run_stages(arguments, shared_rooms, None)
+        return
+
+    # Imported here so that runs without --profile do not pay for cProfile and tracemalloc.
+    from .services.profiler import Profiler
+
+    with Profiler(arguments.profile, arguments.profile_dir) as profiler:
+        _run_stages(arguments, shared_rooms, profiler)
+
+
+def _run_stages(arguments: CLIArguments, shared_rooms: SharedRoomFiles | None, profiler: Profiler | None) -> None:
+    """Run one job; with a memory profiler, checkpoints are taken between loading, grouping and exporting."""
+    backend = FileLoader.resolve_backend(arguments.ijson_backend)
+    logger.info(LoaderConstants.LOG_IJSON_BACKEND.format(backend))
+
+    cache = None
+    if arguments.use_cache:
+        try:
+            cache = ParseCache(arguments.cache_dir, arguments.cache_max_size)
+        except OSError as e:
+            logger.warning(CacheConstants.LOG_CACHE_UNAVAILABLE, arguments.cache_dir, e)
+
+    selection = RoomSelection.from_arguments(arguments.room_ids, arguments.room_id_range, arguments.room_name_prefix)
+    sink = RejectionSink(arguments.rejection_sample_rate, arguments.quarantine_file)
+    metrics = RunMetrics() if arguments.metrics else None
+    pipeline = None
+    if arguments.pipeline:
+        pipeline = Pipeline(arguments.pipeline_queue_depth, arguments.stage_queue_depths, arguments.pipeline_batch_size)
+    try:
+        if shared_rooms is not None:
+            # Shared rooms are kept whole, so that jobs selecting different rooms can use them.
+            rooms = shared_rooms.load(arguments, sink, cache)
+            if selection is not None:
+                rooms = selection.select(rooms, "room", sink, arguments.validation_batch_size)
+        else:
+            rooms = ParallelLoader.load_valid_data(
+                arguments.room_file_path, "room",
+                arguments.workers, arguments.preserve_order,
+                backend, arguments.read_buffer_size, arguments.use_mmap,
+                arguments.validation_batch_size, sink, cache, selection,
+            )
+
+        student_selection = None
+        if selection is not None:
+            rooms, student_selection = selection.for_students(rooms)
+
+        students = ParallelLoader.load_valid_data(
+            arguments.student_file_path, "student",
+            arguments.workers, arguments.preserve_order,
+            backend, arguments.read_buffer_size, arguments.use_mmap,
+            arguments.validation_batch_size, sink, cache, student_selection,
+        )
+
+        deduplicator = None
+        if arguments.dedup_policy:
+            deduplicator = Deduplicator(arguments.dedup_policy, sink)
+            rooms = deduplicator.deduplicate(rooms, "room")
+            students = deduplicator.deduplicate(students, "student")
+
+        if profiler is not None:
+            students = profiler.checkpoint_after(students, ProfilerConstants.STUDENTS_LOADED_CHECKPOINT)
+
+        if metrics is not None:
+            metrics.add_file_size(arguments.room_file_path)
+            metrics.add_file_size(arguments.student_file_path)
+            rooms = metrics.track(MetricsConstants.LOAD_ROOMS_STAGE, rooms, MetricsConstants.ROOMS_VALID_COUNTER)
+            students = metrics.track(
+                MetricsConstants.LOAD_STUDENTS_STAGE, students, MetricsConstants.STUDENTS_VALID_COUNTER
+            )
+
+        if pipeline is not None:
+            # Rooms load while students are grouped, and the export writes while rooms are combined.
+            rooms = pipeline.stage(PipelineConstants.ROOMS_STAGE, rooms)
+            students = pipeline.stage(PipelineConstants.STUDENTS_STAGE, students)
+
+        strategy = JoinPlanner.plan(
+            arguments.student_file_path, arguments.room_file_path, arguments.sorted_by_room, arguments.max_memory
+        )
+        combined_data = DataCombiner.combine_students_with_rooms(
+            students, rooms, arguments.max_memory, strategy
+        )
+
+        if profiler is not None:
+            combined_data = profiler.checkpoint_before(combined_data, ProfilerConstants.GROUPED_CHECKPOINT)
+
+        if metrics is not None:
+            combined_data = metrics.track(
+                MetricsConstants.COMBINE_STAGE, combined_data, MetricsConstants.ROOMS_EMITTED_COUNTER,
+                (ExporterConstants.STUDENTS_FIELD, MetricsConstants.STUDENTS_EMITTED_COUNTER),
+            )
+
+        if pipeline is not None:
+            combined_data = pipeline.stage(PipelineConstants.COMBINE_STAGE, combined_data)
+
+        exporter_options = {"write_chunk_size": arguments.write_chunk_size}
+        if arguments.compact_json:
+            exporter_options["compact"] = True
+        exporter = ExporterFactory.create_exporter(arguments.output_format, **exporter_options)
+        with metrics.measure(MetricsConstants.EXPORT_STAGE) if metrics is not None else nullcontext():
+            output_paths = export(exporter, combined_data, arguments)
+        sink.log_summary()
+        if deduplicator is not None:
+            deduplicator.log_summary()
+        if metrics is not None:
+            for output_path in output_paths:
+                metrics.add_file_size(output_path, output=True)
+            metrics.write(arguments.metrics, sink)
+    finally:
+        if pipeline is not None:
+            pipeline.close()
+        sink.close()
+
+
+def export(exporter: Exporter, combined_data: Iterator[dict], arguments: CLIArguments) -> list[str]:
+    """
+    Write combined rooms as the full output, shards, a patched output or a delta file, as arguments ask.
+
+    Returns:
+        list: Paths of the files written
+    """
+    if arguments.shards or arguments.max_shard_size:
+        # Imported here so that single-file exports do not pay for the writer pool.
+        from .exporters.sharded_exporter import ShardedExporter
+
+        shards = ShardedExporter(exporter, arguments.shards, arguments.max_shard_size).export_file(
+            combined_data, arguments.output_destination
+        )
+        return [shard.path for shard in shards]
+
+    if not arguments.incremental_state:
+        if arguments.export_workers > 1:
+            # Imported here so that single-process exports do not pay for the process pool.
+            from .exporters.parallel_exporter import ParallelExporter
+
+            ParallelExporter(exporter, arguments.export_workers).export_file(
+                combined_data, arguments.output_destination
+            )
+        else:
+            exporter.export_file(combined_data, arguments.output_destination)
+        return [exporter.last_output_path]
+
+    # Imported here so that full exports do not pay for hashing and memory mapping.
+    from .exporters.incremental_exporter import IncrementalExporter
+
+    if arguments.delta_file:
+        IncrementalExporter(exporter, arguments.incremental_state).export_delta(
+            combined_data, arguments.delta_file
+        )
+        return [arguments.delta_file]
+
+    IncrementalExporter(exporter, arguments.incremental_state).export_file(
+        combined_data, arguments.output_destination
+    )
+    return [exporter.last_output_path]
@@ -0,0 +1,22 @@
+class BatchConstants:
+    JOBS_FIELD = "jobs"
+    NAME_FIELD = "name"
+    TOML_EXTENSION = ".toml"
+
+    REQUIRED_FIELDS = ("student_file_path", "room_file_path", "output_destination")
+    PATH_FIELDS = (
+        "student_file_path", "room_file_path", "output_destination",
+        "quarantine_file", "cache_dir", "incremental_state", "delta_file", "metrics",
+        "profile_dir",
+    )
+    SIZE_FIELDS = ("max_memory", "read_buffer_size", "write_chunk_size", "cache_max_size", "max_shard_size")
+    BATCH_ONLY_FIELDS = ("manifest", "batch_workers", "serve_address", "watch_interval")
+
+    SHARED_ROOM_FILES = 8
+
+    EXIT_SUCCESS = 0
+    EXIT_FAILURE = 1
+
+    LOG_JOB_SUCCEEDED = "job %s succeeded in %.3fs"
+    LOG_JOB_FAILED = "job %s failed after %.3fs: %s"
+    LOG_BATCH_SUMMARY = "%d of %d job(s) succeeded"
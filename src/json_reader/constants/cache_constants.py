@@ -0,0 +1,25 @@
+import os
+
+
+class CacheConstants:
+    DIR_ENV_VAR = "JSON_READER_CACHE_DIR"
+    DEFAULT_DIR = os.path.join("~", ".cache", "json_reader")
+    DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+    FORMAT_VERSION = 2
+    MARSHAL_VERSION = 4
+    # records marshalled together; an entry is a series of blocks, a trailer and the trailer's offset
+    BLOCK_SIZE = 4096
+    TRAILER_OFFSET_BYTES = 8
+    HASH_CHUNK_SIZE = 1024 * 1024
+    ENTRY_SUFFIX = ".records"
+    KEY_SUFFIX = ".key"
+    TEMP_SUFFIX = ".tmp"
+
+    LOG_CACHE_HIT = "loaded %d %s record(s) of %s from the parse cache"
+    LOG_CACHE_STORED = "cached %d %s record(s) of %s (%d bytes)"
+    LOG_CACHE_UNCACHEABLE = "%s records of %s cannot be cached: %s"
+    LOG_CACHE_TOO_LARGE = "%s records of %s are not cached: they take more than the cache size of %d bytes"
+    LOG_CACHE_WRITE_FAILED = "could not write parse cache file %s: %s"
+    LOG_CACHE_UNAVAILABLE = "parse cache directory %s is unusable, running without cache: %s"
+    LOG_CACHE_EVICTED = "evicted %d parse cache entries (%d bytes)"
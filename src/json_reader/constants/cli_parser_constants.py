@@ -4,9 +4,62 @@ class CLIParserConstants:
     ROOM_FILE_PATH_ARG = "--room-file-path"
     OUTPUT_FORMAT_ARG = "--output-format"
     OUTPUT_DESTINATION_ARG = "--output-destination"
+    MAX_MEMORY_ARG = "--max-memory"
+    WORKERS_ARG = "--workers"
+    UNORDERED_ARG = "--unordered"
+    IJSON_BACKEND_ARG = "--ijson-backend"
+    READ_BUFFER_SIZE_ARG = "--read-buffer-size"
+    MMAP_ARG = "--mmap"
+    VALIDATION_BATCH_SIZE_ARG = "--validation-batch-size"
+    REJECTION_SAMPLE_RATE_ARG = "--rejection-sample-rate"
+    QUARANTINE_FILE_ARG = "--quarantine-file"
+    WRITE_CHUNK_SIZE_ARG = "--write-chunk-size"
+    COMPACT_JSON_ARG = "--compact-json"
+    NO_CACHE_ARG = "--no-cache"
+    CACHE_DIR_ARG = "--cache-dir"
+    CACHE_MAX_SIZE_ARG = "--cache-max-size"
+    INCREMENTAL_STATE_ARG = "--incremental-state"
+    DELTA_FILE_ARG = "--delta-file"
+    PIPELINE_ARG = "--pipeline"
+    PIPELINE_QUEUE_DEPTH_ARG = "--pipeline-queue-depth"
+    STAGE_QUEUE_DEPTH_ARG = "--stage-queue-depth"
+    PIPELINE_BATCH_SIZE_ARG = "--pipeline-batch-size"
+    STAGE_QUEUE_DEPTH_SEPARATOR = "="
+    ROOM_IDS_SEPARATOR = ","
+    ROOM_ID_RANGE_SEPARATOR = "-"
+    MANIFEST_ARG = "--manifest"
+    BATCH_WORKERS_ARG = "--batch-workers"
+    METRICS_ARG = "--metrics"
+    PROFILE_ARG = "--profile"
+    PROFILE_DIR_ARG = "--profile-dir"
+    SERVE_ARG = "--serve"
+    WATCH_INTERVAL_ARG = "--watch-interval"
+    SORTED_BY_ROOM_ARG = "--sorted-by-room"
+    DEDUP_ARG = "--dedup"
+    SHARDS_ARG = "--shards"
+    MAX_SHARD_SIZE_ARG = "--max-shard-size"
+    EXPORT_WORKERS_ARG = "--export-workers"
+    ROOM_IDS_ARG = "--room-ids"
+    ROOM_ID_RANGE_ARG = "--room-id-range"
+    ROOM_NAME_PREFIX_ARG = "--room-name-prefix"
+
+    MEMORY_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
 
     XML_EXTENSION = ".xml"
     JSON_EXTENSION = ".json"
+    NDJSON_EXTENSION = ".ndjson"
+    CSV_EXTENSION = ".csv"
 
     XML_FILE_TYPE = "xml"
     JSON_FILE_TYPE = "json"
+    NDJSON_FILE_TYPE = "ndjson"
+    CSV_FILE_TYPE = "csv"
+
+    DEFAULT_FILE_TYPE = JSON_FILE_TYPE
+    FILE_TYPE_EXTENSIONS = {
+        JSON_FILE_TYPE: JSON_EXTENSION,
+        XML_FILE_TYPE: XML_EXTENSION,
+        NDJSON_FILE_TYPE: NDJSON_EXTENSION,
+        CSV_FILE_TYPE: CSV_EXTENSION,
+    }
+    JSON_ENCODED_FILE_TYPES = (JSON_FILE_TYPE, NDJSON_FILE_TYPE)
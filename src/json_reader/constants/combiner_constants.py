@@ -0,0 +1,23 @@
+class CombinerConstants:
+    SPILL_DIRECTORY_PREFIX = "json_reader_spill_"
+    SPILL_RUN_FILE_NAME = "run_{}.pkl"
+    SPILL_MERGED_FILE_NAME = "merged.pkl"
+
+    # rough per-student cost of a buffered (room_id, id, name) entry, excluding the name itself
+    STUDENT_ENTRY_OVERHEAD_BYTES = 160
+    MIN_RUN_SIZE = 1024
+    # runs merged at once, so that a small budget on a large input stays within the open-file limit
+    MAX_MERGE_FAN_IN = 64
+
+    COMPACT_BATCH_SIZE = 4096
+    NAME_ENCODING = "utf-8"
+    NAME_ENCODING_ERRORS = "surrogatepass"
+
+    HASH_STUDENTS_STRATEGY = "hash-students"
+    HASH_ROOMS_STRATEGY = "hash-rooms"
+    MERGE_STRATEGY = "merge"
+    SPILL_STRATEGY = "spill"
+
+    # rooms are only held in memory when their file is this many times smaller than the students file
+    MIN_HASH_ROOMS_SIZE_RATIO = 4
+    LOG_JOIN_STRATEGY = "joining %s (%d bytes) with %s (%d bytes) using the %s strategy"
@@ -0,0 +1,17 @@
+class CompressionConstants:
+    GZIP = "gzip"
+    BZIP2 = "bz2"
+    XZ = "xz"
+
+    EXTENSIONS = {".gz": GZIP, ".bz2": BZIP2, ".xz": XZ}
+    MAGIC_BYTES = {
+        b"\x1f\x8b": GZIP,
+        b"BZh": BZIP2,
+        b"\xfd7zXZ\x00": XZ,
+    }
+    MAGIC_LENGTH = 6
+
+    GZIP_COMPRESS_LEVEL = 6
+    CHUNK_SIZE = 1024 * 1024
+    QUEUE_DEPTH = 8
+    QUEUE_POLL_SECONDS = 0.1
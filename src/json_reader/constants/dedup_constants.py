@@ -0,0 +1,19 @@
+class DedupConstants:
+    KEEP_FIRST_POLICY = "keep-first"
+    KEEP_LAST_POLICY = "keep-last"
+    REJECT_POLICY = "reject"
+    POLICIES = (KEEP_FIRST_POLICY, KEEP_LAST_POLICY, REJECT_POLICY)
+
+    # int ids within a window of this many ids live in the bitmap (32 MiB); other ids are kept in an exact set
+    MAX_BITMAP_BITS = 256 * 1024 ** 2
+    MIN_BITMAP_BYTES = 4096
+    BITMAP_GROWTH_FACTOR = 2
+
+    # keep-last and reject read the records twice; the first pass spools them to a temp file in batches
+    SPOOL_BATCH_SIZE = 4096
+    SPOOL_FILE_PREFIX = "json_reader_dedup_"
+
+    LOG_FOOTPRINT = (
+        "deduplicated %s records by id (%s): %d unique id(s), %d duplicate record(s), "
+        "%d bytes of id sets (%d in bitmaps, %d in exact sets)"
+    )
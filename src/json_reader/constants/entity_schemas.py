@@ -0,0 +1,67 @@
+from .data_item_constants import ItemConstants
+from .errors_messages import ErrorMessages
+from .validation_constants import ValidationReasons
+
+
+class EntitySchemas:
+    """
+    Validation rules for each entity type, declared as data.
+
+    Every field rule has a name and a type ("int", "float", "str" or "bool"),
+    and may set "min", "max" and "non_empty". "reason" is the ValidationReasons
+    code reported when the rule fails and "message" the logged error template.
+    """
+
+    ROOM = {
+        "fields": [
+            {
+                "name": ItemConstants.ID_FIELD,
+                "type": "int",
+                "min": ItemConstants.MIN_ROOM_ID,
+                "reason": ValidationReasons.INVALID_ID,
+                "message": ErrorMessages.ROOM_INVALID_ID,
+            },
+            {
+                "name": ItemConstants.NAME_FIELD,
+                "type": "str",
+                "non_empty": True,
+                "reason": ValidationReasons.INVALID_NAME,
+                "message": ErrorMessages.ROOM_INVALID_NAME,
+            },
+        ],
+        "incomplete_message": ErrorMessages.ROOM_INCOMPLETE_DATA,
+        "failed_message": ErrorMessages.ROOM_VALIDATION_FAILED,
+    }
+
+    STUDENT = {
+        "fields": [
+            {
+                "name": ItemConstants.ID_FIELD,
+                "type": "int",
+                "min": ItemConstants.MIN_STUDENT_ID,
+                "reason": ValidationReasons.INVALID_ID,
+                "message": ErrorMessages.STUDENT_INVALID_ID,
+            },
+            {
+                "name": ItemConstants.NAME_FIELD,
+                "type": "str",
+                "non_empty": True,
+                "reason": ValidationReasons.INVALID_NAME,
+                "message": ErrorMessages.STUDENT_INVALID_NAME,
+            },
+            {
+                "name": ItemConstants.ROOM_FIELD,
+                "type": "int",
+                "min": ItemConstants.MIN_ROOM_ID,
+                "reason": ValidationReasons.INVALID_ROOM_ID,
+                "message": ErrorMessages.STUDENT_INVALID_ROOM_ID,
+            },
+        ],
+        "incomplete_message": ErrorMessages.STUDENT_INCOMPLETE_DATA,
+        "failed_message": ErrorMessages.STUDENT_VALIDATION_FAILED,
+    }
+
+    ALL = {
+        ItemConstants.ROOM_STRATEGY: ROOM,
+        ItemConstants.STUDENT_STRATEGY: STUDENT,
+    }
@@ -5,6 +5,7 @@ class ErrorMessages:
 
     INVALID_JSON_FORMAT = "Invalid JSON format in file: {}"
     FILE_READ_ERROR = "Error reading file: {}"
+    IJSON_BACKEND_UNAVAILABLE = "ijson backend is not available: {}"
 
     ROOM_INCOMPLETE_DATA = "Room data is incomplete"
     ROOM_INVALID_ID = "Room ID must be positive integer, got: {}"
@@ -18,16 +19,49 @@ class ErrorMessages:
     STUDENT_VALIDATION_FAILED = "Student validation failed: {}"
 
     UNKNOWN_VALIDATION_STRATEGY = "Unknown validation strategy: {}"
+    UNKNOWN_FIELD_TYPE = "Unknown schema field type: {}"
+    INVALID_FIELD_BOUND = "Schema field bounds must be finite numbers, got: {}"
+    INCOMPLETE_DATA = "Record data is incomplete"
+    INVALID_FIELD = "Field {} is invalid, got: {}"
+    VALIDATION_FAILED = "Validation failed: {}"
 
     STUDENT_MISSING_KEY = "Student record missing required key: {}"
     ROOM_MISSING_KEY = "Room record missing required key: {}"
+    NOT_SORTED_BY_ROOM = "{} are not sorted by room id as --sorted-by-room promises: {!r} comes after {!r}"
 
     NO_WRITE_PERMISSION_DIR = "No write permission for output directory: {}"
     CANNOT_CREATE_OUTPUT_DIR = "Cannot create output directory {}: {}"
     NO_WRITE_PERMISSION_FILE = "No write permission for file: {}"
-    INVALID_FILE_EXTENSION = "Custom output path must end with .json or .xml, got: {}"
-    FORMAT_MISMATCH_XML_JSON = "Output format is XML but destination has .json extension"
-    FORMAT_MISMATCH_JSON_XML = "Output format is JSON but destination has .xml extension"
+    INVALID_FILE_EXTENSION = "Custom output path must end with one of {}, got: {}"
+    FORMAT_MISMATCH = "Output format is {} but destination has {} extension"
     INVALID_OUTPUT_PATH = "Invalid output path"
+    COMPACT_REQUIRES_JSON = "--compact-json can only be used with JSON or NDJSON output"
+    DELTA_REQUIRES_STATE = "--delta-file requires --incremental-state"
+    SHARDS_CONFLICT = "--shards and --max-shard-size cannot be used together"
+    SHARDS_WITH_INCREMENTAL = "Sharded output cannot be combined with --incremental-state"
+    EXPORT_WORKERS_CONFLICT = "--export-workers cannot be combined with sharded or incremental output"
+    PARALLEL_EXPORT_UNSUPPORTED_FORMAT = "Format {} cannot be rendered in parallel: its exporter does not encode rooms one at a time"
+    INCREMENTAL_UNSUPPORTED_FORMAT = "Format {} cannot be exported incrementally: its exporter does not encode rooms one at a time"
+    SERVED_EXPORT_UNSUPPORTED_FORMAT = "Format {} cannot be served: its exporter does not encode rooms one at a time"
+    SERVED_EXPORT_FAILED = "Could not render the {} export: {}"
+    SERVE_ADDRESS_NOT_SOCKET = "Cannot serve on {}: the path exists and is not a socket"
+    SHARDS_UNSUPPORTED_FORMAT = "Format {} cannot be sharded: its exporter does not encode rooms one at a time"
+    PIPELINE_STAGE_STOPPED = "Pipeline stage {} was stopped before it finished"
+    INVALID_STAGE_QUEUE_DEPTH = "Stage queue depth must look like STAGE=N with STAGE one of {} and N positive, got: {}"
+    MISSING_INPUT_FILES = "--student-file-path and --room-file-path are required unless --manifest is given"
+    INVALID_MANIFEST = "Manifest {} must hold a list of jobs, or a 'jobs' list"
+    INVALID_JOB = "Job {} must be a table of options, got: {}"
+    INVALID_JOB_FIELD = "Job {} has an invalid value for {}: {!r}"
+    UNKNOWN_JOB_FIELDS = "Job {} has unknown field(s): {}"
+    MISSING_JOB_FIELDS = "Job {} is missing required field(s): {}"
+    INVALID_WORKER_COUNT = "Worker count must be a positive integer, got: {}"
+    INVALID_BATCH_SIZE = "Batch size must be a positive integer, got: {}"
+    INVALID_SHARD_COUNT = "Shard count must be a positive integer, got: {}"
+    INVALID_ROOM_IDS = "Room ids must be a comma-separated list of integers, got: {}"
+    INVALID_ROOM_ID_RANGE = "Room id range must look like LOW-HIGH, either bound optional and LOW <= HIGH, got: {}"
+    INVALID_SAMPLE_RATE = "Sample rate must be a number between 0 and 1, got: {}"
+    INVALID_WATCH_INTERVAL = "Watch interval must be a number of seconds, 0 or more, got: {}"
+    INVALID_MEMORY_SIZE = "Memory size must be a positive number with optional K, M or G suffix, got: {}"
 
     UNSUPPORTED_FORMAT = "Unsupported format: {}"
+    INVALID_EXPORTER = "Exporter {} of format {} cannot be loaded: {}"
@@ -2,6 +2,8 @@ class ExporterConstants:
     DEFAULT_OUTPUT_DIR = "output/"
     JSON_EXTENSION = ".json"
     XML_EXTENSION = ".xml"
+    NDJSON_EXTENSION = ".ndjson"
+    CSV_EXTENSION = ".csv"
     DEFAULT_FILE_NAME = "default"
 
     ID_FIELD = "id"
@@ -18,5 +20,47 @@ class ExporterConstants:
 
     LOG_JSON_EXPORTED = "exported JSON file at {}"
     LOG_XML_EXPORTED = "exported XML file at {}"
+    LOG_NDJSON_EXPORTED = "exported NDJSON file at {}"
+    LOG_CSV_EXPORTED = "exported CSV file at {}"
+    LOG_PARALLEL_EXPORTED = "exported {} rendered on {} processes"
+    LOG_EXPORT_THROUGHPUT = "wrote {} rooms, {} bytes in {:.3f}s ({:.0f} rooms/s, {:.1f} MB/s)"
 
     UNICODE_ENCODING = "unicode"
+
+    # Built-in formats as 'module:Class' paths relative to the exporters package, imported on first use.
+    BUILTIN_EXPORTERS = {
+        "json": ".json_exporter:JSONExporter",
+        "xml": ".xml_exporter:XMLExporter",
+        "ndjson": ".json_exporter:NDJSONExporter",
+        "csv": ".csv_exporter:CSVExporter",
+    }
+    EXPORTER_MODULES = {
+        "JSONExporter": ".json_exporter",
+        "NDJSONExporter": ".json_exporter",
+        "CSVExporter": ".csv_exporter",
+        "XMLExporter": ".xml_exporter",
+        "ElementTreeXMLExporter": ".element_tree_exporter",
+    }
+    ENTRY_POINT_GROUP = "json_reader.exporters"
+    EXPORTER_PATH_SEPARATOR = ":"
+
+    WRITE_BUFFER_SIZE = 1024 * 1024
+    PARALLEL_BATCH_SIZE = 256
+    PENDING_BATCHES_PER_WORKER = 4
+    COMPACT_JSON_SEPARATORS = (",", ":")
+    JSON_ARRAY_START = b"["
+    JSON_ARRAY_END = b"]"
+    JSON_ITEM_SEPARATOR = b","
+    NDJSON_LINE_END = b"\n"
+
+    CSV_HEADER = ("room_id", "room_name", "student_id", "student_name")
+
+    XML_ROOM_OPEN = '  <room id="{}">'
+    XML_ROOM_CLOSE = "</room>\n"
+    XML_NAME = "<name>{}</name>"
+    XML_EMPTY_NAME = "<name />"
+    XML_STUDENTS_OPEN = "<students>"
+    XML_STUDENTS_CLOSE = "</students>"
+    XML_EMPTY_STUDENTS = "<students />"
+    XML_STUDENT = '<student id="{}">{}</student>'
+    XML_PLAIN_STUDENT = '<student id="{}"><name>{}</name></student>'
@@ -0,0 +1,25 @@
+class IncrementalConstants:
+    STATE_VERSION = 1
+    DIGEST_SIZE = 16
+    MARSHAL_VERSION = 2
+
+    VERSION_FIELD = "version"
+    SIGNATURE_FIELD = "signature"
+    OUTPUT_FIELD = "output"
+    ROOMS_FIELD = "rooms"
+    PATH_FIELD = "path"
+    SIZE_FIELD = "size"
+    MTIME_FIELD = "mtime_ns"
+
+    OP_FIELD = "op"
+    ROOM_FIELD = "room"
+    ID_FIELD = "id"
+    OP_ADDED = "added"
+    OP_CHANGED = "changed"
+    OP_REMOVED = "removed"
+
+    TEMP_PREFIX = "."
+
+    LOG_STATE_UNREADABLE = "ignoring unreadable incremental state %s: %s"
+    LOG_FULL_REWRITE = "previous output %s does not match the incremental state, rendering every room"
+    LOG_INCREMENTAL_SUMMARY = "%s: %d added, %d changed, %d removed, %d unchanged room(s)"
@@ -0,0 +1,24 @@
+class LoaderConstants:
+    ITEMS_PREFIX = "item"
+
+    IJSON_BACKENDS = ("yajl2_c", "yajl2_cffi", "python")
+    PURE_PYTHON_BACKEND = "python"
+    IJSON_BACKEND_ENV_VAR = "JSON_READER_IJSON_BACKEND"
+    READ_BUFFER_SIZE = 64 * 1024
+
+    LOG_STARTING = "exporting students %s and rooms %s as %s to %s"
+    LOG_IJSON_BACKEND = "using ijson backend {}"
+    LOG_SLOW_IJSON_BACKEND = "no compiled ijson backend available, parsing with the pure-Python backend"
+
+    MIN_CHUNK_SIZE = 1024 * 1024
+    MAX_CHUNK_SIZE = 64 * 1024 * 1024
+    CHUNKS_PER_WORKER = 4
+    PENDING_CHUNKS_PER_WORKER = 2
+    RESULT_BATCH_SIZE = 10_000
+
+    ARRAY_START = ord("[")
+    ARRAY_END = ord("]")
+    OBJECT_START = ord("{")
+    OBJECT_END = ord("}")
+    COMMA = ord(",")
+    BACKSLASH = ord("\\")
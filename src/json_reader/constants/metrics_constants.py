@@ -0,0 +1,33 @@
+class MetricsConstants:
+    LOAD_ROOMS_STAGE = "load_rooms"
+    LOAD_STUDENTS_STAGE = "load_students"
+    COMBINE_STAGE = "combine"
+    EXPORT_STAGE = "export"
+
+    ROOMS_VALID_COUNTER = "room"
+    STUDENTS_VALID_COUNTER = "student"
+    ROOMS_EMITTED_COUNTER = "rooms"
+    STUDENTS_EMITTED_COUNTER = "students"
+
+    # Items are pulled from a measured iterator this many at a time, so timing costs a few clock reads per batch.
+    BATCH_SIZE = 1024
+
+    PROMETHEUS_EXTENSION = ".prom"
+    PROMETHEUS_PREFIX = "json_reader_"
+    TEMP_SUFFIX = ".tmp"
+
+    # name, help text and labels of every Prometheus metric written
+    PROMETHEUS_METRICS = {
+        "run_wall_seconds": "Wall time of the whole run.",
+        "run_cpu_seconds": "CPU time of the main process.",
+        "run_children_cpu_seconds": "CPU time of finished worker processes.",
+        "stage_wall_seconds": "Wall time spent in a stage, excluding the stages it pulls from.",
+        "stage_cpu_seconds": "CPU time spent in a stage, excluding the stages it pulls from.",
+        "stage_items": "Items produced by a stage.",
+        "records": "Input records by type and outcome.",
+        "bytes": "Bytes read from input files and written to the output.",
+        "emitted": "Rooms and students written to the output.",
+        "peak_rss_bytes": "Peak resident set size.",
+    }
+
+    LOG_METRICS_WRITTEN = "wrote metrics to %s"
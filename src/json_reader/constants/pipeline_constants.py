@@ -0,0 +1,15 @@
+class PipelineConstants:
+    ROOMS_STAGE = "rooms"
+    STUDENTS_STAGE = "students"
+    COMBINE_STAGE = "combine"
+    STAGES = (ROOMS_STAGE, STUDENTS_STAGE, COMBINE_STAGE)
+
+    QUEUE_DEPTH = 8
+    BATCH_SIZE = 1024
+    QUEUE_POLL_SECONDS = 0.1
+    THREAD_NAME = "pipeline-{}"
+
+    # start methods of worker processes that do not inherit the state of other threads, best first
+    THREAD_SAFE_START_METHODS = ("forkserver", "spawn")
+
+    LOG_STAGE_SUMMARY = "stage %s: %d item(s), producer blocked %.3fs on a full queue, consumer waited %.3fs"
@@ -0,0 +1,31 @@
+class ProfilerConstants:
+    CPU_MODE = "cpu"
+    MEMORY_MODE = "memory"
+    MODES = (CPU_MODE, MEMORY_MODE)
+
+    DEFAULT_DIR = "profile"
+    PSTATS_FILE_NAME = "cpu.pstats"
+    COLLAPSED_FILE_NAME = "cpu.collapsed"
+    MEMORY_REPORT_FILE_NAME = "memory.txt"
+    SNAPSHOT_FILE_NAME = "memory_{}_{}.snapshot"
+
+    START_CHECKPOINT = "start"
+    STUDENTS_LOADED_CHECKPOINT = "students_loaded"
+    GROUPED_CHECKPOINT = "grouped"
+    EXPORTED_CHECKPOINT = "exported"
+
+    # Call paths holding less time than this are left out of the collapsed stacks.
+    MIN_COLLAPSED_SECONDS = 1e-4
+    MICROSECONDS = 1_000_000
+    BUILTIN_FILE_NAME = "~"
+    FRAME_SEPARATOR = ";"
+
+    TRACEMALLOC_FRAMES = 10
+    TOP_ALLOCATIONS = 25
+    IGNORED_TRACE_FILES = ("<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>")
+
+    REPORT_CHECKPOINT = "== {} ({}): {:.1f} MB traced, {:.1f} MB peak so far"
+    REPORT_TOP_SITES = "-- top allocation sites"
+    REPORT_TOP_CHANGES = "-- largest changes since {}"
+
+    LOG_PROFILE_WRITTEN = "wrote %s profile to %s"
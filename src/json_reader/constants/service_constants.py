@@ -0,0 +1,37 @@
+class ServiceConstants:
+    DEFAULT_HOST = "127.0.0.1"
+    ADDRESS_PORT_SEPARATOR = ":"
+    UNIX_SOCKET_SUFFIX = ".sock"
+    UNIX_CLIENT = "unix"
+
+    DEFAULT_WATCH_INTERVAL = 1.0
+    WATCH_THREAD_NAME = "json-reader-watch"
+
+    HEALTH_PATH = "/health"
+    ROOMS_PATH = "rooms"
+    STUDENTS_PATH = "students"
+    EXPORT_PATH = "/export"
+    FORMAT_PARAMETER = "format"
+    DEFAULT_FORMAT = "json"
+
+    PROTOCOL_VERSION = "HTTP/1.1"
+    JSON_CONTENT_TYPE = "application/json"
+    CONTENT_TYPES = {
+        "json": JSON_CONTENT_TYPE,
+        "ndjson": "application/x-ndjson",
+        "csv": "text/csv; charset=utf-8",
+        "xml": "application/xml",
+    }
+    DEFAULT_CONTENT_TYPE = "application/octet-stream"
+
+    ERROR_FIELD = "error"
+    NOT_FOUND = "not found"
+    ROOM_NOT_FOUND = "no room {}"
+    STUDENT_NOT_FOUND = "no student {}"
+
+    LOG_SERVING = "serving %d room(s) and %d student(s) on %s"
+    LOG_RELOADED = "reloaded %s and %s in %.3fs: %d room(s), %d student(s)"
+    LOG_RELOAD_FAILED = "could not reload changed input files, still serving the previous ones: %s"
+    LOG_WATCH_FAILED = "could not check the input files for changes, will check again"
+    LOG_EXPORT_FAILED = "could not render the %s export"
+    LOG_REQUEST = "%s %s"
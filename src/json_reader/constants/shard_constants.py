@@ -0,0 +1,21 @@
+class ShardConstants:
+    SHARD_SUFFIX = "-{:05d}"
+    MANIFEST_SUFFIX = ".manifest.json"
+    ROOM_ID_ENCODING = "utf-8"
+
+    HASH_PARTITIONING = "hash"
+    SIZE_PARTITIONING = "size"
+
+    MAX_WRITER_THREADS = 8
+    WRITER_THREAD_NAME = "json-reader-shard"
+    # chunks handed to the writer threads and not yet written, before serialization waits for them
+    MAX_PENDING_WRITES = 32
+
+    FORMAT_FIELD = "format"
+    PARTITIONING_FIELD = "partitioning"
+    SHARDS_FIELD = "shards"
+    PATH_FIELD = "path"
+    ROOMS_FIELD = "rooms"
+    BYTES_FIELD = "bytes"
+
+    LOG_SHARDS_WRITTEN = "wrote %d room(s) to %d shard(s) by %s, listed in %s"
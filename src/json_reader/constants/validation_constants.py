@@ -0,0 +1,43 @@
+class ValidationReasons:
+    """Reason codes returned by batch validation, in the order the checks run."""
+
+    VALID = 0
+    INCOMPLETE = 1
+    INVALID_ID = 2
+    INVALID_NAME = 3
+    INVALID_ROOM_ID = 4
+    REJECTED = 5
+    INVALID_FIELD = 6
+    DUPLICATE_ID = 7
+    NOT_SELECTED = 8
+
+    DESCRIPTIONS = {
+        VALID: "valid",
+        INCOMPLETE: "incomplete data",
+        INVALID_ID: "invalid id",
+        INVALID_NAME: "invalid name",
+        INVALID_ROOM_ID: "invalid room id",
+        REJECTED: "rejected by validator",
+        INVALID_FIELD: "invalid field",
+        DUPLICATE_ID: "duplicate id",
+        NOT_SELECTED: "outside the room selection",
+    }
+
+
+class FilterConstants:
+    DEFAULT_BATCH_SIZE = 1024
+
+
+class RejectionConstants:
+    DEFAULT_SAMPLE_RATE = 0.01
+    QUARANTINE_BUFFER_SIZE = 1024 * 1024
+
+    TYPE_FIELD = "type"
+    REASON_FIELD = "reason"
+    RECORD_FIELD = "record"
+
+    LOG_SKIPPING_ITEM = "skipping %s record %s (%s)"
+    LOG_REJECTION_SUMMARY = "rejected %d %s record(s): %s"
+    LOG_NO_REJECTIONS = "no records were rejected"
+    LOG_SKIPPED_SUMMARY = "skipped %d %s record(s) %s"
+    LOG_QUARANTINE_WRITTEN = "wrote %d rejected record(s) to %s"
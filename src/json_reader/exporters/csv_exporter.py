@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import csv
+import io
+import logging
+import time
+from typing import Any, Dict, Generator
+from .exporter import Exporter, ExportStats
+from ..constants.exporter_constants import ExporterConstants
+
+logging.getLogger().setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class CSVExporter(Exporter):
+    """CSV exporter writing one row per student and room"""
+
+    extension = ExporterConstants.CSV_EXTENSION
+    supports_fragments = True
+
+    def export_file(
+        self, data_generator: Generator[Dict[str, Any], None, None], output_path: str
+    ) -> None:
+        """
+        Export data as room_id, room_name, student_id, student_name rows.
+
+        Rooms without students get a single row with empty student columns.
+
+        Args:
+            data_generator: Stream of room data with students
+            output_path: Target CSV file path
+            (auto-generates if no .csv extension)
+        """
+        output_path = self._resolve_output_path(output_path)
+
+        start = time.perf_counter()
+        rooms = 0
+
+        with self._open_output(output_path, text=True, newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(ExporterConstants.CSV_HEADER)
+
+            for room_data in data_generator:
+                room_id = room_data[ExporterConstants.ID_FIELD]
+                room_name = room_data[ExporterConstants.NAME_FIELD]
+                students = room_data[ExporterConstants.STUDENTS_FIELD]
+                if students:
+                    writer.writerows(
+                        (room_id, room_name, student[ExporterConstants.ID_FIELD], student[ExporterConstants.NAME_FIELD])
+                        for student in students
+                    )
+                else:
+                    writer.writerow((room_id, room_name, "", ""))
+                rooms += 1
+
+            file.flush()
+            bytes_written = file.buffer.tell()
+
+        self.last_export_stats = ExportStats(rooms, bytes_written, time.perf_counter() - start)
+        logger.info(ExporterConstants.LOG_CSV_EXPORTED.format(output_path))
+
+    @staticmethod
+    def _encode_rows(rows) -> bytes:
+        """Format rows exactly like csv.writer does in export_file."""
+        text = io.StringIO(newline="")
+        csv.writer(text).writerows(rows)
+        return text.getvalue().encode()
+
+    def encode_header(self) -> bytes:
+        return self._encode_rows([ExporterConstants.CSV_HEADER])
+
+    def encode_room(self, room_data: Dict[str, Any]) -> bytes:
+        room_id = room_data[ExporterConstants.ID_FIELD]
+        room_name = room_data[ExporterConstants.NAME_FIELD]
+        students = room_data[ExporterConstants.STUDENTS_FIELD]
+        if not students:
+            return self._encode_rows([(room_id, room_name, "", "")])
+        return self._encode_rows(
+            (room_id, room_name, student[ExporterConstants.ID_FIELD], student[ExporterConstants.NAME_FIELD])
+            for student in students
+        )
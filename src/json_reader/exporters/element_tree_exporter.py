@@ -0,0 +1,34 @@
+import xml.etree.ElementTree as ET
+from typing import Any, Dict
+from .xml_exporter import XMLExporter
+from ..constants.exporter_constants import ExporterConstants
+
+
+class ElementTreeXMLExporter(XMLExporter):
+    """
+    XML exporter building an ElementTree per room.
+
+    Kept as the reference the streaming XMLExporter must match byte for byte,
+    and as the baseline of its benchmark; it is not registered in ExporterFactory.
+    """
+
+    @staticmethod
+    def render_room(room_data: Dict[str, Any]) -> str:
+        """Render one room by building and serializing its element tree."""
+        room_elem = ET.Element(ExporterConstants.XML_ROOM_ELEMENT,
+                               id=str(room_data[ExporterConstants.ID_FIELD]))
+
+        name_elem = ET.SubElement(room_elem, ExporterConstants.XML_NAME_ELEMENT)
+        name_elem.text = room_data[ExporterConstants.NAME_FIELD]
+
+        students_elem = ET.SubElement(room_elem, ExporterConstants.XML_STUDENTS_ELEMENT)
+        for student in room_data[ExporterConstants.STUDENTS_FIELD]:
+            student_elem = ET.SubElement(
+                students_elem, ExporterConstants.XML_STUDENT_ELEMENT,
+                id=str(student[ExporterConstants.ID_FIELD])
+            )
+            student_name = ET.SubElement(student_elem, ExporterConstants.XML_NAME_ELEMENT)
+            student_name.text = student[ExporterConstants.NAME_FIELD]
+
+        room_xml = ET.tostring(room_elem, encoding=ExporterConstants.UNICODE_ENCODING)
+        return f"  {room_xml}\n"
@@ -1,20 +1,53 @@
 from __future__ import annotations
 
-import json
+import importlib
+import io
 import logging
-import xml.etree.ElementTree as ET
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Generator
+from typing import IO, Any, Dict, Generator, NamedTuple
 from ..constants.exporter_constants import ExporterConstants
+from ..services.compression import CompressedFile
 
 logging.getLogger().setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class ExportStats(NamedTuple):
+    """Throughput of one export."""
+
+    rooms: int
+    bytes_written: int
+    seconds: float
+
+    @property
+    def rooms_per_second(self) -> float:
+        return self.rooms / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_written / self.seconds if self.seconds else 0.0
+
+
 class Exporter(ABC):
     """Abstract base class for all exporters"""
 
     default_path_counter = 0
+    extension = ""
+    item_separator = b""
+    # Exporters that set this define encode_room(room_data) -> bytes, the bytes of a single room.
+    # export_file output is then encode_header(), the encoded rooms joined by item_separator,
+    # then encode_footer(), so rooms can be rendered and reused one at a time, as incremental,
+    # sharded, parallel and served exports need.
+    supports_fragments = False
+
+    def __init__(self, write_chunk_size: int = ExporterConstants.WRITE_BUFFER_SIZE):
+        """
+        Args:
+            write_chunk_size: Number of bytes collected before each write to disk
+        """
+        self.write_chunk_size = write_chunk_size
+        self.last_export_stats: ExportStats | None = None
+        self.last_output_path: str | None = None
 
     @abstractmethod
     def export_file(
@@ -23,86 +56,62 @@ class Exporter(ABC):
         """Export data to file"""
         pass
 
+    def encode_header(self) -> bytes:
+        """Bytes written before the first room."""
+        return b""
 
-class JSONExporter(Exporter):
-    """JSON format exporter"""
+    def encode_footer(self) -> bytes:
+        """Bytes written after the last room."""
+        return b""
 
-    def export_file(
-        self, data_generator: Generator[Dict[str, Any], None, None], output_path: str
-    ) -> None:
+    def signature(self) -> str:
+        """Identify the exporter and options that determine its output bytes."""
+        return type(self).__name__
+
+    def _resolve_output_path(self, output_path: str) -> str:
         """
-        Export data to JSON format.
+        Use output_path if it has this exporter's extension, otherwise the next default path.
 
-        Args:
-            data_generator: Stream of room data with students
-            output_path: Target JSON file path
-            (auto-generates if no .json extension)
+        The chosen path is kept in last_output_path.
         """
-        if not output_path.endswith(ExporterConstants.JSON_EXTENSION):
+        if not CompressedFile.strip_extension(output_path).endswith(self.extension):
             Exporter.default_path_counter += 1
             output_path = (ExporterConstants.DEFAULT_OUTPUT_DIR +
                            ExporterConstants.DEFAULT_FILE_NAME +
                            str(Exporter.default_path_counter) +
-                           ExporterConstants.JSON_EXTENSION)
-
-        with open(output_path, "w") as file:
-            file.write("[")
-            first_item = True
-
-            for item in data_generator:
-                if not first_item:
-                    file.write(",")
-                file.write(json.dumps(item))
-                first_item = False
-
-            file.write("]")
-
-        logger.info(f"exported JSON file at {output_path}")
+                           self.extension)
+        self.last_output_path = output_path
+        return output_path
 
+    def _open_output(self, output_path: str, text: bool = False, newline: str | None = None) -> IO:
+        """
+        Open output_path for writing, compressing on the fly for .gz, .bz2 and .xz paths.
 
-class XMLExporter(Exporter):
-    """XML format exporter"""
-
-    def export_file(
-        self, data_generator: Generator[Dict[str, Any], None, None], output_path: str
-    ) -> None:
-        """Export data to XML format
+        Compression runs on a background thread, so it overlaps with serialization.
 
         Args:
-            data_generator: Stream of room data with students
-            output_path: Target XML file path
-            (auto-generates if no .xml extension)
+            output_path: Target file path
+            text: Open for UTF-8 text instead of bytes
+            newline: Newline translation for text files, as for open()
         """
-        if not output_path.endswith(ExporterConstants.XML_EXTENSION):
-            Exporter.default_path_counter += 1
-            output_path = (ExporterConstants.DEFAULT_OUTPUT_DIR +
-                           ExporterConstants.DEFAULT_FILE_NAME +
-                           str(Exporter.default_path_counter) +
-                           ExporterConstants.XML_EXTENSION)
-
-        with open(output_path, "w", encoding="utf-8") as file:
-            file.write(ExporterConstants.XML_DECLARATION)
-            file.write(f"<{ExporterConstants.XML_ROOT_ELEMENT}>\n")
-
-            for room_data in data_generator:
-                room_elem = ET.Element(ExporterConstants.XML_ROOM_ELEMENT,
-                                       id=str(room_data[ExporterConstants.ID_FIELD]))
-
-                name_elem = ET.SubElement(room_elem, ExporterConstants.XML_NAME_ELEMENT)
-                name_elem.text = room_data[ExporterConstants.NAME_FIELD]
-
-                students_elem = ET.SubElement(room_elem, ExporterConstants.XML_STUDENTS_ELEMENT)
-                for student in room_data[ExporterConstants.STUDENTS_FIELD]:
-                    student_elem = ET.SubElement(
-                        students_elem, ExporterConstants.XML_STUDENT_ELEMENT,
-                        id=str(student[ExporterConstants.ID_FIELD])
-                    )
-                    student_name = ET.SubElement(student_elem, ExporterConstants.XML_NAME_ELEMENT)
-                    student_name.text = student[ExporterConstants.NAME_FIELD]
-
-                room_xml = ET.tostring(room_elem, encoding=ExporterConstants.UNICODE_ENCODING)
-                file.write(f"  {room_xml}\n")
-
-            file.write(f"</{ExporterConstants.XML_ROOT_ELEMENT}>\n")
-
-        logger.info(ExporterConstants.LOG_XML_EXPORTED.format(output_path))
+        codec = CompressedFile.codec_for_extension(output_path)
+        if codec is None:
+            if text:
+                return open(output_path, "w", encoding="utf-8", newline=newline, buffering=self.write_chunk_size)
+            return open(output_path, "wb")
+
+        file = CompressedFile.open_writer(output_path, codec, self.write_chunk_size)
+        return io.TextIOWrapper(file, encoding="utf-8", newline=newline) if text else file
+
+
+def __getattr__(name: str) -> type[Exporter]:
+    """
+    Import format exporters on first use.
+
+    Each format lives in its own module so that a run imports only the
+    exporter it needs; this keeps `from .exporter import JSONExporter` working.
+    """
+    module_name = ExporterConstants.EXPORTER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name, __package__), name)
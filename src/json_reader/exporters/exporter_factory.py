@@ -1,26 +1,105 @@
-from .exporter import JSONExporter, XMLExporter, Exporter
+import importlib
+
+from .exporter import Exporter
 from ..constants.errors_messages import ErrorMessages
+from ..constants.exporter_constants import ExporterConstants
 
 
 class ExporterFactory:
-    """Factory to create appropriate exporter instances"""
+    """
+    Factory to create appropriate exporter instances
+
+    Formats map to exporter classes or to 'module:Class' paths, which are
+    imported when their format is first used, so a run only imports the
+    exporter it needs. Formats of other packages are found through the
+    'json_reader.exporters' entry point group, or added with register().
+    """
+
+    _exporters: dict[str, type[Exporter] | str] = dict(ExporterConstants.BUILTIN_EXPORTERS)
+    _entry_points: dict[str, str] | None = None
+
+    @classmethod
+    def register(cls, format_type: str, exporter: type[Exporter] | str) -> None:
+        """
+        Add or replace the exporter of a format.
 
-    _exporters = {
-        "json": JSONExporter,
-        "xml": XMLExporter,
-    }
+        Args:
+            format_type: Export format name (case-insensitive)
+            exporter: Exporter subclass, or its 'package.module:Class' path to import on first use
+        """
+        cls._exporters[format_type.lower()] = exporter
 
     @classmethod
-    def create_exporter(cls, format_type: str) -> Exporter:
-        """Create and return an exporter for the specified format"""
+    def get_exporter_class(cls, format_type: str) -> type[Exporter]:
+        """
+        Return the exporter class of a format, importing it on first use.
+
+        Args:
+            format_type: Export format name (case-insensitive)
+
+        Raises:
+            ValueError: If the format is unknown or its exporter cannot be imported
+        """
         format_type = format_type.lower()
 
-        if format_type not in cls._exporters:
+        exporter = cls._exporters.get(format_type)
+        if exporter is None:
+            exporter = cls._load_entry_points().get(format_type)
+        if exporter is None:
             raise ValueError(ErrorMessages.UNSUPPORTED_FORMAT.format(format_type))
 
-        return cls._exporters[format_type]()
+        if isinstance(exporter, str):
+            exporter = cls._import_exporter(format_type, exporter)
+            cls._exporters[format_type] = exporter
+        return exporter
+
+    @classmethod
+    def create_exporter(cls, format_type: str, **options) -> Exporter:
+        """
+        Create and return an exporter for the specified format
+
+        Args:
+            format_type: Export format name (case-insensitive)
+            **options: Keyword arguments passed to the exporter's constructor
+        """
+        return cls.get_exporter_class(format_type)(**options)
 
     @classmethod
     def get_supported_formats(cls) -> list[str]:
-        """Get list of supported export formats"""
-        return list(cls._exporters.keys())
+        """Get list of supported export formats, including those of installed plugins"""
+        return list(dict.fromkeys([*cls._exporters, *cls._load_entry_points()]))
+
+    @staticmethod
+    def _import_exporter(format_type: str, path: str) -> type[Exporter]:
+        """
+        Import an exporter class from a 'module:Class' or 'module.Class' path.
+
+        Module paths starting with a dot are relative to this package.
+        """
+        if ExporterConstants.EXPORTER_PATH_SEPARATOR in path:
+            module_name, _, class_name = path.partition(ExporterConstants.EXPORTER_PATH_SEPARATOR)
+        else:
+            module_name, _, class_name = path.rpartition(".")
+
+        try:
+            exporter = getattr(importlib.import_module(module_name, __package__), class_name)
+        except (ImportError, AttributeError, ValueError) as e:
+            raise ValueError(ErrorMessages.INVALID_EXPORTER.format(path, format_type, e)) from e
+
+        if not (isinstance(exporter, type) and issubclass(exporter, Exporter)):
+            raise ValueError(ErrorMessages.INVALID_EXPORTER.format(path, format_type, "not an Exporter subclass"))
+        return exporter
+
+    @classmethod
+    def _load_entry_points(cls) -> dict[str, str]:
+        """Exporter paths advertised by installed packages, read once."""
+        if cls._entry_points is None:
+            # importlib.metadata takes longer to import than the whole application,
+            # so it is only imported when a format is not registered.
+            from importlib.metadata import entry_points
+
+            cls._entry_points = {
+                entry_point.name.lower(): entry_point.value
+                for entry_point in entry_points(group=ExporterConstants.ENTRY_POINT_GROUP)
+            }
+        return cls._entry_points
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import marshal
+import mmap
+import os
+import tempfile
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Any, Dict, Generator, Iterator, NamedTuple
+
+from .exporter import Exporter, ExportStats
+from ..constants.errors_messages import ErrorMessages
+from ..constants.exporter_constants import ExporterConstants
+from ..constants.incremental_constants import IncrementalConstants
+from ..services.compression import CompressedFile
+
+logging.getLogger().setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class IncrementalStats(NamedTuple):
+    """How the rooms of an incremental export compare to the previous run."""
+
+    added: int
+    changed: int
+    removed: int
+    unchanged: int
+
+
+class IncrementalExporter:
+    """
+    Exports only what changed since the previous run.
+
+    A sidecar state file keeps a digest of every combined room together with
+    where its bytes sit in the output. The next run either patches the output,
+    copying the bytes of unchanged rooms instead of serializing them again, or
+    writes a delta file listing the added, changed and removed rooms.
+    """
+
+    def __init__(self, exporter: Exporter, state_path: str):
+        """
+        Args:
+            exporter: Exporter rendering the rooms that changed
+            state_path: JSON sidecar file holding the room digests of the previous run
+
+        Raises:
+            ValueError: If the exporter cannot render rooms one at a time
+        """
+        if not exporter.supports_fragments:
+            raise ValueError(ErrorMessages.INCREMENTAL_UNSUPPORTED_FORMAT.format(type(exporter).__name__))
+        self.exporter = exporter
+        self.state_path = state_path
+        self.last_stats: IncrementalStats | None = None
+
+    @staticmethod
+    def digest(room_data: Dict[str, Any]) -> str:
+        """
+        Digest of a combined room, several times cheaper than rendering it.
+
+        Marshal format 2 writes neither object references nor interning flags,
+        so equal rooms always give the same bytes; values marshal cannot
+        handle, such as Decimal, fall back to repr.
+        """
+        try:
+            data = marshal.dumps(room_data, IncrementalConstants.MARSHAL_VERSION)
+        except ValueError:
+            data = repr(room_data).encode()
+        return hashlib.blake2b(data, digest_size=IncrementalConstants.DIGEST_SIZE).hexdigest()
+
+    def export_file(
+        self, data_generator: Generator[Dict[str, Any], None, None], output_path: str
+    ) -> IncrementalStats:
+        """
+        Write the full output, reusing the bytes of rooms unchanged since the last run.
+
+        Bytes are only reused when the previous output is still exactly as
+        recorded in the state, was written by an exporter with the same
+        signature and is not compressed; otherwise every room is rendered. The
+        output is written to a temporary file and moved into place at the end.
+
+        Args:
+            data_generator: Stream of room data with students
+            output_path: Target file path (auto-generates if the extension does not match)
+
+        Returns:
+            IncrementalStats: Number of added, changed, removed and unchanged rooms
+        """
+        output_path = self.exporter._resolve_output_path(output_path)
+        state = self._load_state()
+        known_digests = self._known_digests(state)
+        reusable = self._reusable_rooms(state, output_path)
+
+        start = time.perf_counter()
+        directory = os.path.dirname(os.path.abspath(output_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(
+            dir=directory, prefix=IncrementalConstants.TEMP_PREFIX, suffix=os.path.basename(output_path)
+        )
+        os.close(fd)
+
+        rooms = []
+        added = changed = unchanged = 0
+        try:
+            with ExitStack() as stack:
+                previous_output = stack.enter_context(self._map_output(output_path)) if reusable else None
+                file = stack.enter_context(self.exporter._open_output(temp_path))
+
+                header = self.exporter.encode_header()
+                file.write(header)
+                position = len(header)
+                separator = self.exporter.item_separator
+
+                for room_data in data_generator:
+                    if rooms:
+                        file.write(separator)
+                        position += len(separator)
+
+                    room_id = room_data[ExporterConstants.ID_FIELD]
+                    digest = self.digest(room_data)
+                    known = reusable.get(room_id)
+                    if known is not None and known[0] == digest:
+                        fragment = previous_output[known[1]:known[1] + known[2]]
+                    else:
+                        fragment = self.exporter.encode_room(room_data)
+
+                    if room_id not in known_digests:
+                        added += 1
+                    elif known_digests[room_id] != digest:
+                        changed += 1
+                    else:
+                        unchanged += 1
+
+                    file.write(fragment)
+                    rooms.append([room_id, digest, position, len(fragment)])
+                    position += len(fragment)
+
+                footer = self.exporter.encode_footer()
+                file.write(footer)
+                position += len(footer)
+
+            os.replace(temp_path, output_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        removed = len(known_digests.keys() - {room[0] for room in rooms})
+        output = None
+        if CompressedFile.codec_for_extension(output_path) is None:
+            output = self._describe_output(output_path)
+        self._save_state(output, rooms)
+
+        self.exporter.last_export_stats = ExportStats(len(rooms), position, time.perf_counter() - start)
+        self.last_stats = IncrementalStats(added, changed, removed, unchanged)
+        logger.info(IncrementalConstants.LOG_INCREMENTAL_SUMMARY, output_path, *self.last_stats)
+        return self.last_stats
+
+    def export_delta(
+        self, data_generator: Generator[Dict[str, Any], None, None], delta_path: str
+    ) -> IncrementalStats:
+        """
+        Write only the changes since the last run, as NDJSON.
+
+        Each line is {"op": "added" | "changed", "room": {...}} or, after all
+        rooms, {"op": "removed", "id": ...}. Unchanged rooms are not rendered.
+        The regular output is left alone, so the next export_file call renders
+        every room again.
+
+        Args:
+            data_generator: Stream of room data with students
+            delta_path: Target NDJSON file path
+
+        Returns:
+            IncrementalStats: Number of added, changed, removed and unchanged rooms
+        """
+        known_digests = self._known_digests(self._load_state())
+        encode = json.JSONEncoder(check_circular=False).encode
+
+        start = time.perf_counter()
+        rooms = []
+        added = changed = unchanged = bytes_written = 0
+        with self.exporter._open_output(delta_path) as file:
+            for room_data in data_generator:
+                room_id = room_data[ExporterConstants.ID_FIELD]
+                digest = self.digest(room_data)
+                rooms.append([room_id, digest, None, None])
+
+                if room_id not in known_digests:
+                    op = IncrementalConstants.OP_ADDED
+                    added += 1
+                elif known_digests[room_id] != digest:
+                    op = IncrementalConstants.OP_CHANGED
+                    changed += 1
+                else:
+                    unchanged += 1
+                    continue
+
+                line = encode({IncrementalConstants.OP_FIELD: op, IncrementalConstants.ROOM_FIELD: room_data})
+                bytes_written += file.write(line.encode() + ExporterConstants.NDJSON_LINE_END)
+
+            current_ids = {room[0] for room in rooms}
+            removed = [room_id for room_id in known_digests if room_id not in current_ids]
+            for room_id in removed:
+                line = encode({
+                    IncrementalConstants.OP_FIELD: IncrementalConstants.OP_REMOVED,
+                    IncrementalConstants.ID_FIELD: room_id,
+                })
+                bytes_written += file.write(line.encode() + ExporterConstants.NDJSON_LINE_END)
+
+        self._save_state(None, rooms)
+
+        self.exporter.last_export_stats = ExportStats(len(rooms), bytes_written, time.perf_counter() - start)
+        self.last_stats = IncrementalStats(added, changed, len(removed), unchanged)
+        logger.info(IncrementalConstants.LOG_INCREMENTAL_SUMMARY, delta_path, *self.last_stats)
+        return self.last_stats
+
+    def _load_state(self) -> dict:
+        """Read the state of the previous run, or an empty state if there is none."""
+        try:
+            with open(self.state_path, encoding="utf-8") as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(IncrementalConstants.LOG_STATE_UNREADABLE, self.state_path, e)
+            return {}
+
+        if not isinstance(state, dict) or state.get(IncrementalConstants.VERSION_FIELD) != IncrementalConstants.STATE_VERSION:
+            return {}
+        return state
+
+    @staticmethod
+    def _known_digests(state: dict) -> dict[Any, str]:
+        """Room id to digest of the previous run."""
+        return {room[0]: room[1] for room in state.get(IncrementalConstants.ROOMS_FIELD, [])}
+
+    def _reusable_rooms(self, state: dict, output_path: str) -> dict[Any, tuple[str, int, int]]:
+        """Room id to (digest, offset, length) in the previous output, if its bytes can be reused."""
+        output = state.get(IncrementalConstants.OUTPUT_FIELD)
+        if not output or state.get(IncrementalConstants.SIGNATURE_FIELD) != self.exporter.signature():
+            return {}
+
+        try:
+            current = self._describe_output(output_path)
+        except OSError:
+            current = None
+        if current != output:
+            logger.info(IncrementalConstants.LOG_FULL_REWRITE, output_path)
+            return {}
+
+        return {
+            room_id: (digest, offset, length)
+            for room_id, digest, offset, length in state[IncrementalConstants.ROOMS_FIELD]
+        }
+
+    @staticmethod
+    def _describe_output(output_path: str) -> dict[str, Any]:
+        """Identify the exact output file the room offsets refer to."""
+        stat = os.stat(output_path)
+        return {
+            IncrementalConstants.PATH_FIELD: os.path.abspath(output_path),
+            IncrementalConstants.SIZE_FIELD: stat.st_size,
+            IncrementalConstants.MTIME_FIELD: stat.st_mtime_ns,
+        }
+
+    @staticmethod
+    @contextmanager
+    def _map_output(output_path: str) -> Iterator[mmap.mmap]:
+        """Memory-map the previous output for reading."""
+        with open(output_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+    def _save_state(self, output: dict[str, Any] | None, rooms: list[list[Any]]) -> None:
+        """Atomically replace the state file."""
+        state = {
+            IncrementalConstants.VERSION_FIELD: IncrementalConstants.STATE_VERSION,
+            IncrementalConstants.SIGNATURE_FIELD: self.exporter.signature(),
+            IncrementalConstants.OUTPUT_FIELD: output,
+            IncrementalConstants.ROOMS_FIELD: rooms,
+        }
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=IncrementalConstants.TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(state, file, separators=ExporterConstants.COMPACT_JSON_SEPARATORS)
+            os.replace(temp_path, self.state_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from typing import Any, Dict, Generator
+from .exporter import Exporter, ExportStats
+from ..constants.exporter_constants import ExporterConstants
+
+logging.getLogger().setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class JSONExporter(Exporter):
+    """JSON format exporter"""
+
+    extension = ExporterConstants.JSON_EXTENSION
+    item_separator = ExporterConstants.JSON_ITEM_SEPARATOR
+    supports_fragments = True
+
+    def __init__(self, write_chunk_size: int = ExporterConstants.WRITE_BUFFER_SIZE, compact: bool = False):
+        """
+        Args:
+            write_chunk_size: Number of bytes collected before each write to disk
+            compact: Leave out the spaces after ',' and ':'
+        """
+        super().__init__(write_chunk_size)
+        self.compact = compact
+        self.encoder = json.JSONEncoder(
+            check_circular=False,
+            separators=ExporterConstants.COMPACT_JSON_SEPARATORS if compact else None,
+        )
+
+    def export_file(
+        self, data_generator: Generator[Dict[str, Any], None, None], output_path: str
+    ) -> None:
+        """
+        Export data to JSON format.
+
+        Args:
+            data_generator: Stream of room data with students
+            output_path: Target JSON file path
+            (auto-generates if no .json extension)
+        """
+        output_path = self._resolve_output_path(output_path)
+
+        start = time.perf_counter()
+        encode = self.encoder.encode
+        buffer = bytearray(ExporterConstants.JSON_ARRAY_START)
+        rooms = 0
+        bytes_written = 0
+
+        with self._open_output(output_path) as file:
+            for item in data_generator:
+                if rooms:
+                    buffer += ExporterConstants.JSON_ITEM_SEPARATOR
+                buffer += encode(item).encode()
+                rooms += 1
+
+                if len(buffer) >= self.write_chunk_size:
+                    file.write(buffer)
+                    bytes_written += len(buffer)
+                    buffer.clear()
+
+            buffer += ExporterConstants.JSON_ARRAY_END
+            file.write(buffer)
+            bytes_written += len(buffer)
+
+        self.last_export_stats = ExportStats(rooms, bytes_written, time.perf_counter() - start)
+        logger.info(ExporterConstants.LOG_JSON_EXPORTED.format(output_path))
+        logger.info(ExporterConstants.LOG_EXPORT_THROUGHPUT.format(
+            rooms, bytes_written, self.last_export_stats.seconds,
+            self.last_export_stats.rooms_per_second, self.last_export_stats.bytes_per_second / 1e6,
+        ))
+
+    def encode_header(self) -> bytes:
+        return ExporterConstants.JSON_ARRAY_START
+
+    def encode_room(self, room_data: Dict[str, Any]) -> bytes:
+        return self.encoder.encode(room_data).encode()
+
+    def encode_footer(self) -> bytes:
+        return ExporterConstants.JSON_ARRAY_END
+
+    def signature(self) -> str:
+        return f"{type(self).__name__}(compact={self.compact})"
+
+
+class NDJSONExporter(JSONExporter):
+    """Newline-delimited JSON exporter, one room per line"""
+
+    extension = ExporterConstants.NDJSON_EXTENSION
+    item_separator = b""
+
+    def export_file(
+        self, data_generator: Generator[Dict[str, Any], None, None], output_path: str
+    ) -> None:
+        """
+        Export data as one JSON document per room and line.
+
+        Args:
+            data_generator: Stream of room data with students
+            output_path: Target NDJSON file path
+            (auto-generates if no .ndjson extension)
+        """
+        output_path = self._resolve_output_path(output_path)
+
+        start = time.perf_counter()
+        encode = self.encoder.encode
+        buffer = bytearray()
+        rooms = 0
+        bytes_written = 0
+
+        with self._open_output(output_path) as file:
+            for item in data_generator:
+                buffer += encode(item).encode()
+                buffer += ExporterConstants.NDJSON_LINE_END
+                rooms += 1
+
+                if len(buffer) >= self.write_chunk_size:
+                    file.write(buffer)
+                    bytes_written += len(buffer)
+                    buffer.clear()
+
+            file.write(buffer)
+            bytes_written += len(buffer)
+
+        self.last_export_stats = ExportStats(rooms, bytes_written, time.perf_counter() - start)
+        logger.info(ExporterConstants.LOG_NDJSON_EXPORTED.format(output_path))
+
+    def encode_header(self) -> bytes:
+        return b""
+
+    def encode_room(self, room_data: Dict[str, Any]) -> bytes:
+        return self.encoder.encode(room_data).encode() + ExporterConstants.NDJSON_LINE_END
+
+    def encode_footer(self) -> bytes:
+        return b""
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Generator
+
+from .exporter import Exporter, ExportStats
+from ..constants.errors_messages import ErrorMessages
+from ..constants.exporter_constants import ExporterConstants
+from ..services.pipeline import Pipeline
+
+logging.getLogger().setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+
+_worker_exporter: Exporter | None = None
+
+
+def _initialize_worker(exporter: Exporter) -> None:
+    """Keep the exporter in the worker process, so it is not sent with every batch."""
+    global _worker_exporter
+    _worker_exporter = exporter
+
+
+def _encode_batch(rooms: list[Dict[str, Any]]) -> bytes:
+    """Render a batch of rooms as one block, the rooms joined by the exporter's separator."""
+    return _worker_exporter.item_separator.join(map(_worker_exporter.encode_room, rooms))
+
+
+class ParallelExporter:
+    """
+    Renders rooms on a pool of processes and writes them in order.
+
+    Batches of combined rooms are sent to worker processes, which render each
+    into one block with the wrapped exporter's room fragments. The blocks are
+    written by the calling process in submission order, between the
+    exporter's header and footer, so the file is byte-identical to the one
+    export_file writes. A bounded number of batches is in flight at a time.
+    This pays off when rendering costs more than sending the rooms to a
+    worker, e.g. XML or rooms with many students.
+    """
+
+    def __init__(
+        self,
+        exporter: Exporter,
+        workers: int,
+        batch_size: int = ExporterConstants.PARALLEL_BATCH_SIZE,
+    ):
+        """
+        Args:
+            exporter: Exporter rendering the header, rooms and footer
+            workers: Number of worker processes
+            batch_size: Number of rooms sent to a worker at a time
+
+        Raises:
+            ValueError: If the exporter cannot render rooms one at a time
+        """
+        if not exporter.supports_fragments:
+            raise ValueError(ErrorMessages.PARALLEL_EXPORT_UNSUPPORTED_FORMAT.format(type(exporter).__name__))
+        self.exporter = exporter
+        self.workers = workers
+        self.batch_size = batch_size
+
+    def export_file(
+        self, data_generator: Generator[Dict[str, Any], None, None], output_path: str
+    ) -> None:
+        """
+        Export data as the wrapped exporter's export_file would.
+
+        Args:
+            data_generator: Stream of room data with students
+            output_path: Target file path (auto-generates if the extension does not match)
+        """
+        output_path = self.exporter._resolve_output_path(output_path)
+
+        start = time.perf_counter()
+        separator = self.exporter.item_separator
+        rooms = 0
+        bytes_written = 0
+
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=Pipeline.worker_context(),
+            initializer=_initialize_worker, initargs=(self.exporter,),
+        )
+        try:
+            with self.exporter._open_output(output_path) as file:
+                header = self.exporter.encode_header()
+                file.write(header)
+                bytes_written += len(header)
+
+                for batch_rooms, block in self._render(executor, data_generator):
+                    if rooms:
+                        file.write(separator)
+                        bytes_written += len(separator)
+                    file.write(block)
+                    bytes_written += len(block)
+                    rooms += batch_rooms
+
+                footer = self.exporter.encode_footer()
+                file.write(footer)
+                bytes_written += len(footer)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        self.exporter.last_export_stats = ExportStats(rooms, bytes_written, time.perf_counter() - start)
+        logger.info(ExporterConstants.LOG_PARALLEL_EXPORTED.format(output_path, self.workers))
+        logger.info(ExporterConstants.LOG_EXPORT_THROUGHPUT.format(
+            rooms, bytes_written, self.exporter.last_export_stats.seconds,
+            self.exporter.last_export_stats.rooms_per_second,
+            self.exporter.last_export_stats.bytes_per_second / 1e6,
+        ))
+
+    def _render(
+        self, executor: ProcessPoolExecutor, data_generator: Generator[Dict[str, Any], None, None]
+    ) -> Generator[tuple[int, bytes], None, None]:
+        """Yield (number of rooms, rendered block) per batch in input order, keeping a bounded number in flight."""
+        pending: deque[tuple[int, Future]] = deque()
+        window = self.workers * ExporterConstants.PENDING_BATCHES_PER_WORKER
+
+        data_generator = iter(data_generator)
+        while batch := list(islice(data_generator, self.batch_size)):
+            pending.append((len(batch), executor.submit(_encode_batch, batch)))
+            if len(pending) >= window:
+                batch_rooms, future = pending.popleft()
+                yield batch_rooms, future.result()
+
+        while pending:
+            batch_rooms, future = pending.popleft()
+            yield batch_rooms, future.result()
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import IO, Any, Dict, Generator, NamedTuple
+
+from .exporter import Exporter, ExportStats
+from ..constants.errors_messages import ErrorMessages
+from ..constants.exporter_constants import ExporterConstants
+from ..constants.shard_constants import ShardConstants
+from ..services.compression import CompressedFile
+
+logging.getLogger().setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ShardInfo(NamedTuple):
+    """One file of a sharded export."""
+
+    path: str
+    rooms: int
+    bytes: int
+
+
+class _Shard:
+    """A shard being written: its file, the bytes not handed to a writer yet and the last write queued."""
+
+    def __init__(self, path: str, file: IO, header: bytes):
+        self.path = path
+        self.file = file
+        self.buffer = bytearray(header)
+        self.size = len(header)
+        self.rooms = 0
+        self.last_write: Future | None = None
+        self.closed = False
+
+
+class ShardedExporter:
+    """
+    Splits an export into several files written concurrently.
+
+    Each shard is a complete file of the wrapped exporter's format, built from
+    its header, room and footer fragments. Rooms go to a shard by a hash of
+    their id (a fixed number of shards) or fill shards one after the other up
+    to a size; within a shard they keep their input order. Serialized chunks
+    are handed to a thread pool, where the writes of each shard are chained so
+    that they happen in order. A JSON manifest listing the shard files, their
+    room counts and byte sizes is written next to them.
+    """
+
+    def __init__(
+        self,
+        exporter: Exporter,
+        shards: int | None = None,
+        max_shard_size: int | None = None,
+        writer_threads: int = ShardConstants.MAX_WRITER_THREADS,
+    ):
+        """
+        Args:
+            exporter: Exporter rendering the header, rooms and footer of every shard
+            shards: Number of shards rooms are hashed into by id
+            max_shard_size: Uncompressed bytes a shard is filled up to before the next one is
+                started, when shards is not given; a room larger than this gets a shard of its own
+            writer_threads: Maximum number of threads writing shards
+
+        Raises:
+            ValueError: If the exporter cannot render rooms one at a time
+        """
+        if not exporter.supports_fragments:
+            raise ValueError(ErrorMessages.SHARDS_UNSUPPORTED_FORMAT.format(type(exporter).__name__))
+        self.exporter = exporter
+        self.shards = shards
+        self.max_shard_size = max_shard_size
+        self.writer_threads = writer_threads
+        self.last_shards: list[ShardInfo] = []
+        self.last_manifest_path: str | None = None
+
+    @staticmethod
+    def shard_index(room_id: Any, shards: int) -> int:
+        """Shard of a room id; stable across runs and processes, unlike hash()."""
+        return zlib.crc32(str(room_id).encode(ShardConstants.ROOM_ID_ENCODING)) % shards
+
+    @staticmethod
+    def shard_paths(output_path: str) -> tuple[str, str]:
+        """
+        Shard path template and manifest path for an output path.
+
+        'out/rooms.json.gz' gives shards 'out/rooms-00000.json.gz', ... and
+        the manifest 'out/rooms.json.manifest.json'. Braces in the output path
+        are escaped, so template.format(index) gives the path of a shard.
+        """
+        uncompressed = CompressedFile.strip_extension(output_path)
+        compression_extension = output_path[len(uncompressed):]
+        stem, extension = os.path.splitext(uncompressed)
+        return (
+            ShardedExporter._escape_braces(stem) + ShardConstants.SHARD_SUFFIX
+            + ShardedExporter._escape_braces(extension + compression_extension),
+            uncompressed + ShardConstants.MANIFEST_SUFFIX,
+        )
+
+    @staticmethod
+    def _escape_braces(text: str) -> str:
+        """Make text format to itself with str.format."""
+        return text.replace("{", "{{").replace("}", "}}")
+
+    def export_file(
+        self, data_generator: Generator[Dict[str, Any], None, None], output_path: str
+    ) -> list[ShardInfo]:
+        """
+        Write the rooms to shard files and the manifest listing them.
+
+        Args:
+            data_generator: Stream of room data with students
+            output_path: Path the shard and manifest paths are derived from
+                (auto-generates if the extension does not match)
+
+        Returns:
+            list: ShardInfo of every shard, in shard order
+        """
+        output_path = self.exporter._resolve_output_path(output_path)
+        shard_template, manifest_path = self.shard_paths(output_path)
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+
+        start = time.perf_counter()
+        header, footer = self.exporter.encode_header(), self.exporter.encode_footer()
+        separator = self.exporter.item_separator
+        encode_room = self.exporter.encode_room
+        shards: list[_Shard] = []
+        pending: deque[Future] = deque()
+
+        def open_shard() -> _Shard:
+            path = shard_template.format(len(shards))
+            shard = _Shard(path, self.exporter._open_output(path), header)
+            shards.append(shard)
+            return shard
+
+        threads = min(self.shards or self.writer_threads, self.writer_threads)
+        with ThreadPoolExecutor(threads, thread_name_prefix=ShardConstants.WRITER_THREAD_NAME) as pool:
+            try:
+                if self.shards:
+                    for _ in range(self.shards):
+                        open_shard()
+                current = None
+
+                for room_data in data_generator:
+                    fragment = encode_room(room_data)
+                    if self.shards:
+                        shard = shards[self.shard_index(room_data[ExporterConstants.ID_FIELD], self.shards)]
+                    else:
+                        if current is None or (
+                            current.rooms
+                            and current.size + len(separator) + len(fragment) + len(footer) > self.max_shard_size
+                        ):
+                            if current is not None:
+                                self._finish(pool, current, footer, pending)
+                            current = open_shard()
+                        shard = current
+
+                    if shard.rooms:
+                        shard.buffer += separator
+                        shard.size += len(separator)
+                    shard.buffer += fragment
+                    shard.size += len(fragment)
+                    shard.rooms += 1
+                    if len(shard.buffer) >= self.exporter.write_chunk_size:
+                        self._flush(pool, shard, pending)
+
+                if not shards:
+                    open_shard()
+                for shard in shards:
+                    if not shard.closed:
+                        self._finish(pool, shard, footer, pending)
+                for shard in shards:
+                    shard.last_write.result()
+            finally:
+                # After a failure, let queued writes end before closing the files under them.
+                wait([shard.last_write for shard in shards if shard.last_write is not None])
+                for shard in shards:
+                    if not shard.closed:
+                        shard.file.close()
+
+        self.last_shards = [ShardInfo(shard.path, shard.rooms, os.path.getsize(shard.path)) for shard in shards]
+        self._remove_stale_shards(manifest_path, {os.path.abspath(shard.path) for shard in shards})
+        self._write_manifest(manifest_path)
+        self.last_manifest_path = manifest_path
+
+        rooms = sum(shard.rooms for shard in shards)
+        self.exporter.last_export_stats = ExportStats(
+            rooms, sum(shard.size for shard in shards), time.perf_counter() - start
+        )
+        logger.info(
+            ShardConstants.LOG_SHARDS_WRITTEN, rooms, len(shards),
+            ShardConstants.HASH_PARTITIONING if self.shards else ShardConstants.SIZE_PARTITIONING, manifest_path,
+        )
+        return self.last_shards
+
+    def _flush(self, pool: ThreadPoolExecutor, shard: _Shard, pending: deque[Future]) -> None:
+        """Queue the buffered bytes of a shard for writing after its previous write."""
+        shard.last_write = pool.submit(self._write_after, shard.last_write, shard.file, bytes(shard.buffer))
+        shard.buffer.clear()
+        pending.append(shard.last_write)
+        while len(pending) > ShardConstants.MAX_PENDING_WRITES:
+            pending.popleft().result()
+
+    def _finish(self, pool: ThreadPoolExecutor, shard: _Shard, footer: bytes, pending: deque[Future]) -> None:
+        """Queue the footer and the closing of a shard."""
+        shard.buffer += footer
+        shard.size += len(footer)
+        self._flush(pool, shard, pending)
+        shard.last_write = pool.submit(self._close_after, shard.last_write, shard.file)
+        shard.closed = True
+
+    @staticmethod
+    def _write_after(previous: Future | None, file: IO, chunk: bytes) -> None:
+        # Writes of a shard are queued in order, and the pool starts them in order, so waiting never deadlocks.
+        if previous is not None:
+            previous.result()
+        file.write(chunk)
+
+    @staticmethod
+    def _close_after(previous: Future, file: IO) -> None:
+        try:
+            previous.result()
+        finally:
+            file.close()
+
+    @staticmethod
+    def _remove_stale_shards(manifest_path: str, shard_paths: set[str]) -> None:
+        """Delete the shards listed by the previous manifest that this export did not overwrite."""
+        try:
+            with open(manifest_path, encoding="utf-8") as file:
+                previous = json.load(file)[ShardConstants.SHARDS_FIELD]
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+
+        directory = os.path.dirname(os.path.abspath(manifest_path))
+        for entry in previous:
+            path = os.path.join(directory, os.path.basename(str(entry.get(ShardConstants.PATH_FIELD, ""))))
+            if path not in shard_paths and os.path.isfile(path):
+                os.unlink(path)
+
+    def _write_manifest(self, manifest_path: str) -> None:
+        """List the shard files, relative to the manifest, with their room counts and sizes."""
+        manifest = {
+            ShardConstants.FORMAT_FIELD: self.exporter.extension.lstrip("."),
+            ShardConstants.PARTITIONING_FIELD: (
+                ShardConstants.HASH_PARTITIONING if self.shards else ShardConstants.SIZE_PARTITIONING
+            ),
+            ShardConstants.SHARDS_FIELD: [
+                {
+                    ShardConstants.PATH_FIELD: os.path.basename(shard.path),
+                    ShardConstants.ROOMS_FIELD: shard.rooms,
+                    ShardConstants.BYTES_FIELD: shard.bytes,
+                }
+                for shard in self.last_shards
+            ],
+        }
+        with open(manifest_path, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2)
+            file.write("\n")
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Generator
+from .exporter import Exporter
+from ..constants.exporter_constants import ExporterConstants
+
+logging.getLogger().setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _escape_text(text: str) -> str:
+    """Escape element text exactly like ElementTree does."""
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def _escape_attribute(value: str) -> str:
+    """Escape an attribute value exactly like ElementTree does."""
+    value = _escape_text(value)
+    if '"' in value:
+        value = value.replace('"', "&quot;")
+    if "\r" in value:
+        value = value.replace("\r", "&#13;")
+    if "\n" in value:
+        value = value.replace("\n", "&#10;")
+    if "\t" in value:
+        value = value.replace("\t", "&#09;")
+    return value
+
+
+def _name_element(name: str | None) -> str:
+    """Render a name element, self-closing when the name is empty."""
+    if not name:
+        return ExporterConstants.XML_EMPTY_NAME
+    return ExporterConstants.XML_NAME.format(_escape_text(name))
+
+
+class XMLExporter(Exporter):
+    """XML format exporter"""
+
+    extension = ExporterConstants.XML_EXTENSION
+    supports_fragments = True
+
+    def export_file(
+        self, data_generator: Generator[Dict[str, Any], None, None], output_path: str
+    ) -> None:
+        """Export data to XML format
+
+        Args:
+            data_generator: Stream of room data with students
+            output_path: Target XML file path
+            (auto-generates if no .xml extension)
+        """
+        output_path = self._resolve_output_path(output_path)
+
+        with self._open_output(output_path, text=True) as file:
+            file.write(ExporterConstants.XML_DECLARATION)
+            file.write(f"<{ExporterConstants.XML_ROOT_ELEMENT}>\n")
+
+            for room_data in data_generator:
+                file.write(self.render_room(room_data))
+
+            file.write(f"</{ExporterConstants.XML_ROOT_ELEMENT}>\n")
+
+        logger.info(ExporterConstants.LOG_XML_EXPORTED.format(output_path))
+
+    def encode_header(self) -> bytes:
+        return (ExporterConstants.XML_DECLARATION + f"<{ExporterConstants.XML_ROOT_ELEMENT}>\n").encode()
+
+    def encode_room(self, room_data: Dict[str, Any]) -> bytes:
+        return self.render_room(room_data).encode()
+
+    def encode_footer(self) -> bytes:
+        return f"</{ExporterConstants.XML_ROOT_ELEMENT}>\n".encode()
+
+    @staticmethod
+    def render_room(room_data: Dict[str, Any]) -> str:
+        """
+        Render one room as an indented XML line.
+
+        Text and attributes are escaped directly into pre-built tag fragments,
+        producing the same output as serializing an ElementTree of the room.
+        """
+        students = room_data[ExporterConstants.STUDENTS_FIELD]
+        if students:
+            students_xml = (ExporterConstants.XML_STUDENTS_OPEN
+                            + XMLExporter._render_students(students)
+                            + ExporterConstants.XML_STUDENTS_CLOSE)
+        else:
+            students_xml = ExporterConstants.XML_EMPTY_STUDENTS
+
+        return (
+            ExporterConstants.XML_ROOM_OPEN.format(_escape_attribute(str(room_data[ExporterConstants.ID_FIELD])))
+            + _name_element(room_data[ExporterConstants.NAME_FIELD])
+            + students_xml
+            + ExporterConstants.XML_ROOM_CLOSE
+        )
+
+    @staticmethod
+    def _render_students(students: list[Dict[str, Any]]) -> str:
+        """Render the student elements of a room, skipping escaping when nothing needs it."""
+        ids = [student[ExporterConstants.ID_FIELD] for student in students]
+        names = [student[ExporterConstants.NAME_FIELD] for student in students]
+
+        if set(map(type, ids)) == {int} and set(map(type, names)) == {str} and all(names):
+            joined_names = "".join(names)
+            if "&" not in joined_names and "<" not in joined_names and ">" not in joined_names:
+                return "".join([
+                    ExporterConstants.XML_PLAIN_STUDENT.format(student_id, name)
+                    for student_id, name in zip(ids, names)
+                ])
+
+        return "".join([
+            ExporterConstants.XML_STUDENT.format(_escape_attribute(str(student_id)), _name_element(name))
+            for student_id, name in zip(ids, names)
+        ])
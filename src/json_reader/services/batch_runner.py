@@ -0,0 +1,268 @@
+import argparse
+import json
+import logging
+import os
+import time
+import tomllib
+import types
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, NamedTuple, Union, get_args, get_origin, get_type_hints
+
+from .cli_parser import CLIArguments, CLIParser
+from .parallel_loader import ParallelLoader
+from .parse_cache import ParseCache
+from .rejection_sink import RejectionSink
+from ..constants.batch_constants import BatchConstants
+from ..constants.errors_messages import ErrorMessages
+
+logging.getLogger().setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class BatchJob(NamedTuple):
+    """One export of a batch manifest."""
+
+    name: str
+    arguments: CLIArguments | None
+    error: str | None = None
+
+
+class JobResult(NamedTuple):
+    """Outcome of one batch job."""
+
+    name: str
+    succeeded: bool
+    seconds: float
+    error: str | None = None
+
+
+class SharedRoomFiles:
+    """
+    Valid rooms of recently loaded room files, kept for the later jobs of a worker.
+
+    Entries are keyed by path, size and mtime, so a file changed between jobs
+    is loaded again. Rejections found while loading are replayed into the sink
+    of every job that uses the rooms.
+    """
+
+    def __init__(self, max_files: int = BatchConstants.SHARED_ROOM_FILES):
+        """
+        Args:
+            max_files: Number of room files kept, least recently used ones are dropped
+        """
+        self.max_files = max_files
+        self._files: OrderedDict = OrderedDict()
+
+    def load(self, arguments: CLIArguments, sink: RejectionSink, cache: ParseCache | None = None) -> Iterator[dict]:
+        """
+        Return the valid rooms of arguments.room_file_path, loading them on first use.
+
+        Args:
+            arguments: Options of the job, used to load the file
+            sink: Where the rejected rooms of the file are reported
+            cache: Parse cache used when the file has to be loaded
+        """
+        path = arguments.room_file_path
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+        if key in self._files:
+            self._files.move_to_end(key)
+        else:
+            load_sink = RejectionSink(sink.sample_rate, keep_rejected=True)
+            rooms = list(ParallelLoader.load_valid_data(
+                path, "room",
+                arguments.workers, arguments.preserve_order,
+                arguments.ijson_backend, arguments.read_buffer_size, arguments.use_mmap,
+                arguments.validation_batch_size, load_sink, cache,
+            ))
+            self._files[key] = (rooms, *load_sink.drain())
+            while len(self._files) > self.max_files:
+                self._files.popitem(last=False)
+
+        rooms, counts, rejected = self._files[key]
+        sink.merge(counts, rejected)
+        return iter(rooms)
+
+
+_shared_rooms = SharedRoomFiles()
+
+
+def _run_job(job_function: Callable[[CLIArguments, SharedRoomFiles], None], job: BatchJob) -> JobResult:
+    """Run one job in the current process, turning any failure into a failed result."""
+    start = time.perf_counter()
+    try:
+        job_function(CLIParser.validate_arguments(job.arguments), _shared_rooms)
+    except Exception as e:
+        return JobResult(job.name, False, time.perf_counter() - start, str(e))
+    return JobResult(job.name, True, time.perf_counter() - start)
+
+
+class BatchRunner:
+    """Runs the jobs of a manifest on a pool of long-lived worker processes."""
+
+    @staticmethod
+    def load_manifest(path: str, defaults: CLIArguments) -> list[BatchJob]:
+        """
+        Read the jobs of a JSON or TOML manifest.
+
+        A manifest is a list of jobs, or holds one under 'jobs' (a TOML file
+        uses [[jobs]] tables). Each job sets student_file_path, room_file_path
+        and output_destination, an optional name, and may override any other
+        option; the remaining options come from defaults. Relative paths are
+        resolved against the manifest's directory, and sizes may be written
+        like 512M.
+
+        Args:
+            path: Manifest file path
+            defaults: Options shared by all jobs
+
+        Returns:
+            list[BatchJob]: The jobs in manifest order; a malformed job carries its error instead of arguments
+
+        Raises:
+            ValueError: If the manifest cannot be parsed or holds no job list
+            OSError: If the manifest cannot be read
+        """
+        with open(path, "rb") as file:
+            try:
+                if path.endswith(BatchConstants.TOML_EXTENSION):
+                    manifest = tomllib.load(file)
+                else:
+                    manifest = json.load(file)
+            except (tomllib.TOMLDecodeError, ValueError) as e:
+                raise ValueError(ErrorMessages.INVALID_MANIFEST.format(path)) from e
+
+        if isinstance(manifest, dict):
+            manifest = manifest.get(BatchConstants.JOBS_FIELD)
+        if not isinstance(manifest, list):
+            raise ValueError(ErrorMessages.INVALID_MANIFEST.format(path))
+
+        base_directory = os.path.dirname(os.path.abspath(path))
+        return [BatchRunner._parse_job(index, job, defaults, base_directory) for index, job in enumerate(manifest)]
+
+    @staticmethod
+    def _parse_job(index: int, job: Any, defaults: CLIArguments, base_directory: str) -> BatchJob:
+        """Turn one manifest entry into job arguments, or a job carrying the reason it is invalid."""
+        if not isinstance(job, dict):
+            return BatchJob(str(index), None, ErrorMessages.INVALID_JOB.format(index, job))
+
+        options = dict(job)
+        name = str(options.pop(BatchConstants.NAME_FIELD, index))
+
+        allowed = set(CLIArguments._fields) - set(BatchConstants.BATCH_ONLY_FIELDS)
+        unknown = sorted(set(options) - allowed)
+        if unknown:
+            return BatchJob(name, None, ErrorMessages.UNKNOWN_JOB_FIELDS.format(name, ", ".join(unknown)))
+        missing = [field for field in BatchConstants.REQUIRED_FIELDS if field not in options]
+        if missing:
+            return BatchJob(name, None, ErrorMessages.MISSING_JOB_FIELDS.format(name, ", ".join(missing)))
+
+        try:
+            for field in BatchConstants.SIZE_FIELDS:
+                if isinstance(options.get(field), str):
+                    options[field] = CLIParser._parse_memory_size(options[field])
+        except (ValueError, argparse.ArgumentTypeError) as e:
+            return BatchJob(name, None, str(e))
+        for field in BatchConstants.PATH_FIELDS:
+            if isinstance(options.get(field), str):
+                options[field] = os.path.join(base_directory, os.path.expanduser(options[field]))
+
+        field_types = get_type_hints(CLIArguments)
+        for field, value in options.items():
+            if not BatchRunner._matches_type(value, field_types[field]):
+                return BatchJob(name, None, ErrorMessages.INVALID_JOB_FIELD.format(name, field, value))
+
+        return BatchJob(name, defaults._replace(manifest=None, **options))
+
+    @staticmethod
+    def _matches_type(value: Any, annotation: Any) -> bool:
+        """
+        Check a manifest value against the type of its CLIArguments field.
+
+        Booleans are not accepted as numbers, ints are accepted as floats and
+        lists as tuples, since JSON and TOML have no tuples.
+        """
+        origin, arguments = get_origin(annotation), get_args(annotation)
+        if origin in (Union, types.UnionType):
+            return any(BatchRunner._matches_type(value, argument) for argument in arguments)
+        if annotation is type(None):
+            return value is None
+        if annotation is float:
+            return type(value) in (int, float)
+        if origin is dict:
+            key_type, value_type = arguments
+            return isinstance(value, dict) and all(
+                BatchRunner._matches_type(key, key_type) and BatchRunner._matches_type(item, value_type)
+                for key, item in value.items()
+            )
+        if origin is tuple:
+            if not isinstance(value, (list, tuple)):
+                return False
+            if len(arguments) == 2 and arguments[1] is Ellipsis:
+                return all(BatchRunner._matches_type(item, arguments[0]) for item in value)
+            return len(value) == len(arguments) and all(map(BatchRunner._matches_type, value, arguments))
+        return type(value) is annotation
+
+    @staticmethod
+    def run(
+        jobs: list[BatchJob],
+        workers: int,
+        job_function: Callable[[CLIArguments, SharedRoomFiles], None],
+    ) -> list[JobResult]:
+        """
+        Run the jobs and report each one's outcome.
+
+        Worker processes stay up for the whole batch, so imports and parsed
+        room files are reused from one job to the next. Jobs are handed out
+        grouped by room file, which keeps shared room files in the workers'
+        caches; a failing job does not stop the others.
+
+        Args:
+            jobs: Jobs from load_manifest
+            workers: Number of worker processes; 1 runs the jobs in this process
+            job_function: Runs one export, given its arguments and the worker's shared room files
+
+        Returns:
+            list[JobResult]: One result per job, in manifest order
+        """
+        runnable = sorted(
+            (index for index, job in enumerate(jobs) if job.arguments is not None),
+            key=lambda index: os.path.abspath(jobs[index].arguments.room_file_path),
+        )
+        results: dict[int, JobResult] = {
+            index: JobResult(job.name, False, 0.0, job.error)
+            for index, job in enumerate(jobs) if job.arguments is None
+        }
+
+        if workers <= 1 or len(runnable) <= 1:
+            for index in runnable:
+                results[index] = _run_job(job_function, jobs[index])
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(runnable))) as pool:
+                futures: dict[int, Future] = {
+                    index: pool.submit(_run_job, job_function, jobs[index]) for index in runnable
+                }
+                for index, future in futures.items():
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:
+                        results[index] = JobResult(jobs[index].name, False, 0.0, str(e))
+
+        ordered = [results[index] for index in range(len(jobs))]
+        for result in ordered:
+            if result.succeeded:
+                logger.info(BatchConstants.LOG_JOB_SUCCEEDED, result.name, result.seconds)
+            else:
+                logger.error(BatchConstants.LOG_JOB_FAILED, result.name, result.seconds, result.error)
+        logger.info(BatchConstants.LOG_BATCH_SUMMARY, sum(result.succeeded for result in ordered), len(ordered))
+        return ordered
+
+    @staticmethod
+    def exit_status(results: list[JobResult]) -> int:
+        """0 if every job succeeded, 1 otherwise."""
+        if all(result.succeeded for result in results):
+            return BatchConstants.EXIT_SUCCESS
+        return BatchConstants.EXIT_FAILURE
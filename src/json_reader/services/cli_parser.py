@@ -1,8 +1,63 @@
 import argparse
 import os
 from pathlib import Path
+from typing import NamedTuple
+from ..constants.cache_constants import CacheConstants
 from ..constants.errors_messages import ErrorMessages
 from ..constants.cli_parser_constants import CLIParserConstants
+from ..constants.dedup_constants import DedupConstants
+from ..constants.exporter_constants import ExporterConstants
+from ..constants.loader_constants import LoaderConstants
+from ..constants.pipeline_constants import PipelineConstants
+from ..constants.profiler_constants import ProfilerConstants
+from ..constants.service_constants import ServiceConstants
+from ..constants.validation_constants import FilterConstants, RejectionConstants
+from .compression import CompressedFile
+from ..exporters.exporter_factory import ExporterFactory
+
+
+class CLIArguments(NamedTuple):
+    """Parsed command-line arguments."""
+
+    student_file_path: str
+    room_file_path: str
+    output_format: str
+    output_destination: str
+    max_memory: int | None = None
+    workers: int = 1
+    preserve_order: bool = True
+    ijson_backend: str | None = None
+    read_buffer_size: int = LoaderConstants.READ_BUFFER_SIZE
+    use_mmap: bool = False
+    validation_batch_size: int = FilterConstants.DEFAULT_BATCH_SIZE
+    rejection_sample_rate: float = RejectionConstants.DEFAULT_SAMPLE_RATE
+    quarantine_file: str | None = None
+    write_chunk_size: int = ExporterConstants.WRITE_BUFFER_SIZE
+    compact_json: bool = False
+    use_cache: bool = True
+    cache_dir: str | None = None
+    cache_max_size: int = CacheConstants.DEFAULT_MAX_SIZE
+    incremental_state: str | None = None
+    delta_file: str | None = None
+    pipeline: bool = False
+    pipeline_queue_depth: int = PipelineConstants.QUEUE_DEPTH
+    stage_queue_depths: dict[str, int] | None = None
+    pipeline_batch_size: int = PipelineConstants.BATCH_SIZE
+    manifest: str | None = None
+    batch_workers: int = 1
+    metrics: str | None = None
+    profile: str | None = None
+    profile_dir: str = ProfilerConstants.DEFAULT_DIR
+    serve_address: str | None = None
+    watch_interval: float = ServiceConstants.DEFAULT_WATCH_INTERVAL
+    sorted_by_room: bool = False
+    dedup_policy: str | None = None
+    shards: int | None = None
+    max_shard_size: int | None = None
+    export_workers: int = 1
+    room_ids: tuple[int, ...] | None = None
+    room_id_range: tuple[int | None, int | None] | None = None
+    room_name_prefix: str | None = None
 
 
 class CLIParser:
@@ -55,32 +110,242 @@ class CLIParser:
                 )
 
     @staticmethod
-    def parse_cli() -> tuple[str, str, str, str]:
+    def _resolve_output_format(output_format: str | None, output_destination: str) -> str:
+        """
+        Check the output format against the destination extension.
+
+        A trailing compression extension such as .gz is ignored. A format
+        that is not built in is looked up in ExporterFactory, and its
+        exporter's extension is expected.
+
+        Args:
+            output_format: Format given on the command line, if any
+            output_destination: Output path, or the default output directory
+
+        Returns:
+            str: The given format, else the one implied by the extension, else json
+
+        Raises:
+            ValueError: If the format or extension is unknown, or they contradict each other
+        """
+        uncompressed_destination = CompressedFile.strip_extension(output_destination)
+        if output_format is not None and output_format not in CLIParserConstants.FILE_TYPE_EXTENSIONS:
+            extension = ExporterFactory.get_exporter_class(output_format).extension
+            if (output_destination != CLIParserConstants.DEFAULT_OUTPUT_DIRECTORY
+                    and not uncompressed_destination.endswith(extension)):
+                raise ValueError(ErrorMessages.FORMAT_MISMATCH.format(output_format.upper(), extension))
+            return output_format
+
+        if output_destination == CLIParserConstants.DEFAULT_OUTPUT_DIRECTORY:
+            return output_format or CLIParserConstants.DEFAULT_FILE_TYPE
+
+        destination_format = next(
+            (file_type for file_type, extension in CLIParserConstants.FILE_TYPE_EXTENSIONS.items()
+             if uncompressed_destination.endswith(extension)),
+            None,
+        )
+        if destination_format is None:
+            raise ValueError(ErrorMessages.INVALID_FILE_EXTENSION.format(
+                ", ".join(CLIParserConstants.FILE_TYPE_EXTENSIONS.values()), output_destination
+            ))
+
+        if output_format is not None and output_format != destination_format:
+            raise ValueError(ErrorMessages.FORMAT_MISMATCH.format(
+                output_format.upper(), CLIParserConstants.FILE_TYPE_EXTENSIONS[destination_format]
+            ))
+        return destination_format
+
+    @staticmethod
+    def _parse_memory_size(value: str) -> int:
+        """
+        Convert a memory size such as 512M or 2G into bytes.
+
+        Args:
+            value: Size with an optional K, M or G suffix
+
+        Raises:
+            argparse.ArgumentTypeError: If the size is malformed or not positive
+        """
+        value = value.strip().upper().removesuffix("B")
+        unit = value[-1:] if value[-1:] in CLIParserConstants.MEMORY_SIZE_UNITS else ""
+        number = value[:len(value) - len(unit)]
+
+        try:
+            size = int(float(number) * CLIParserConstants.MEMORY_SIZE_UNITS[unit])
+        except (ValueError, OverflowError):
+            raise argparse.ArgumentTypeError(ErrorMessages.INVALID_MEMORY_SIZE.format(value))
+
+        if size <= 0:
+            raise argparse.ArgumentTypeError(ErrorMessages.INVALID_MEMORY_SIZE.format(value))
+        return size
+
+    @staticmethod
+    def _parse_positive_int(value: str, error_message: str) -> int:
+        """
+        Convert an argument into a positive integer.
+
+        Raises:
+            argparse.ArgumentTypeError: If the value is not a positive integer
+        """
+        try:
+            number = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(error_message.format(value))
+
+        if number < 1:
+            raise argparse.ArgumentTypeError(error_message.format(value))
+        return number
+
+    @staticmethod
+    def _parse_worker_count(value: str) -> int:
+        """Convert a worker count argument into a positive integer."""
+        return CLIParser._parse_positive_int(value, ErrorMessages.INVALID_WORKER_COUNT)
+
+    @staticmethod
+    def _parse_batch_size(value: str) -> int:
+        """Convert a batch size argument into a positive integer."""
+        return CLIParser._parse_positive_int(value, ErrorMessages.INVALID_BATCH_SIZE)
+
+    @staticmethod
+    def _parse_shard_count(value: str) -> int:
+        """Convert a shard count argument into a positive integer."""
+        return CLIParser._parse_positive_int(value, ErrorMessages.INVALID_SHARD_COUNT)
+
+    @staticmethod
+    def _parse_room_ids(value: str) -> tuple[int, ...]:
+        """
+        Convert a comma-separated list of room ids into integers.
+
+        Raises:
+            argparse.ArgumentTypeError: If an id is not an integer or the list is empty
+        """
+        try:
+            room_ids = tuple(
+                int(room_id) for room_id in value.split(CLIParserConstants.ROOM_IDS_SEPARATOR) if room_id.strip()
+            )
+        except ValueError:
+            raise argparse.ArgumentTypeError(ErrorMessages.INVALID_ROOM_IDS.format(value))
+
+        if not room_ids:
+            raise argparse.ArgumentTypeError(ErrorMessages.INVALID_ROOM_IDS.format(value))
+        return room_ids
+
+    @staticmethod
+    def _parse_room_id_range(value: str) -> tuple[int | None, int | None]:
+        """
+        Convert an inclusive room id range such as 100-199, 100- or -199 into its bounds.
+
+        Raises:
+            argparse.ArgumentTypeError: If a bound is not an integer, both are missing or LOW > HIGH
+        """
+        low, separator, high = value.strip().partition(CLIParserConstants.ROOM_ID_RANGE_SEPARATOR)
+        try:
+            bounds = (int(low) if low else None, int(high) if high else None)
+        except ValueError:
+            raise argparse.ArgumentTypeError(ErrorMessages.INVALID_ROOM_ID_RANGE.format(value))
+
+        if not separator or bounds == (None, None) or (None not in bounds and bounds[0] > bounds[1]):
+            raise argparse.ArgumentTypeError(ErrorMessages.INVALID_ROOM_ID_RANGE.format(value))
+        return bounds
+
+    @staticmethod
+    def _parse_sample_rate(value: str) -> float:
+        """
+        Convert a sample rate argument into a fraction between 0 and 1.
+
+        Raises:
+            argparse.ArgumentTypeError: If the value is not a number in that range
+        """
+        try:
+            rate = float(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(ErrorMessages.INVALID_SAMPLE_RATE.format(value))
+
+        if not 0 <= rate <= 1:
+            raise argparse.ArgumentTypeError(ErrorMessages.INVALID_SAMPLE_RATE.format(value))
+        return rate
+
+    @staticmethod
+    def _parse_watch_interval(value: str) -> float:
+        """
+        Convert a watch interval argument into seconds, 0 meaning no watching.
+
+        Raises:
+            argparse.ArgumentTypeError: If the value is not a non-negative number
+        """
+        try:
+            interval = float(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(ErrorMessages.INVALID_WATCH_INTERVAL.format(value))
+
+        if interval < 0:
+            raise argparse.ArgumentTypeError(ErrorMessages.INVALID_WATCH_INTERVAL.format(value))
+        return interval
+
+    @staticmethod
+    def _parse_stage_queue_depth(value: str) -> tuple[str, int]:
+        """
+        Convert a STAGE=N argument into a (stage, queue depth) pair.
+
+        Raises:
+            argparse.ArgumentTypeError: If the stage is unknown or the depth is not a positive integer
+        """
+        stage, separator, depth = value.partition(CLIParserConstants.STAGE_QUEUE_DEPTH_SEPARATOR)
+        error = ErrorMessages.INVALID_STAGE_QUEUE_DEPTH.format(", ".join(PipelineConstants.STAGES), value)
+        if not separator or stage not in PipelineConstants.STAGES:
+            raise argparse.ArgumentTypeError(error)
+        try:
+            depth = int(depth)
+        except ValueError:
+            raise argparse.ArgumentTypeError(error)
+        if depth < 1:
+            raise argparse.ArgumentTypeError(error)
+        return stage, depth
+
+    @staticmethod
+    def parse_cli() -> CLIArguments:
         """
         Parse command-line arguments for the application.
 
         Returns:
-            tuple: (student_file_path, room_file_path,
-             output_format, output_destination)
+            CLIArguments: (student_file_path, room_file_path,
+             output_format, output_destination, max_memory,
+             workers, preserve_order, ijson_backend,
+             read_buffer_size, use_mmap, validation_batch_size,
+             rejection_sample_rate, quarantine_file,
+             write_chunk_size, compact_json,
+             use_cache, cache_dir, cache_max_size,
+             incremental_state, delta_file,
+             pipeline, pipeline_queue_depth,
+             stage_queue_depths, pipeline_batch_size,
+             manifest, batch_workers, metrics,
+             profile, profile_dir,
+             serve_address, watch_interval,
+             sorted_by_room, dedup_policy,
+             shards, max_shard_size, export_workers,
+             room_ids, room_id_range, room_name_prefix)
+
+            With --manifest the arguments only hold the defaults of the batch
+            jobs and are not validated; see validate_arguments. With --serve
+            there is no output to validate.
         """
         parser = argparse.ArgumentParser(description="parse CLI")
 
         parser.add_argument(
             CLIParserConstants.STUDENT_FILE_PATH_ARG,
             type=str,
-            required=True,
             help="path to students' json file",
         )
 
         parser.add_argument(
-            CLIParserConstants.ROOM_FILE_PATH_ARG, type=str, required=True, help="path to room json file"
+            CLIParserConstants.ROOM_FILE_PATH_ARG, type=str, help="path to room json file"
         )
 
         parser.add_argument(
             CLIParserConstants.OUTPUT_FORMAT_ARG,
-            type=str,
-            choices=[CLIParserConstants.JSON_FILE_TYPE, CLIParserConstants.XML_FILE_TYPE],
-            help="output file format",
+            type=str.lower,
+            help=f"output file format: {', '.join(CLIParserConstants.FILE_TYPE_EXTENSIONS)} or one added by a plugin "
+                 "(default: inferred from the destination extension, else json)",
         )
 
         parser.add_argument(
@@ -90,34 +355,332 @@ class CLIParser:
             help="output destination",
         )
 
+        parser.add_argument(
+            CLIParserConstants.MAX_MEMORY_ARG,
+            type=CLIParser._parse_memory_size,
+            default=None,
+            help="memory budget for grouping students, e.g. 512M; spills to temp files when exceeded",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.WORKERS_ARG,
+            type=CLIParser._parse_worker_count,
+            default=1,
+            help="number of processes used to parse and validate input files",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.UNORDERED_ARG,
+            action="store_true",
+            help="with several workers, do not keep input order (rooms and students may be reordered)",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.IJSON_BACKEND_ARG,
+            type=str,
+            choices=LoaderConstants.IJSON_BACKENDS,
+            default=None,
+            help=f"ijson backend to parse with (default: ${LoaderConstants.IJSON_BACKEND_ENV_VAR} or fastest available)",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.READ_BUFFER_SIZE_ARG,
+            type=CLIParser._parse_memory_size,
+            default=LoaderConstants.READ_BUFFER_SIZE,
+            help="number of bytes read from input files at a time, e.g. 1M",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.MMAP_ARG,
+            action="store_true",
+            help="read input files through a memory map",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.VALIDATION_BATCH_SIZE_ARG,
+            type=CLIParser._parse_batch_size,
+            default=FilterConstants.DEFAULT_BATCH_SIZE,
+            help="number of records validated together",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.REJECTION_SAMPLE_RATE_ARG,
+            type=CLIParser._parse_sample_rate,
+            default=RejectionConstants.DEFAULT_SAMPLE_RATE,
+            help="fraction of rejected records that are logged, from 0 to 1",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.QUARANTINE_FILE_ARG,
+            type=str,
+            default=None,
+            help="NDJSON file receiving every rejected record",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.WRITE_CHUNK_SIZE_ARG,
+            type=CLIParser._parse_memory_size,
+            default=ExporterConstants.WRITE_BUFFER_SIZE,
+            help="bytes of output collected before each write, e.g. 4M",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.COMPACT_JSON_ARG,
+            action="store_true",
+            help="write JSON without spaces after separators",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.NO_CACHE_ARG,
+            action="store_true",
+            help="always parse and validate input files instead of using the parse cache",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.CACHE_DIR_ARG,
+            type=str,
+            default=None,
+            help=f"parse cache directory (default: ${CacheConstants.DIR_ENV_VAR} or {CacheConstants.DEFAULT_DIR})",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.CACHE_MAX_SIZE_ARG,
+            type=CLIParser._parse_memory_size,
+            default=CacheConstants.DEFAULT_MAX_SIZE,
+            help="total size the parse cache is trimmed to, e.g. 1G",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.INCREMENTAL_STATE_ARG,
+            type=str,
+            default=None,
+            help="sidecar state file with per-room digests; unchanged rooms are copied from the previous output",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.DELTA_FILE_ARG,
+            type=str,
+            default=None,
+            help="with --incremental-state, write only added, changed and removed rooms to this NDJSON file",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.PIPELINE_ARG,
+            action="store_true",
+            help="run loading, combining and exporting as concurrent stages connected by bounded queues",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.PIPELINE_QUEUE_DEPTH_ARG,
+            type=CLIParser._parse_batch_size,
+            default=PipelineConstants.QUEUE_DEPTH,
+            help="with --pipeline, batches buffered between stages before the producer is paused",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.STAGE_QUEUE_DEPTH_ARG,
+            type=CLIParser._parse_stage_queue_depth,
+            action="append",
+            default=[],
+            help=f"with --pipeline, queue depth of one stage, e.g. rooms=1000; stages: {', '.join(PipelineConstants.STAGES)}",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.PIPELINE_BATCH_SIZE_ARG,
+            type=CLIParser._parse_batch_size,
+            default=PipelineConstants.BATCH_SIZE,
+            help="with --pipeline, number of records handed between stages at a time",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.MANIFEST_ARG,
+            type=str,
+            default=None,
+            help="JSON or TOML list of jobs to run as a batch; the other flags are their defaults",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.BATCH_WORKERS_ARG,
+            type=CLIParser._parse_worker_count,
+            default=os.cpu_count() or 1,
+            help="number of processes running batch jobs (default: number of CPUs)",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.METRICS_ARG,
+            type=str,
+            default=None,
+            help="write per-stage timings, record counts and peak memory to this JSON file, or Prometheus textfile if it ends in .prom",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.PROFILE_ARG,
+            type=str,
+            choices=ProfilerConstants.MODES,
+            default=None,
+            help="profile the run: cpu writes pstats and collapsed stacks, memory writes tracemalloc snapshots between stages",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.PROFILE_DIR_ARG,
+            type=str,
+            default=ProfilerConstants.DEFAULT_DIR,
+            help=f"directory receiving the --profile report (default: {ProfilerConstants.DEFAULT_DIR})",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.SERVE_ARG,
+            type=str,
+            default=None,
+            help="serve room and student lookups and exports from memory on HOST:PORT, PORT or a Unix socket path",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.WATCH_INTERVAL_ARG,
+            type=CLIParser._parse_watch_interval,
+            default=ServiceConstants.DEFAULT_WATCH_INTERVAL,
+            help="with --serve, seconds between checks of the input files for changes; 0 disables reloading",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.SORTED_BY_ROOM_ARG,
+            action="store_true",
+            help="rooms are sorted by id and students by room id; join them in one streaming pass",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.DEDUP_ARG,
+            type=str,
+            choices=DedupConstants.POLICIES,
+            default=None,
+            help="drop records with an id seen before: keep the first or the last copy, or reject every copy",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.SHARDS_ARG,
+            type=CLIParser._parse_shard_count,
+            default=None,
+            help="split the output into this many files, rooms hashed by id, written concurrently",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.MAX_SHARD_SIZE_ARG,
+            type=CLIParser._parse_memory_size,
+            default=None,
+            help="split the output into files of about this many bytes, e.g. 256M, written concurrently",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.EXPORT_WORKERS_ARG,
+            type=CLIParser._parse_worker_count,
+            default=1,
+            help="number of processes rendering rooms for the export; the output stays the same",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.ROOM_IDS_ARG,
+            type=CLIParser._parse_room_ids,
+            default=None,
+            help="only export these rooms, e.g. 3,17,42; other rooms and their students are skipped while parsing",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.ROOM_ID_RANGE_ARG,
+            type=CLIParser._parse_room_id_range,
+            default=None,
+            help="only export rooms with ids in this inclusive range, e.g. 100-199, 100- or -199",
+        )
+
+        parser.add_argument(
+            CLIParserConstants.ROOM_NAME_PREFIX_ARG,
+            default=None,
+            help="only export rooms whose name starts with this prefix; rooms are loaded before students",
+        )
+
         arguments = parser.parse_args()
 
-        if arguments.output_destination != CLIParserConstants.DEFAULT_OUTPUT_DIRECTORY and (
-                not arguments.output_destination.endswith(CLIParserConstants.JSON_EXTENSION)
-                and not arguments.output_destination.endswith(CLIParserConstants.XML_EXTENSION)
-        ):
-            raise ValueError(ErrorMessages.INVALID_FILE_EXTENSION.format(arguments.output_destination))
+        if arguments.manifest is None and (arguments.student_file_path is None or arguments.room_file_path is None):
+            parser.error(ErrorMessages.MISSING_INPUT_FILES)
 
-        if (
-                arguments.output_destination.endswith(CLIParserConstants.JSON_EXTENSION)
-                and arguments.output_format == CLIParserConstants.XML_FILE_TYPE
-        ):
-            raise ValueError(ErrorMessages.FORMAT_MISMATCH_XML_JSON)
+        parsed = CLIArguments(
+            arguments.student_file_path,
+            arguments.room_file_path,
+            arguments.output_format,
+            arguments.output_destination,
+            arguments.max_memory,
+            arguments.workers,
+            not arguments.unordered,
+            arguments.ijson_backend,
+            arguments.read_buffer_size,
+            arguments.mmap,
+            arguments.validation_batch_size,
+            arguments.rejection_sample_rate,
+            arguments.quarantine_file,
+            arguments.write_chunk_size,
+            arguments.compact_json,
+            not arguments.no_cache,
+            arguments.cache_dir,
+            arguments.cache_max_size,
+            arguments.incremental_state,
+            arguments.delta_file,
+            arguments.pipeline,
+            arguments.pipeline_queue_depth,
+            dict(arguments.stage_queue_depth),
+            arguments.pipeline_batch_size,
+            arguments.manifest,
+            arguments.batch_workers,
+            arguments.metrics,
+            arguments.profile,
+            arguments.profile_dir,
+            arguments.serve,
+            arguments.watch_interval,
+            arguments.sorted_by_room,
+            arguments.dedup,
+            arguments.shards,
+            arguments.max_shard_size,
+            arguments.export_workers,
+            arguments.room_ids,
+            arguments.room_id_range,
+            arguments.room_name_prefix,
+        )
+        return parsed if parsed.manifest or parsed.serve_address else CLIParser.validate_arguments(parsed)
+
+    @staticmethod
+    def validate_arguments(arguments: CLIArguments) -> CLIArguments:
+        """
+        Check the options of one export and resolve its output format.
+
+        Args:
+            arguments: Options of a single export, from the command line or a batch manifest
 
-        if (
-                arguments.output_destination.endswith(CLIParserConstants.XML_EXTENSION)
-                and arguments.output_format == CLIParserConstants.JSON_FILE_TYPE
+        Returns:
+            CLIArguments: The arguments with the output format filled in
+
+        Raises:
+            ValueError: If the options contradict each other or the output path is unusable
+        """
+        output_format = CLIParser._resolve_output_format(arguments.output_format, arguments.output_destination)
+
+        if arguments.compact_json and output_format not in CLIParserConstants.JSON_ENCODED_FILE_TYPES:
+            raise ValueError(ErrorMessages.COMPACT_REQUIRES_JSON)
+
+        if arguments.delta_file and not arguments.incremental_state:
+            raise ValueError(ErrorMessages.DELTA_REQUIRES_STATE)
+
+        if arguments.shards and arguments.max_shard_size:
+            raise ValueError(ErrorMessages.SHARDS_CONFLICT)
+
+        if (arguments.shards or arguments.max_shard_size) and arguments.incremental_state:
+            raise ValueError(ErrorMessages.SHARDS_WITH_INCREMENTAL)
+
+        if arguments.export_workers > 1 and (
+            arguments.shards or arguments.max_shard_size or arguments.incremental_state
         ):
-            raise ValueError(ErrorMessages.FORMAT_MISMATCH_JSON_XML)
+            raise ValueError(ErrorMessages.EXPORT_WORKERS_CONFLICT)
 
         try:
             CLIParser._validate_output_path(arguments.output_destination)
         except ValueError:
             raise ValueError(ErrorMessages.INVALID_OUTPUT_PATH)
 
-        return (
-            arguments.student_file_path,
-            arguments.room_file_path,
-            arguments.output_format,
-            arguments.output_destination,
-        )
+        return arguments._replace(output_format=output_format)
@@ -0,0 +1,201 @@
+import bz2
+import gzip
+import io
+import lzma
+import queue
+import threading
+import zlib
+from typing import Any, BinaryIO, Callable
+
+from ..constants.compression_constants import CompressionConstants
+
+_END = object()
+
+_OPENERS: dict[str, Callable[..., BinaryIO]] = {
+    CompressionConstants.GZIP: lambda path, mode: gzip.open(
+        path, mode, compresslevel=CompressionConstants.GZIP_COMPRESS_LEVEL
+    ),
+    CompressionConstants.BZIP2: bz2.open,
+    CompressionConstants.XZ: lzma.open,
+}
+
+
+class _ThreadedDecompressor(io.RawIOBase):
+    """Raw reader whose bytes are decompressed ahead of time by a background thread."""
+
+    def __init__(self, path: str, codec: str, chunk_size: int, queue_depth: int):
+        super().__init__()
+        self._chunks: queue.Queue = queue.Queue(maxsize=queue_depth)
+        self._pending = memoryview(b"")
+        self._finished = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._decompress, args=(path, codec, chunk_size), daemon=True
+        )
+        self._thread.start()
+
+    def _put(self, item: Any) -> bool:
+        """Queue an item, giving up once the reader has been closed."""
+        while not self._stop.is_set():
+            try:
+                self._chunks.put(item, timeout=CompressionConstants.QUEUE_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _decompress(self, path: str, codec: str, chunk_size: int) -> None:
+        try:
+            with _OPENERS[codec](path, "rb") as source:
+                while chunk := source.read(chunk_size):
+                    if not self._put(chunk):
+                        return
+        except BaseException as e:
+            self._put(e)
+            return
+        self._put(_END)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self._pending:
+            if self._finished:
+                return 0
+            chunk = self._chunks.get()
+            if chunk is _END:
+                self._finished = True
+                return 0
+            if isinstance(chunk, BaseException):
+                self._finished = True
+                raise chunk
+            self._pending = memoryview(chunk)
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+        super().close()
+
+
+class _ThreadedCompressor(io.RawIOBase):
+    """Raw writer whose bytes are compressed and written by a background thread."""
+
+    def __init__(self, path: str, codec: str, queue_depth: int):
+        super().__init__()
+        self._chunks: queue.Queue = queue.Queue(maxsize=queue_depth)
+        self._error: BaseException | None = None
+        self._position = 0
+        self._thread = threading.Thread(target=self._compress, args=(path, codec), daemon=True)
+        self._thread.start()
+
+    def _compress(self, path: str, codec: str) -> None:
+        try:
+            with _OPENERS[codec](path, "wb") as target:
+                while (chunk := self._chunks.get()) is not _END:
+                    target.write(chunk)
+        except BaseException as e:
+            self._error = e
+            while self._chunks.get() is not _END:
+                pass
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if self._error is not None:
+            raise self._error
+        self._chunks.put(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        """Number of uncompressed bytes written so far."""
+        return self._position
+
+    def close(self) -> None:
+        if not self.closed:
+            self._chunks.put(_END)
+            self._thread.join()
+            super().close()
+            if self._error is not None:
+                raise self._error
+
+
+class CompressedFile:
+    """Detects compressed files and opens them through background (de)compression threads."""
+
+    # raised for truncated or corrupt input besides OSError (gzip.BadGzipFile, bz2 decode errors)
+    DECODE_ERRORS = (EOFError, zlib.error, lzma.LZMAError)
+
+    @staticmethod
+    def codec_for_extension(path: str) -> str | None:
+        """Return the codec implied by the file extension, if any."""
+        for extension, codec in CompressionConstants.EXTENSIONS.items():
+            if path.endswith(extension):
+                return codec
+        return None
+
+    @staticmethod
+    def strip_extension(path: str) -> str:
+        """Remove a compression extension, so 'rooms.json.gz' becomes 'rooms.json'."""
+        for extension in CompressionConstants.EXTENSIONS:
+            if path.endswith(extension):
+                return path[:-len(extension)]
+        return path
+
+    @staticmethod
+    def detect(path: str) -> str | None:
+        """
+        Return the codec of a file from its extension, or else from its magic bytes.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            PermissionError: If access to the file is denied.
+        """
+        codec = CompressedFile.codec_for_extension(path)
+        if codec is not None:
+            return codec
+
+        with open(path, "rb") as file:
+            head = file.read(CompressionConstants.MAGIC_LENGTH)
+        for magic, codec in CompressionConstants.MAGIC_BYTES.items():
+            if head.startswith(magic):
+                return codec
+        return None
+
+    @staticmethod
+    def open_reader(
+        path: str,
+        codec: str,
+        chunk_size: int = CompressionConstants.CHUNK_SIZE,
+        queue_depth: int = CompressionConstants.QUEUE_DEPTH,
+    ) -> io.BufferedReader:
+        """
+        Open a compressed file for reading decompressed bytes.
+
+        Decompression runs on a background thread that keeps up to queue_depth
+        chunks of chunk_size bytes ready, overlapping with parsing.
+        """
+        return io.BufferedReader(_ThreadedDecompressor(path, codec, chunk_size, queue_depth), chunk_size)
+
+    @staticmethod
+    def open_writer(
+        path: str,
+        codec: str,
+        chunk_size: int = CompressionConstants.CHUNK_SIZE,
+        queue_depth: int = CompressionConstants.QUEUE_DEPTH,
+    ) -> io.BufferedWriter:
+        """
+        Open a file for writing bytes that are compressed on the fly.
+
+        Writes are grouped into chunk_size blocks and handed to a background
+        thread through a queue of at most queue_depth blocks, overlapping with
+        serialization.
+        """
+        return io.BufferedWriter(_ThreadedCompressor(path, codec, queue_depth), chunk_size)
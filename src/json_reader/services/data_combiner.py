@@ -1,8 +1,11 @@
-from collections import defaultdict
-from collections.abc import Generator
+from collections import deque
+from collections.abc import Generator, Iterable, Mapping
 from typing import Any
+from ..constants.combiner_constants import CombinerConstants
 from ..constants.errors_messages import ErrorMessages
 from ..constants.data_item_constants import ItemConstants
+from .external_grouper import SpilledStudentGroups
+from .student_store import CompactStudentGroups
 
 
 class DataCombiner:
@@ -11,52 +14,180 @@ class DataCombiner:
     @staticmethod
     def group_students_by_room_id(
         students: Generator[dict[str, Any], None, None],
-    ) -> dict[int, list[dict[str, Any]]]:
+    ) -> Mapping[Any, list[dict[str, Any]]]:
         """
         Group students by their room ID.
 
+        Students are kept in a compact columnar store; the list of student
+        dictionaries for a room is only built when that room is looked up.
+
         Args:
             students: A generator yielding student dictionaries.
 
         Returns:
-            dict: Mapping of room ID to a list of student dictionaries.
+            Mapping: Mapping of room ID to a list of student dictionaries.
 
         Raises:
             ValueError: If a student record is missing required keys.
         """
-        students_by_room: dict[int, list[dict[str, Any]]] = defaultdict(list)
-
-        for student in students:
-            try:
-                room_id = student["room"]
-                students_by_room[room_id].append(
-                    {"id": student["id"], "name": student["name"]}
-                )
-            except KeyError as e:
-                raise ValueError(ErrorMessages.STUDENT_MISSING_KEY.format(e)) from e
-
-        return students_by_room
+        return CompactStudentGroups(students)
 
     @staticmethod
     def combine_students_with_rooms(
         students: Generator[dict[str, Any], None, None],
         rooms: Generator[dict[str, Any], None, None],
+        max_memory: int | None = None,
+        strategy: str | None = None,
     ) -> Generator[dict[str, Any], None, None]:
         """
         Combine student and room data into a unified structure.
 
+        Every strategy yields the same rooms, in room input order, with their
+        students in student input order; see JoinPlanner for choosing one.
+
         Args:
             students: A generator yielding student dictionaries.
             rooms: A generator yielding room dictionaries.
+            max_memory: Optional memory budget in bytes for grouping students.
+                When set, students are spilled to sorted temp files and merged
+                on disk instead of being held in memory.
+            strategy: How to join: 'hash-students' groups all students then
+                streams rooms, 'hash-rooms' loads rooms first and only keeps
+                students of known rooms, 'merge' streams both inputs sorted by
+                room id, 'spill' groups students on disk. Defaults to 'spill'
+                with max_memory, else 'hash-students'.
 
         Yields:
             dict: Room data with an added 'students' list.
 
         Raises:
-            ValueError: If a room record is missing required keys.
+            ValueError: If a record is missing required keys, or with 'merge'
+                if the inputs are not sorted by room id.
+        """
+        if strategy is None:
+            strategy = CombinerConstants.HASH_STUDENTS_STRATEGY if max_memory is None else CombinerConstants.SPILL_STRATEGY
+
+        if strategy == CombinerConstants.MERGE_STRATEGY:
+            yield from DataCombiner.merge_students_with_rooms(students, rooms)
+        elif strategy == CombinerConstants.HASH_ROOMS_STRATEGY:
+            rooms = list(rooms)
+            try:
+                room_ids = {room[ItemConstants.ID_FIELD] for room in rooms}
+            except KeyError as e:
+                raise ValueError(ErrorMessages.ROOM_MISSING_KEY.format(e)) from e
+            yield from DataCombiner.attach_students(CompactStudentGroups(students, room_ids), iter(rooms))
+        elif strategy == CombinerConstants.SPILL_STRATEGY:
+            with SpilledStudentGroups(students, max_memory) as students_by_room:
+                yield from DataCombiner.attach_students(students_by_room, rooms)
+        else:
+            yield from DataCombiner.attach_students(
+                DataCombiner.group_students_by_room_id(students), rooms
+            )
+
+    @staticmethod
+    def merge_students_with_rooms(
+        students: Iterable[dict[str, Any]],
+        rooms: Iterable[dict[str, Any]],
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Join students and rooms that are both sorted by room id, in one pass over each.
+
+        Only the students of the current room are held in memory. Students of
+        rooms that are not in the room input are skipped, and rooms sharing an
+        id get the same students, as with the other strategies.
+
+        Args:
+            students: Student dictionaries sorted by their room id.
+            rooms: Room dictionaries sorted by id.
+
+        Yields:
+            dict: Room data with an added 'students' list.
+
+        Raises:
+            ValueError: If a record is missing required keys or an input is not sorted by room id.
         """
-        students_by_room = DataCombiner.group_students_by_room_id(students)
+        students = DataCombiner._checked_sorted(
+            students, ItemConstants.ROOM_FIELD, ErrorMessages.STUDENT_MISSING_KEY, "students"
+        )
+        rooms = DataCombiner._checked_sorted(rooms, ItemConstants.ID_FIELD, ErrorMessages.ROOM_MISSING_KEY, "rooms")
+        student_room_id, student = next(students, (None, None))
+        previous_room_id = None
+        room_students: list[dict[str, Any]] = []
+
+        for room_id, room in rooms:
+            try:
+                name = room[ItemConstants.NAME_FIELD]
+            except KeyError as e:
+                raise ValueError(ErrorMessages.ROOM_MISSING_KEY.format(e)) from e
 
+            if room_id == previous_room_id:
+                room_students = [dict(room_student) for room_student in room_students]
+            else:
+                room_students = []
+                while student is not None and not DataCombiner._out_of_order(room_id, student_room_id):
+                    if student_room_id == room_id:
+                        try:
+                            room_students.append({
+                                ItemConstants.ID_FIELD: student[ItemConstants.ID_FIELD],
+                                ItemConstants.NAME_FIELD: student[ItemConstants.NAME_FIELD],
+                            })
+                        except KeyError as e:
+                            raise ValueError(ErrorMessages.STUDENT_MISSING_KEY.format(e)) from e
+                    student_room_id, student = next(students, (None, None))
+
+            yield {"id": room_id, "name": name, "students": room_students}
+            previous_room_id = room_id
+
+        # Students past the last room are still read, so that their rejections are counted and cached.
+        deque(students, maxlen=0)
+
+    @staticmethod
+    def _checked_sorted(
+        records: Iterable[dict[str, Any]], key: str, missing_key_message: str, records_name: str
+    ) -> Generator[tuple[Any, dict[str, Any]], None, None]:
+        """
+        Yield (room id, record) pairs, checking that room ids never decrease.
+
+        Raises:
+            ValueError: If a record has no room id or comes after a greater one.
+        """
+        previous_room_id = None
+        for record in records:
+            try:
+                room_id = record[key]
+            except KeyError as e:
+                raise ValueError(missing_key_message.format(e)) from e
+            if previous_room_id is not None and DataCombiner._out_of_order(room_id, previous_room_id):
+                raise ValueError(ErrorMessages.NOT_SORTED_BY_ROOM.format(records_name, room_id, previous_room_id))
+            previous_room_id = room_id
+            yield room_id, record
+
+    @staticmethod
+    def _out_of_order(later: Any, earlier: Any) -> bool:
+        """Whether room id later sorts before room id earlier; ids that cannot be compared are out of order."""
+        try:
+            return later < earlier
+        except TypeError:
+            return True
+
+    @staticmethod
+    def attach_students(
+        students_by_room: Any,
+        rooms: Generator[dict[str, Any], None, None],
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Stream rooms with their students looked up from the grouped students.
+
+        Args:
+            students_by_room: Any mapping-like object with a get(room_id, default) method.
+            rooms: A generator yielding room dictionaries.
+
+        Yields:
+            dict: Room data with an added 'students' list.
+
+        Raises:
+            ValueError: If a room record is missing required keys.
+        """
         for room in rooms:
             try:
                 yield {
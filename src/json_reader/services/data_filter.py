@@ -1,10 +1,10 @@
-import logging
+from itertools import compress, islice
 from typing import Generator
 
 from .data_validator import ValidatorContext
-
-logging.getLogger().setLevel(logging.INFO)
-logger = logging.getLogger(__name__)
+from .rejection_sink import RejectionSink
+from .room_selection import RoomSelection
+from ..constants.validation_constants import FilterConstants
 
 
 class DataFilter:
@@ -12,21 +12,40 @@ class DataFilter:
 
     @staticmethod
     def filter_data(
-        data: Generator[dict, None, None], data_type: str
+        data: Generator[dict, None, None],
+        data_type: str,
+        batch_size: int = FilterConstants.DEFAULT_BATCH_SIZE,
+        sink: RejectionSink | None = None,
+        selection: RoomSelection | None = None,
     ) -> Generator[dict, None, None]:
         """
-        Takes data items one by one and only returns the valid ones.
+        Takes data items in batches and only returns the valid ones.
 
         Args:
             data: Stream of data items to check
             data_type: What kind of data we're checking ('student' or 'room')
+            batch_size: How many items are validated together
+            sink: Where rejected items are reported; a sampling sink is used if omitted
+            selection: Rooms to keep; items outside it are skipped before they are validated
 
         Returns:
             Only the valid data items
         """
         validation_context = ValidatorContext(data_type)
-        for item in data:
-            if validation_context.execute_validation(item):
-                yield item
-            else:
-                logger.warning(f"skipping {item}")
+        sink = sink if sink is not None else RejectionSink()
+        data = iter(data)
+
+        while batch := list(islice(data, batch_size)):
+            if selection is not None:
+                selected = list(compress(batch, selection.mask(batch, data_type)))
+                if len(selected) < len(batch):
+                    sink.skip(data_type, len(batch) - len(selected))
+                    batch = selected
+                    if not batch:
+                        continue
+
+            mask, reasons = validation_context.validate_batch(batch)
+            yield from compress(batch, mask)
+
+            if not all(mask):
+                sink.reject_batch(data_type, batch, reasons)
@@ -1,8 +1,10 @@
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Sequence
+from ..constants.entity_schemas import EntitySchemas
 from ..constants.errors_messages import ErrorMessages
-from ..constants.data_item_constants import ItemConstants
+from ..constants.validation_constants import ValidationReasons
+from .schema_compiler import SchemaCompiler
 
 logging.getLogger().setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
@@ -17,86 +19,98 @@ class ValidationStrategy(ABC):
         """Check if a data item is valid. Return True if good, False if bad."""
         pass
 
-
-class RoomValidator(ValidationStrategy):
-    """Checks if room data is correct and complete."""
-
-    def validate(self, item: dict) -> bool:
+    def validate_batch(self, items: Sequence[Dict[str, Any]]) -> list[int]:
         """
-        Makes sure a room has valid ID and name.
+        Check many items at once without logging each failure.
 
-        A valid room must have:
-        - An 'id' that's a positive number
-        - A 'name' that's not empty
+        Returns:
+            list: A ValidationReasons code per item, VALID for good items.
         """
-        try:
-            if ItemConstants.ID_FIELD not in item or ItemConstants.NAME_FIELD not in item:
-                raise ValueError(ErrorMessages.ROOM_INCOMPLETE_DATA)
-
-            room_id, room_name = item[ItemConstants.ID_FIELD], item[ItemConstants.NAME_FIELD]
-
-            if not isinstance(room_id, int) or room_id < ItemConstants.MIN_ROOM_ID:
-                raise ValueError(ErrorMessages.ROOM_INVALID_ID.format(room_id))
-
-            if not isinstance(room_name, str) or not room_name.strip():
-                raise ValueError(ErrorMessages.ROOM_INVALID_NAME.format(room_name))
-
-            return True
-        except Exception as e:
-            logger.error(ErrorMessages.ROOM_VALIDATION_FAILED.format(e))
-            return False
+        return [
+            ValidationReasons.VALID if self.validate(item) else ValidationReasons.REJECTED
+            for item in items
+        ]
 
 
-class StudentValidator(ValidationStrategy):
-    """Checks if student data is correct and complete."""
+class SchemaValidator(ValidationStrategy):
+    """Checks items against an entity schema compiled into a single function."""
 
-    def validate(self, item: dict) -> bool:
+    def __init__(self, schema: dict[str, Any]):
         """
-        Makes sure a student has valid ID, name, and room assignment.
+        Compile the schema.
 
-        A valid student must have:
-        - An 'id' that's a positive number
-        - A 'name' that's not empty
-        - A 'room' that's a positive number
+        Args:
+            schema: Entity schema, see EntitySchemas
         """
-        try:
-            if ItemConstants.ID_FIELD not in item or ItemConstants.NAME_FIELD not in item or ItemConstants.ROOM_FIELD not in item:
-                raise ValueError(ErrorMessages.STUDENT_INCOMPLETE_DATA)
-
-            student_id, student_name, room_id = (item[ItemConstants.ID_FIELD], item[ItemConstants.NAME_FIELD], item[ItemConstants.ROOM_FIELD])
-
-            if not isinstance(student_id, int) or student_id < ItemConstants.MIN_STUDENT_ID:
-                raise ValueError(ErrorMessages.STUDENT_INVALID_ID.format(student_id))
-
-            if not isinstance(student_name, str) or not student_name.strip():
-                raise ValueError(ErrorMessages.STUDENT_INVALID_NAME.format(student_name))
-
-            if not isinstance(room_id, int) or room_id < ItemConstants.MIN_ROOM_ID:
-                raise ValueError(ErrorMessages.STUDENT_INVALID_ROOM_ID.format(room_id))
+        self.schema = schema
+        self._check = SchemaCompiler.compile(schema)
+        self._field_checks = [SchemaCompiler.compile({"fields": [rule]}) for rule in schema["fields"]]
 
-            return True
-
-        except Exception as e:
-            logger.error(ErrorMessages.STUDENT_VALIDATION_FAILED.format(e))
-            return False
+    def validate(self, item: dict) -> bool:
+        """Check one item and log why it fails, if it does."""
+        reason = self._check(item)
+        if reason != ValidationReasons.VALID:
+            failed_message = self.schema.get("failed_message", ErrorMessages.VALIDATION_FAILED)
+            logger.error(failed_message.format(self._describe_failure(item, reason)))
+        return reason == ValidationReasons.VALID
+
+    def validate_batch(self, items: Sequence[Dict[str, Any]]) -> list[int]:
+        """Run the compiled check over every item, without logging."""
+        return list(map(self._check, items))
+
+    def _describe_failure(self, item: Any, reason: int) -> str:
+        """Build the error message of the first rule an item fails."""
+        if reason == ValidationReasons.INCOMPLETE:
+            return self.schema.get("incomplete_message", ErrorMessages.INCOMPLETE_DATA)
+
+        for rule, check in zip(self.schema["fields"], self._field_checks):
+            value = item[rule["name"]]
+            if check({rule["name"]: value}) != ValidationReasons.VALID:
+                message = rule.get("message", ErrorMessages.INVALID_FIELD.format(rule["name"], "{}"))
+                return message.format(value)
+        return ""
 
 
 class ValidatorContext:
     """Picks the right validator for the type of data you're checking."""
 
-    _strategies = {ItemConstants.STUDENT_STRATEGY: StudentValidator, ItemConstants.ROOM_STRATEGY: RoomValidator}
+    _strategies = {name: SchemaValidator(schema) for name, schema in EntitySchemas.ALL.items()}
 
     def __init__(self, strategy_type: str):
         """
         Set up the validator for a specific data type.
 
         Args:
-            strategy_type: Either 'student' or 'room'
+            strategy_type: Either 'student', 'room' or a registered entity type
         """
         if strategy_type not in self._strategies:
             raise ValueError(ErrorMessages.UNKNOWN_VALIDATION_STRATEGY.format(strategy_type))
-        self.strategy = self._strategies[strategy_type]()
+        self.strategy = self._strategies[strategy_type]
+
+    @classmethod
+    def register_schema(cls, strategy_type: str, schema: dict[str, Any]) -> None:
+        """
+        Compile a schema and make it available as a validation strategy.
+
+        Args:
+            strategy_type: Name the entity type is validated under
+            schema: Entity schema, see EntitySchemas
+        """
+        cls._strategies[strategy_type] = SchemaValidator(schema)
 
     def execute_validation(self, item: dict) -> bool:
         """Check if the item is valid using the right validator."""
         return self.strategy.validate(item)
+
+    def validate_batch(self, items: Sequence[dict]) -> tuple[list[bool], list[int]]:
+        """
+        Check a batch of items in bulk.
+
+        Args:
+            items: The items to check
+
+        Returns:
+            tuple: (mask with True for valid items, ValidationReasons code per item)
+        """
+        reasons = self.strategy.validate_batch(items)
+        return [reason == ValidationReasons.VALID for reason in reasons], reasons
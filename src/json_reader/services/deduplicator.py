@@ -0,0 +1,211 @@
+import logging
+import pickle
+import sys
+import tempfile
+from collections.abc import Iterable, Iterator
+from itertools import compress, islice
+from typing import Any
+
+from .rejection_sink import RejectionSink
+from ..constants.data_item_constants import ItemConstants
+from ..constants.dedup_constants import DedupConstants
+from ..constants.validation_constants import ValidationReasons
+
+logging.getLogger().setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class IdBitmap:
+    """
+    Set of record ids stored as one bit per id.
+
+    Int ids set a bit in a bytearray that covers a window of ids starting
+    near the first one seen, so that large ids such as 10**9 + n cost no
+    more than small ones. The window grows geometrically, up or down, to
+    take in further ids while it spans at most DedupConstants.MAX_BITMAP_BITS
+    ids; any other id is kept in an exact set on the side.
+    """
+
+    def __init__(self):
+        self._bits = bytearray()
+        # id of the first bit; a multiple of 8, set by the first int id
+        self._base: int | None = None
+        self._overflow: set[Any] = set()
+
+    def add(self, record_id: Any) -> bool:
+        """Add an id; return True if it was not in the set yet."""
+        if type(record_id) is int:
+            if self._base is None:
+                self._base = record_id & ~7
+            offset = record_id - self._base
+            if 0 <= offset < len(self._bits) << 3 or self._grow(record_id):
+                # Growing downward moves the base.
+                offset = record_id - self._base
+                index, mask = offset >> 3, 1 << (offset & 7)
+                if self._bits[index] & mask:
+                    return False
+                self._bits[index] |= mask
+                return True
+
+        if record_id in self._overflow:
+            return False
+        self._overflow.add(record_id)
+        return True
+
+    def __contains__(self, record_id: Any) -> bool:
+        if type(record_id) is int and self._base is not None:
+            offset = record_id - self._base
+            if 0 <= offset < len(self._bits) << 3:
+                return bool(self._bits[offset >> 3] & (1 << (offset & 7)))
+        return record_id in self._overflow
+
+    def _grow(self, record_id: int) -> bool:
+        """Extend the bitmap to cover record_id; return False if the window would get too wide."""
+        start, end = self._base, self._base + (len(self._bits) << 3)
+        low, high = min(start, record_id & ~7), max(end, (record_id & ~7) + 8)
+        if high - low > DedupConstants.MAX_BITMAP_BITS:
+            return False
+
+        size = min(
+            max((high - low) >> 3, len(self._bits) * DedupConstants.BITMAP_GROWTH_FACTOR,
+                DedupConstants.MIN_BITMAP_BYTES),
+            DedupConstants.MAX_BITMAP_BITS >> 3,
+        )
+        if record_id < start:
+            # Grow downward, keeping the end of the window where it is.
+            self._bits[:0] = bytes(size - len(self._bits))
+            self._base = end - (size << 3)
+        else:
+            self._bits.extend(bytes(size - len(self._bits)))
+        return True
+
+    @property
+    def bitmap_bytes(self) -> int:
+        return len(self._bits)
+
+    @property
+    def overflow_bytes(self) -> int:
+        if not self._overflow:
+            return 0
+        return sys.getsizeof(self._overflow) + sum(map(sys.getsizeof, self._overflow))
+
+
+class Deduplicator:
+    """
+    Drops records whose id was already seen, by policy.
+
+    keep-first streams the records and drops every later copy of an id.
+    keep-last and reject need to know whether an id comes again, so records
+    are spooled to a temporary file while their ids are collected, then read
+    back: keep-last keeps only the last copy of an id, reject drops every
+    copy of a duplicated id. Dropped copies are reported to the rejection
+    sink as duplicate ids. Only the id sets are held in memory.
+    """
+
+    def __init__(self, policy: str, sink: RejectionSink | None = None):
+        """
+        Args:
+            policy: 'keep-first', 'keep-last' or 'reject'
+            sink: Where dropped copies are reported; a sampling sink is used if omitted
+        """
+        self.policy = policy
+        self.sink = sink if sink is not None else RejectionSink()
+        # data type -> (unique ids, duplicate records, bitmap bytes, exact set and dict bytes)
+        self.footprints: dict[str, tuple[int, int, int, int]] = {}
+
+    def deduplicate(self, records: Iterable[dict[str, Any]], data_type: str) -> Iterator[dict[str, Any]]:
+        """
+        Yield records without duplicate ids, in input order.
+
+        Args:
+            records: Validated records
+            data_type: What kind of data the records are ('student' or 'room')
+
+        Yields:
+            dict: The records kept by the policy
+        """
+        if self.policy == DedupConstants.KEEP_FIRST_POLICY:
+            return self._keep_first(records, data_type)
+        return self._spool_and_replay(records, data_type)
+
+    def _keep_first(self, records: Iterable[dict[str, Any]], data_type: str) -> Iterator[dict[str, Any]]:
+        seen = IdBitmap()
+        unique = duplicates = 0
+        records = iter(records)
+        while batch := list(islice(records, DedupConstants.SPOOL_BATCH_SIZE)):
+            mask = [seen.add(record[ItemConstants.ID_FIELD]) for record in batch]
+            yield from compress(batch, mask)
+
+            kept = sum(mask)
+            unique += kept
+            if kept < len(batch):
+                duplicates += len(batch) - kept
+                self._reject(data_type, batch, mask)
+        self.footprints[data_type] = (unique, duplicates, seen.bitmap_bytes, seen.overflow_bytes)
+
+    def _spool_and_replay(self, records: Iterable[dict[str, Any]], data_type: str) -> Iterator[dict[str, Any]]:
+        seen, duplicated = IdBitmap(), IdBitmap()
+        # position of the last copy of each duplicated id; only filled for keep-last
+        last_positions: dict[Any, int] = {}
+        keep_last = self.policy == DedupConstants.KEEP_LAST_POLICY
+        unique = 0
+
+        with tempfile.TemporaryFile(prefix=DedupConstants.SPOOL_FILE_PREFIX) as spool:
+            position = 0
+            records = iter(records)
+            while batch := list(islice(records, DedupConstants.SPOOL_BATCH_SIZE)):
+                for record in batch:
+                    record_id = record[ItemConstants.ID_FIELD]
+                    if seen.add(record_id):
+                        unique += 1
+                    else:
+                        duplicated.add(record_id)
+                        if keep_last:
+                            last_positions[record_id] = position
+                    position += 1
+                pickle.dump(batch, spool, protocol=pickle.HIGHEST_PROTOCOL)
+
+            spool.seek(0)
+            duplicates = position = 0
+            for batch in self._read_spool(spool):
+                mask = []
+                for record in batch:
+                    record_id = record[ItemConstants.ID_FIELD]
+                    mask.append(
+                        record_id not in duplicated
+                        or (keep_last and last_positions[record_id] == position)
+                    )
+                    position += 1
+                yield from compress(batch, mask)
+
+                kept = sum(mask)
+                if kept < len(batch):
+                    duplicates += len(batch) - kept
+                    self._reject(data_type, batch, mask)
+
+        exact_bytes = seen.overflow_bytes + duplicated.overflow_bytes
+        if last_positions:
+            exact_bytes += sys.getsizeof(last_positions)
+        self.footprints[data_type] = (
+            unique, duplicates, seen.bitmap_bytes + duplicated.bitmap_bytes, exact_bytes
+        )
+
+    @staticmethod
+    def _read_spool(spool) -> Iterator[list[dict[str, Any]]]:
+        while True:
+            try:
+                yield pickle.load(spool)
+            except EOFError:
+                return
+
+    def _reject(self, data_type: str, batch: list[dict[str, Any]], mask: list[bool]) -> None:
+        reasons = [ValidationReasons.VALID if kept else ValidationReasons.DUPLICATE_ID for kept in mask]
+        self.sink.reject_batch(data_type, batch, reasons)
+
+    def log_summary(self) -> None:
+        """Log how many ids and duplicates each input had and the memory their id sets took."""
+        for data_type, (unique, duplicates, bitmap, exact) in sorted(self.footprints.items()):
+            logger.info(
+                DedupConstants.LOG_FOOTPRINT, data_type, self.policy, unique, duplicates, bitmap + exact,
+                bitmap, exact,
+            )
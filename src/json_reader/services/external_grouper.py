@@ -0,0 +1,183 @@
+import heapq
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+from collections.abc import Generator, Iterable
+from typing import Any, BinaryIO
+
+from ..constants.combiner_constants import CombinerConstants
+from ..constants.data_item_constants import ItemConstants
+from ..constants.errors_messages import ErrorMessages
+
+
+class SpilledStudentGroups:
+    """
+    Students grouped by room ID, kept on disk instead of in memory.
+
+    Students are buffered until the memory budget is reached, then each buffer
+    is sorted by room ID and spilled to a temporary run file. The runs are
+    k-way merged into a single file holding one block per room, so only an
+    index of room ID to file offset stays in memory. When there are more
+    runs than CombinerConstants.MAX_MERGE_FAN_IN, they are first merged in
+    passes into fewer, longer runs, so only that many files are open at once.
+    """
+
+    def __init__(self, students: Iterable[dict[str, Any]], max_memory: int):
+        """
+        Spill and merge the given students.
+
+        Args:
+            students: Student dictionaries to group.
+            max_memory: Approximate memory budget in bytes for buffered students.
+
+        Raises:
+            ValueError: If a student record is missing required keys.
+        """
+        self._directory = tempfile.mkdtemp(prefix=CombinerConstants.SPILL_DIRECTORY_PREFIX)
+        self._offsets: dict[Any, int] = {}
+        self._merged_file: BinaryIO | None = None
+        try:
+            run_paths = self._spill_runs(students, max_memory)
+            self._merge_runs(run_paths)
+        except BaseException:
+            self.close()
+            raise
+
+    def _spill_runs(self, students: Iterable[dict[str, Any]], max_memory: int) -> list[str]:
+        """Write sorted runs of (room_id, sequence, student) entries, each within the budget."""
+        run_paths: list[str] = []
+        buffer: list[tuple[Any, int, dict[str, Any]]] = []
+        buffered_bytes = 0
+
+        for sequence, student in enumerate(students):
+            try:
+                entry = (
+                    student[ItemConstants.ROOM_FIELD],
+                    sequence,
+                    {"id": student[ItemConstants.ID_FIELD], "name": student[ItemConstants.NAME_FIELD]},
+                )
+            except KeyError as e:
+                raise ValueError(ErrorMessages.STUDENT_MISSING_KEY.format(e)) from e
+
+            buffer.append(entry)
+            buffered_bytes += CombinerConstants.STUDENT_ENTRY_OVERHEAD_BYTES + sys.getsizeof(entry[2]["name"])
+
+            if buffered_bytes >= max_memory and len(buffer) >= CombinerConstants.MIN_RUN_SIZE:
+                run_paths.append(self._write_run(buffer, len(run_paths)))
+                buffer = []
+                buffered_bytes = 0
+
+        if buffer:
+            run_paths.append(self._write_run(buffer, len(run_paths)))
+
+        return run_paths
+
+    def _write_run(self, buffer: list[tuple[Any, int, dict[str, Any]]], run_index: int) -> str:
+        """Sort a buffer by room ID (keeping input order within a room) and write it to disk."""
+        buffer.sort(key=lambda entry: entry[0])
+        run_path = os.path.join(self._directory, CombinerConstants.SPILL_RUN_FILE_NAME.format(run_index))
+        with open(run_path, "wb") as run_file:
+            pickler = pickle.Pickler(run_file, protocol=pickle.HIGHEST_PROTOCOL)
+            for entry in buffer:
+                pickler.dump(entry)
+                pickler.clear_memo()
+        return run_path
+
+    @staticmethod
+    def _read_run(run_path: str) -> Generator[tuple[Any, int, dict[str, Any]], None, None]:
+        """Stream entries back from a run file."""
+        with open(run_path, "rb") as run_file:
+            unpickler = pickle.Unpickler(run_file)
+            while True:
+                try:
+                    yield unpickler.load()
+                except EOFError:
+                    return
+
+    def _merge_entries(self, run_paths: list[str]) -> Iterable[tuple[Any, int, dict[str, Any]]]:
+        """Stream the entries of several runs in (room ID, sequence) order."""
+        return heapq.merge(
+            *(self._read_run(run_path) for run_path in run_paths),
+            key=lambda entry: (entry[0], entry[1]),
+        )
+
+    def _reduce_runs(self, run_paths: list[str]) -> list[str]:
+        """Merge runs in passes of at most MAX_MERGE_FAN_IN until that many are left."""
+        fan_in = CombinerConstants.MAX_MERGE_FAN_IN
+        next_index = len(run_paths)
+        while len(run_paths) > fan_in:
+            merged_paths = []
+            for start in range(0, len(run_paths), fan_in):
+                group = run_paths[start:start + fan_in]
+                if len(group) == 1:
+                    merged_paths.append(group[0])
+                    continue
+                run_path = os.path.join(self._directory, CombinerConstants.SPILL_RUN_FILE_NAME.format(next_index))
+                next_index += 1
+                with open(run_path, "wb") as run_file:
+                    pickler = pickle.Pickler(run_file, protocol=pickle.HIGHEST_PROTOCOL)
+                    for entry in self._merge_entries(group):
+                        pickler.dump(entry)
+                        pickler.clear_memo()
+                for merged_run_path in group:
+                    os.remove(merged_run_path)
+                merged_paths.append(run_path)
+            run_paths = merged_paths
+        return run_paths
+
+    def _merge_runs(self, run_paths: list[str]) -> None:
+        """K-way merge the runs into one file with a block per room."""
+        run_paths = self._reduce_runs(run_paths)
+        merged_path = os.path.join(self._directory, CombinerConstants.SPILL_MERGED_FILE_NAME)
+        merged = self._merge_entries(run_paths)
+
+        with open(merged_path, "wb") as merged_file:
+            current_room = None
+            room_students: list[dict[str, Any]] = []
+            for room_id, _, student in merged:
+                if room_students and room_id != current_room:
+                    self._write_room(merged_file, current_room, room_students)
+                    room_students = []
+                current_room = room_id
+                room_students.append(student)
+            if room_students:
+                self._write_room(merged_file, current_room, room_students)
+
+        for run_path in run_paths:
+            os.remove(run_path)
+
+        self._merged_file = open(merged_path, "rb")
+
+    def _write_room(self, merged_file: BinaryIO, room_id: Any, room_students: list[dict[str, Any]]) -> None:
+        """Append one room's students to the merged file and remember where they start."""
+        self._offsets[room_id] = merged_file.tell()
+        pickle.dump(room_students, merged_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def get(self, room_id: Any, default: Any = None) -> Any:
+        """Load the students of a room from disk, or return default if it has none."""
+        offset = self._offsets.get(room_id)
+        if offset is None or self._merged_file is None:
+            return default
+        self._merged_file.seek(offset)
+        return pickle.load(self._merged_file)
+
+    def __contains__(self, room_id: Any) -> bool:
+        return room_id in self._offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def close(self) -> None:
+        """Close the merged file and delete all spill files."""
+        if self._merged_file is not None:
+            self._merged_file.close()
+            self._merged_file = None
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    def __enter__(self) -> "SpilledStudentGroups":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
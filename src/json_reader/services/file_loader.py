@@ -1,19 +1,82 @@
+import logging
+import mmap
+import os
 from collections.abc import Generator
+from types import ModuleType
 
 import ijson
 from ..constants.errors_messages import ErrorMessages
+from ..constants.loader_constants import LoaderConstants
+from .compression import CompressedFile
+
+logging.getLogger().setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
 
 
 class FileLoader:
     """Utility class for streaming JSON data from a file."""
 
     @staticmethod
-    def load_file_data(path: str) -> Generator[dict, None, None]:
+    def resolve_backend(name: str | None = None) -> str:
+        """
+        Pick the ijson backend to parse with.
+
+        An explicit name wins, then the JSON_READER_IJSON_BACKEND environment
+        variable, then the fastest backend that can be imported.
+
+        Args:
+            name: Requested backend name, or None to choose automatically.
+
+        Returns:
+            str: Name of a backend that can be imported.
+
+        Raises:
+            ValueError: If the requested backend cannot be imported.
+        """
+        name = name or os.environ.get(LoaderConstants.IJSON_BACKEND_ENV_VAR)
+        if name:
+            try:
+                ijson.get_backend(name)
+            except ImportError as e:
+                raise ValueError(ErrorMessages.IJSON_BACKEND_UNAVAILABLE.format(name)) from e
+            return name
+
+        for candidate in LoaderConstants.IJSON_BACKENDS:
+            try:
+                ijson.get_backend(candidate)
+            except ImportError:
+                continue
+            if candidate == LoaderConstants.PURE_PYTHON_BACKEND:
+                logger.warning(LoaderConstants.LOG_SLOW_IJSON_BACKEND)
+            return candidate
+
+        raise ValueError(ErrorMessages.IJSON_BACKEND_UNAVAILABLE.format(LoaderConstants.IJSON_BACKENDS))
+
+    @staticmethod
+    def get_backend(name: str | None = None) -> ModuleType:
+        """Return the ijson backend module chosen by resolve_backend."""
+        return ijson.get_backend(FileLoader.resolve_backend(name))
+
+    @staticmethod
+    def load_file_data(
+        path: str,
+        backend: str | None = None,
+        buffer_size: int = LoaderConstants.READ_BUFFER_SIZE,
+        use_mmap: bool = False,
+    ) -> Generator[dict, None, None]:
         """
         Stream JSON items from the given file one by one.
 
+        The file is read as bytes, so ijson never has to deal with decoded text.
+        Gzip, bzip2 and xz files, recognised by extension or magic bytes, are
+        decompressed on a background thread while ijson parses.
+
         Args:
             path: Path to the JSON file.
+            backend: ijson backend name, or None to pick the fastest available one.
+            buffer_size: Number of bytes ijson reads at a time.
+            use_mmap: Read the file through a memory map instead of buffered reads.
+                Ignored for compressed files.
         Yields:
             dict: A JSON object parsed from the file.
 
@@ -21,15 +84,31 @@ class FileLoader:
             FileNotFoundError: If the file does not exist.
             PermissionError: If access to the file is denied.
             ValueError: If the file contains invalid JSON.
-            OSError: If an unexpected I/O error occurs.
+            OSError: If an unexpected I/O error occurs, or a compressed file is truncated or corrupt.
         """
+        parser = FileLoader.get_backend(backend)
         try:
-            with open(path, "r", encoding="utf-8") as file:
-                try:
-                    yield from ijson.items(file, "item")
-                except ijson.JSONError as e:
-                    raise ValueError(ErrorMessages.INVALID_JSON_FORMAT.format(path)) from e
+            codec = CompressedFile.detect(path)
+            if codec is not None:
+                with CompressedFile.open_reader(path, codec, buffer_size) as file:
+                    yield from FileLoader._parse_items(parser, file, path, buffer_size)
+                return
+
+            with open(path, "rb") as file:
+                if use_mmap and os.fstat(file.fileno()).st_size:
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        yield from FileLoader._parse_items(parser, mapped, path, buffer_size)
+                else:
+                    yield from FileLoader._parse_items(parser, file, path, buffer_size)
         except (FileNotFoundError, PermissionError):
             raise
-        except OSError as e:
+        except (OSError, *CompressedFile.DECODE_ERRORS) as e:
             raise OSError(ErrorMessages.FILE_READ_ERROR.format(path)) from e
+
+    @staticmethod
+    def _parse_items(parser: ModuleType, source, path: str, buffer_size: int) -> Generator[dict, None, None]:
+        """Yield the top-level array items of a binary source with the given backend."""
+        try:
+            yield from parser.items(source, LoaderConstants.ITEMS_PREFIX, buf_size=buffer_size)
+        except ijson.JSONError as e:
+            raise ValueError(ErrorMessages.INVALID_JSON_FORMAT.format(path)) from e
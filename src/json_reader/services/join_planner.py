@@ -0,0 +1,61 @@
+import logging
+import os
+
+from ..constants.combiner_constants import CombinerConstants
+
+logging.getLogger().setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class JoinPlanner:
+    """Chooses how DataCombiner joins students with rooms."""
+
+    @staticmethod
+    def plan(
+        student_file_path: str,
+        room_file_path: str,
+        sorted_by_room: bool = False,
+        max_memory: int | None = None,
+    ) -> str:
+        """
+        Pick the join strategy for one export.
+
+        Inputs sorted by room id are merged in one streaming pass, which needs
+        no memory budget. Otherwise students are spilled to disk under a
+        memory budget, or the hash is built on the smaller side: rooms are
+        loaded first when their file is much smaller than the students file,
+        so that students of unknown rooms are never stored.
+
+        Args:
+            student_file_path: Path to the students file
+            room_file_path: Path to the rooms file
+            sorted_by_room: Whether both files are known to be sorted by room id
+            max_memory: Memory budget in bytes for grouping students, if any
+
+        Returns:
+            str: One of the CombinerConstants strategies
+        """
+        student_size = JoinPlanner._file_size(student_file_path)
+        room_size = JoinPlanner._file_size(room_file_path)
+
+        if sorted_by_room:
+            strategy = CombinerConstants.MERGE_STRATEGY
+        elif max_memory is not None:
+            strategy = CombinerConstants.SPILL_STRATEGY
+        elif 0 < room_size * CombinerConstants.MIN_HASH_ROOMS_SIZE_RATIO <= student_size:
+            strategy = CombinerConstants.HASH_ROOMS_STRATEGY
+        else:
+            strategy = CombinerConstants.HASH_STUDENTS_STRATEGY
+
+        logger.info(
+            CombinerConstants.LOG_JOIN_STRATEGY, student_file_path, student_size, room_file_path, room_size, strategy
+        )
+        return strategy
+
+    @staticmethod
+    def _file_size(path: str) -> int:
+        """Size of the file in bytes, 0 when it cannot be read."""
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
@@ -0,0 +1,223 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from .rejection_sink import RejectionSink
+from ..constants.metrics_constants import MetricsConstants
+from ..constants.validation_constants import ValidationReasons
+
+logging.getLogger().setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _peak_rss_bytes(children: bool = False) -> int:
+    """Peak resident set size of this process, or of its largest finished child; 0 where unknown."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _children_cpu_seconds() -> float:
+    """CPU time used by finished child processes, such as loader workers."""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class RunMetrics:
+    """
+    Timings, counters and peak memory of one run.
+
+    Stages are timed while they run (measure) or while items are pulled from
+    them (track). A stage's time excludes the time spent in the stages it
+    pulls from, so the stage times add up to the run time instead of
+    overlapping. Stages running on pipeline threads are timed on their own
+    thread; the stage consuming them then includes its waits on their queue.
+    Nothing is measured unless a RunMetrics is created.
+    """
+
+    def __init__(self, batch_size: int = MetricsConstants.BATCH_SIZE):
+        """
+        Args:
+            batch_size: Number of items pulled from a tracked iterator per timing
+        """
+        self.batch_size = batch_size
+        self.counters: Counter = Counter()
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.stages: dict[str, list] = {}
+        self._lock = threading.Lock()
+        self._frames = threading.local()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._children_cpu_start = _children_cpu_seconds()
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """Add the wall and CPU time of the block to stage."""
+        frames = self._frames.__dict__.setdefault("stack", [])
+        frame = [0.0, 0.0]
+        frames.append(frame)
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall_start, time.thread_time() - cpu_start
+            frames.pop()
+            if frames:
+                frames[-1][0] += wall
+                frames[-1][1] += cpu
+            self._add(stage, wall - frame[0], cpu - frame[1], 0)
+
+    def track(self, stage: str, items: Iterable, counter: str, nested: tuple[str, str] | None = None) -> Iterator:
+        """
+        Time the pulls from items as stage and count what they yield.
+
+        Args:
+            stage: Stage the pulls are accounted to
+            items: Iterable to measure; it is consumed batch_size items ahead
+            counter: Counter increased by one per item
+            nested: (field, counter) pair; the counter is also increased by len(item[field])
+        """
+        iterator = iter(items)
+        while True:
+            with self.measure(stage):
+                batch = list(islice(iterator, self.batch_size))
+            if not batch:
+                return
+            self._add(stage, 0.0, 0.0, len(batch))
+            with self._lock:
+                self.counters[counter] += len(batch)
+                if nested is not None:
+                    field, nested_counter = nested
+                    self.counters[nested_counter] += sum(len(item[field]) for item in batch)
+            yield from batch
+
+    def _add(self, stage: str, wall: float, cpu: float, items: int) -> None:
+        with self._lock:
+            totals = self.stages.setdefault(stage, [0.0, 0.0, 0])
+            totals[0] += wall
+            totals[1] += cpu
+            totals[2] += items
+
+    def add_file_size(self, path: str, output: bool = False) -> None:
+        """Count the on-disk size of an input or output file, ignoring files that do not exist."""
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        if output:
+            self.bytes_out += size
+        else:
+            self.bytes_in += size
+
+    def snapshot(self, sink: RejectionSink) -> dict[str, Any]:
+        """
+        Describe the run so far.
+
+        Args:
+            sink: Sink that collected the run's rejections
+
+        Returns:
+            dict: Run, stage, record, byte, emitted and memory figures
+        """
+        rejected: Counter = Counter()
+        skipped: Counter = Counter()
+        for (data_type, reason), count in sink.counts.items():
+            (skipped if reason == ValidationReasons.NOT_SELECTED else rejected)[data_type] += count
+
+        records = {}
+        for data_type in (MetricsConstants.STUDENTS_VALID_COUNTER, MetricsConstants.ROOMS_VALID_COUNTER):
+            valid = self.counters[data_type]
+            records[data_type] = {
+                "read": valid + rejected[data_type] + skipped[data_type],
+                "valid": valid,
+                "rejected": rejected[data_type],
+                "skipped": skipped[data_type],
+            }
+
+        with self._lock:
+            stages = {
+                stage: {"wall_seconds": wall, "cpu_seconds": cpu, "items": items}
+                for stage, (wall, cpu, items) in self.stages.items()
+            }
+        return {
+            "wall_seconds": time.perf_counter() - self._wall_start,
+            "cpu_seconds": time.process_time() - self._cpu_start,
+            "children_cpu_seconds": _children_cpu_seconds() - self._children_cpu_start,
+            "stages": stages,
+            "records": records,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "rooms_emitted": self.counters[MetricsConstants.ROOMS_EMITTED_COUNTER],
+            "students_emitted": self.counters[MetricsConstants.STUDENTS_EMITTED_COUNTER],
+            "peak_rss_bytes": _peak_rss_bytes(),
+            "children_peak_rss_bytes": _peak_rss_bytes(children=True),
+        }
+
+    @staticmethod
+    def to_prometheus(snapshot: dict[str, Any]) -> str:
+        """Render a snapshot in the Prometheus text format read by the node exporter's textfile collector."""
+        samples: dict[str, list[tuple[str, Any]]] = {name: [] for name in MetricsConstants.PROMETHEUS_METRICS}
+        samples["run_wall_seconds"].append(("", snapshot["wall_seconds"]))
+        samples["run_cpu_seconds"].append(("", snapshot["cpu_seconds"]))
+        samples["run_children_cpu_seconds"].append(("", snapshot["children_cpu_seconds"]))
+        for stage, totals in snapshot["stages"].items():
+            samples["stage_wall_seconds"].append((f'stage="{stage}"', totals["wall_seconds"]))
+            samples["stage_cpu_seconds"].append((f'stage="{stage}"', totals["cpu_seconds"]))
+            samples["stage_items"].append((f'stage="{stage}"', totals["items"]))
+        for data_type, outcomes in snapshot["records"].items():
+            for outcome, count in outcomes.items():
+                samples["records"].append((f'type="{data_type}",outcome="{outcome}"', count))
+        samples["bytes"].append(('direction="in"', snapshot["bytes_in"]))
+        samples["bytes"].append(('direction="out"', snapshot["bytes_out"]))
+        samples["emitted"].append(('kind="rooms"', snapshot["rooms_emitted"]))
+        samples["emitted"].append(('kind="students"', snapshot["students_emitted"]))
+        samples["peak_rss_bytes"].append(('process="main"', snapshot["peak_rss_bytes"]))
+        samples["peak_rss_bytes"].append(('process="children"', snapshot["children_peak_rss_bytes"]))
+
+        lines = []
+        for name, help_text in MetricsConstants.PROMETHEUS_METRICS.items():
+            metric = MetricsConstants.PROMETHEUS_PREFIX + name
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            lines.extend(f"{metric}{{{labels}}} {value}" if labels else f"{metric} {value}"
+                         for labels, value in samples[name])
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str, sink: RejectionSink) -> None:
+        """
+        Write the metrics as a Prometheus textfile if path ends in .prom, as JSON otherwise.
+
+        The file is replaced atomically, so collectors never read a partial file.
+
+        Args:
+            path: Metrics file path
+            sink: Sink that collected the run's rejections
+        """
+        snapshot = self.snapshot(sink)
+        if path.endswith(MetricsConstants.PROMETHEUS_EXTENSION):
+            content = self.to_prometheus(snapshot)
+        else:
+            content = json.dumps(snapshot, indent=2) + "\n"
+
+        temp_path = path + MetricsConstants.TEMP_SUFFIX
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(content)
+        os.replace(temp_path, path)
+        logger.info(MetricsConstants.LOG_METRICS_WRITTEN, path)
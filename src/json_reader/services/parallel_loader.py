@@ -0,0 +1,339 @@
+import io
+import mmap
+import os
+import pickle
+import re
+from collections import Counter
+from collections.abc import Generator, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import NamedTuple
+
+import ijson
+
+from .compression import CompressedFile
+from .data_filter import DataFilter
+from .file_loader import FileLoader
+from .parse_cache import ParseCache
+from .pipeline import Pipeline
+from .rejection_sink import RejectionSink
+from .room_selection import RoomSelection
+from ..constants.errors_messages import ErrorMessages
+from ..constants.loader_constants import LoaderConstants
+from ..constants.validation_constants import FilterConstants
+
+_STRING = re.compile(rb'"[^"]*(?:"|\Z)')
+_STRING_TAIL = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{},]', re.DOTALL)
+_NON_STRUCTURAL = bytes(byte for byte in range(256) if byte not in b'"[]{}')
+
+
+class ChunkOptions(NamedTuple):
+    """Settings shared by every chunk a worker parses."""
+
+    backend: str
+    batch_size: int
+    sample_rate: float
+    keep_rejected: bool
+    selection: RoomSelection | None = None
+
+
+class ChunkResult(NamedTuple):
+    """What a worker sends back for one chunk."""
+
+    batches: list[bytes]
+    rejection_counts: Counter
+    rejected: list
+
+
+class SegmentScan(NamedTuple):
+    """Structural summary of a raw byte segment, computed without knowing where it starts."""
+
+    quote_count: int
+    depth_delta: int
+    string_tail_end: int | None
+    depth_delta_after_tail: int
+
+
+def _skeleton(segment: bytes) -> bytes:
+    """
+    Reduce a segment to its quotes and brackets.
+
+    Escape sequences are dropped first (segments never start mid-escape), then
+    every other byte. Adjacent quote pairs are removed as well: they either
+    delimit an empty string or separate two strings with nothing structural in
+    between, so the inside/outside status of every remaining bracket is kept.
+    """
+    unescaped = segment.replace(b"\\\\", b"").replace(b'\\"', b"")
+    return unescaped.translate(None, _NON_STRUCTURAL).replace(b'""', b"")
+
+
+def _depth_delta(skeleton: bytes) -> int:
+    """Net bracket depth change of a skeleton that starts outside a string."""
+    structure = _STRING.sub(b"", skeleton)
+    return (structure.count(b"[") + structure.count(b"{")
+            - structure.count(b"]") - structure.count(b"}"))
+
+
+def _scan_segment(path: str, start: int, end: int) -> SegmentScan:
+    """
+    Summarise a raw segment for both possible starting states.
+
+    The segment may start inside a string, so the depth change is computed
+    once assuming it starts outside one, and once as if an opening quote
+    preceded it.
+    """
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        segment = data[start:end]
+
+    skeleton = _skeleton(segment)
+    tail = _STRING_TAIL.match(segment)
+    return SegmentScan(
+        quote_count=skeleton.count(b'"'),
+        depth_delta=_depth_delta(skeleton),
+        string_tail_end=tail.end() if tail else None,
+        depth_delta_after_tail=_depth_delta(b'"' + skeleton) if tail else 0,
+    )
+
+
+def _find_element_start(data: mmap.mmap, offset: int, depth: int, array_end: int) -> int:
+    """
+    Find the first top-level array element starting at or after offset.
+
+    Args:
+        data: The mapped input file.
+        offset: A position known to be outside any string.
+        depth: Bracket depth at offset, where 1 means inside the top-level array.
+        array_end: Position of the closing bracket of the top-level array.
+
+    Returns:
+        int: Offset right after the separating comma, or array_end if none follows.
+    """
+    for match in _TOKEN.finditer(data, offset, array_end):
+        token = match.group()[0]
+        if token == LoaderConstants.ARRAY_START or token == LoaderConstants.OBJECT_START:
+            depth += 1
+        elif token == LoaderConstants.ARRAY_END or token == LoaderConstants.OBJECT_END:
+            depth -= 1
+        elif token == LoaderConstants.COMMA and depth == 1:
+            return match.end()
+    return array_end
+
+
+def _parse_chunk(
+    path: str, start: int, start_depth: int, end: int, end_depth: int,
+    array_start: int, array_end: int, data_type: str, options: ChunkOptions,
+) -> ChunkResult:
+    """
+    Parse and validate the array elements that begin between two cut points.
+
+    Returns:
+        ChunkResult: Pickled batches of valid records in input order, plus the
+        rejections collected while validating them.
+    """
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        first = array_start if start <= array_start else _find_element_start(data, start, start_depth, array_end)
+        last = array_end if end >= array_end else _find_element_start(data, end, end_depth, array_end)
+        if first >= last:
+            return ChunkResult([], Counter(), [])
+
+        elements = data[first:last].rstrip()
+        if elements.endswith(b","):
+            elements = elements[:-1]
+
+    batches = []
+    batch = []
+    sink = RejectionSink(options.sample_rate, keep_rejected=options.keep_rejected)
+    try:
+        parser = ijson.get_backend(options.backend)
+        items = parser.items(io.BytesIO(b"[" + elements + b"]"), LoaderConstants.ITEMS_PREFIX)
+        for item in DataFilter.filter_data(items, data_type, options.batch_size, sink, options.selection):
+            batch.append(item)
+            if len(batch) >= LoaderConstants.RESULT_BATCH_SIZE:
+                batches.append(pickle.dumps(batch, pickle.HIGHEST_PROTOCOL))
+                batch = []
+    except ijson.JSONError as e:
+        raise ValueError(ErrorMessages.INVALID_JSON_FORMAT.format(path)) from e
+
+    if batch:
+        batches.append(pickle.dumps(batch, pickle.HIGHEST_PROTOCOL))
+    return ChunkResult(batches, *sink.drain())
+
+
+class ParallelLoader:
+    """Loads and validates a JSON array file on a pool of worker processes."""
+
+    @staticmethod
+    def _array_bounds(data: mmap.mmap, path: str) -> tuple[int, int] | None:
+        """Return the offsets just past the opening '[' and of the closing ']', or None if not an array."""
+        if not data[:LoaderConstants.MIN_CHUNK_SIZE].lstrip().startswith(b"["):
+            return None
+
+        array_start = data.find(b"[") + 1
+        array_end = data.rfind(b"]")
+        if array_end < array_start or data[array_end + 1:].strip():
+            raise ValueError(ErrorMessages.INVALID_JSON_FORMAT.format(path))
+        return array_start, array_end
+
+    @staticmethod
+    def _raw_cuts(data: mmap.mmap, chunk_size: int) -> list[int]:
+        """Split the file into segments of about chunk_size bytes, never cutting an escape sequence."""
+        cuts = [0]
+        offset = chunk_size
+        while offset < len(data):
+            while offset < len(data) and data[offset - 1] == LoaderConstants.BACKSLASH:
+                offset += 1
+            if offset < len(data):
+                cuts.append(offset)
+            offset += chunk_size
+        return cuts
+
+    @staticmethod
+    def _safe_cuts(raw_cuts: list[int], scans: Iterable[SegmentScan]) -> list[tuple[int, int]]:
+        """
+        Combine segment summaries into cut points that lie outside strings.
+
+        Returns:
+            list: (offset, bracket depth) pairs, one per usable segment.
+        """
+        cuts = []
+        depth = 0
+        in_string = False
+
+        for raw_cut, scan in zip(raw_cuts, scans):
+            if not in_string:
+                cuts.append((raw_cut, depth))
+                depth += scan.depth_delta
+            elif scan.string_tail_end is not None:
+                cuts.append((raw_cut + scan.string_tail_end, depth))
+                depth += scan.depth_delta_after_tail
+            in_string ^= scan.quote_count % 2 == 1
+
+        return cuts
+
+    @staticmethod
+    def _next_done(pending: list[Future], preserve_order: bool) -> Future:
+        """Take the oldest pending chunk, or whichever finishes first when order does not matter."""
+        if preserve_order:
+            return pending.pop(0)
+        completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+        done = completed.pop()
+        pending.remove(done)
+        return done
+
+    @staticmethod
+    def _unpack(result: ChunkResult, sink: RejectionSink) -> Generator[dict, None, None]:
+        """Hand a chunk's rejections to the sink and yield its valid records."""
+        sink.merge(result.rejection_counts, result.rejected)
+        for batch in result.batches:
+            yield from pickle.loads(batch)
+
+    @staticmethod
+    def _collect(
+        futures: Iterable[Future], workers: int, preserve_order: bool, sink: RejectionSink
+    ) -> Generator[dict, None, None]:
+        """Yield records from chunk futures, keeping a bounded number of chunks in flight."""
+        pending: list[Future] = []
+        window = workers * LoaderConstants.PENDING_CHUNKS_PER_WORKER
+
+        for future in futures:
+            pending.append(future)
+            if len(pending) >= window:
+                yield from ParallelLoader._unpack(ParallelLoader._next_done(pending, preserve_order).result(), sink)
+
+        while pending:
+            yield from ParallelLoader._unpack(ParallelLoader._next_done(pending, preserve_order).result(), sink)
+
+    @staticmethod
+    def load_valid_data(
+        path: str,
+        data_type: str,
+        workers: int,
+        preserve_order: bool = True,
+        backend: str | None = None,
+        buffer_size: int = LoaderConstants.READ_BUFFER_SIZE,
+        use_mmap: bool = False,
+        batch_size: int = FilterConstants.DEFAULT_BATCH_SIZE,
+        sink: RejectionSink | None = None,
+        cache: ParseCache | None = None,
+        selection: RoomSelection | None = None,
+    ) -> Generator[dict, None, None]:
+        """
+        Stream the valid items of a JSON array file, parsed on several processes.
+
+        The file is split into byte ranges at top-level element boundaries and
+        each range is parsed and validated by a worker. Small files and a single
+        worker fall back to the sequential FileLoader and DataFilter, as do
+        compressed files, which cannot be split by byte offset.
+
+        Args:
+            path: Path to the JSON file.
+            data_type: What kind of data we're checking ('student' or 'room').
+            workers: Number of worker processes.
+            preserve_order: Yield records in input order; otherwise yield chunks as they finish.
+            backend: ijson backend name, or None to pick the fastest available one.
+            buffer_size: Read buffer size for the sequential path.
+            use_mmap: Read through a memory map on the sequential path.
+            batch_size: How many items are validated together.
+            sink: Where rejected items are reported; a sampling sink is used if omitted.
+            cache: Parse cache to read the valid items from, and to store them in on a miss.
+            selection: Rooms to keep; other items are skipped as they come out of the parser.
+                The cache keeps the items of each selection apart.
+
+        Yields:
+            dict: A valid JSON object parsed from the file.
+
+        Raises:
+            ValueError: If the file contains invalid JSON.
+            OSError: If the file cannot be read.
+        """
+        backend = FileLoader.resolve_backend(backend)
+        sink = sink if sink is not None else RejectionSink()
+        if cache is not None:
+            yield from cache.load_valid_data(path, data_type, sink, lambda load_sink: ParallelLoader.load_valid_data(
+                path, data_type, workers, preserve_order, backend, buffer_size, use_mmap, batch_size, load_sink,
+                selection=selection,
+            ), selection)
+            return
+
+        sequential = FileLoader.load_file_data(path, backend, buffer_size, use_mmap)
+
+        size = os.path.getsize(path)
+        if workers <= 1 or size <= LoaderConstants.MIN_CHUNK_SIZE or CompressedFile.detect(path):
+            yield from DataFilter.filter_data(sequential, data_type, batch_size, sink, selection)
+            return
+
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            bounds = ParallelLoader._array_bounds(data, path)
+            chunk_size = min(
+                LoaderConstants.MAX_CHUNK_SIZE,
+                max(LoaderConstants.MIN_CHUNK_SIZE, size // (workers * LoaderConstants.CHUNKS_PER_WORKER)),
+            )
+            raw_cuts = ParallelLoader._raw_cuts(data, chunk_size)
+
+        if bounds is None:
+            yield from DataFilter.filter_data(sequential, data_type, batch_size, sink, selection)
+            return
+        array_start, array_end = bounds
+
+        # Imported here so that sequential loads do not pay for multiprocessing.
+        from concurrent.futures import ProcessPoolExecutor
+
+        options = ChunkOptions(backend, batch_size, sink.sample_rate, sink.quarantine_path is not None, selection)
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=Pipeline.worker_context())
+        try:
+            scans = executor.map(
+                _scan_segment, [path] * len(raw_cuts), raw_cuts, raw_cuts[1:] + [size]
+            )
+            cuts = ParallelLoader._safe_cuts(raw_cuts, scans)
+            ends = cuts[1:] + [(array_end, 1)]
+
+            futures = (
+                executor.submit(
+                    _parse_chunk, path, start, start_depth, end, end_depth,
+                    array_start, array_end, data_type, options,
+                )
+                for (start, start_depth), (end, end_depth) in zip(cuts, ends)
+            )
+            yield from ParallelLoader._collect(futures, workers, preserve_order, sink)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
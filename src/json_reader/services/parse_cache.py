@@ -0,0 +1,342 @@
+import hashlib
+import logging
+import marshal
+import os
+import tempfile
+from collections import Counter
+from collections.abc import Callable, Generator, Iterable
+from operator import itemgetter
+
+from .data_validator import ValidatorContext
+from .rejection_sink import RejectionSink
+from .room_selection import RoomSelection
+from ..constants.cache_constants import CacheConstants
+from ..constants.errors_messages import ErrorMessages
+
+logging.getLogger().setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ParseCache:
+    """
+    On-disk cache of the validated records of input files.
+
+    Entries are addressed by the content hash of the input file, its data type
+    and the schema it was validated with, so a renamed or touched but unchanged
+    file still hits. A small key file per input path remembers the size, mtime
+    and hash seen last, which lets unchanged files skip hashing altogether.
+    Records are written and read back in marshalled blocks of column values,
+    so neither side holds a whole file in memory; an entry that would not fit
+    in max_size is dropped while it is written. The least recently used
+    entries are evicted once the cache grows beyond max_size bytes.
+    """
+
+    def __init__(self, directory: str | None = None, max_size: int = CacheConstants.DEFAULT_MAX_SIZE):
+        """
+        Args:
+            directory: Cache directory; defaults to $JSON_READER_CACHE_DIR or ~/.cache/json_reader
+            max_size: Total size in bytes the cache is trimmed to after each store
+
+        Raises:
+            OSError: If the cache directory cannot be created.
+        """
+        directory = directory or os.environ.get(CacheConstants.DIR_ENV_VAR) or CacheConstants.DEFAULT_DIR
+        self.directory = os.path.expanduser(directory)
+        self.max_size = max_size
+        os.makedirs(self.directory, exist_ok=True)
+
+    def load_valid_data(
+        self,
+        path: str,
+        data_type: str,
+        sink: RejectionSink,
+        load: Callable[[RejectionSink], Iterable[dict]],
+        selection: RoomSelection | None = None,
+    ) -> Generator[dict, None, None]:
+        """
+        Stream the valid records of a file from the cache, or load and cache them.
+
+        On a hit the cached rejection counts, and rejected records if the sink
+        quarantines them, are merged into sink and the records are read back
+        a block at a time. On a miss the valid records are yielded as load
+        produces them and written to the entry in blocks; the entry is given
+        up as soon as it outgrows max_size. Rejected records are only kept,
+        and cached, when the sink writes a quarantine file.
+
+        Args:
+            path: Path to the input file
+            data_type: What kind of data the file holds ('student' or 'room')
+            sink: Where rejected records are reported
+            load: Loads the valid records of path, reporting rejections to the sink it is given
+            selection: Rooms load keeps; each selection is cached in its own entry,
+                with the number of records it skipped
+        """
+        digest = self._content_digest(path)
+        entry_path = self._entry_path(digest, data_type, selection)
+        keep_rejected = sink.quarantine_path is not None
+
+        trailer = self._read_trailer(entry_path)
+        if trailer is not None:
+            records_end, record_count, counts, rejected, rejected_kept = trailer
+        # an entry cached without its rejected records cannot fill a quarantine file
+        if trailer is not None and (rejected_kept or not keep_rejected):
+            sink.merge(Counter(dict(counts)), rejected)
+            logger.info(CacheConstants.LOG_CACHE_HIT, record_count, data_type, path)
+            yield from self._read_records(entry_path, records_end)
+            return
+
+        load_sink = RejectionSink(sink.sample_rate, keep_rejected=keep_rejected)
+        writer = _EntryWriter(self, entry_path, path, data_type)
+        record_count = 0
+        batch = []
+        try:
+            for record in load(load_sink):
+                yield record
+                batch.append(record)
+                if len(batch) >= CacheConstants.BLOCK_SIZE:
+                    writer.write_block(batch)
+                    record_count += len(batch)
+                    batch = []
+            writer.write_block(batch)
+            record_count += len(batch)
+        except BaseException:
+            writer.discard()
+            raise
+        finally:
+            counts, rejected = load_sink.drain()
+            sink.merge(counts, rejected)
+
+        size = writer.commit(record_count, counts, rejected, keep_rejected)
+        if size is not None:
+            logger.info(CacheConstants.LOG_CACHE_STORED, record_count, data_type, path, size)
+        self.evict()
+
+    def _content_digest(self, path: str) -> str:
+        """Hash the file content, reusing the last hash if size and mtime are unchanged."""
+        stat = os.stat(path)
+        fingerprint = f"{stat.st_size} {stat.st_mtime_ns}"
+        key_path = os.path.join(
+            self.directory,
+            hashlib.blake2b(os.path.abspath(path).encode(), digest_size=16).hexdigest() + CacheConstants.KEY_SUFFIX,
+        )
+
+        try:
+            with open(key_path, encoding="utf-8") as file:
+                known_fingerprint, digest = file.read().rsplit(" ", 1)
+            if known_fingerprint == fingerprint:
+                os.utime(key_path)
+                return digest
+        except (OSError, ValueError):
+            pass
+
+        content_hash = hashlib.blake2b(digest_size=20)
+        with open(path, "rb") as file:
+            while chunk := file.read(CacheConstants.HASH_CHUNK_SIZE):
+                content_hash.update(chunk)
+        digest = content_hash.hexdigest()
+        self._write_atomically(key_path, f"{fingerprint} {digest}".encode())
+        return digest
+
+    def _entry_path(self, digest: str, data_type: str, selection: RoomSelection | None = None) -> str:
+        """Path of the entry for a file content validated as data_type with the current schema and a selection."""
+        schema = repr(ValidatorContext(data_type).strategy.schema)
+        key = f"{CacheConstants.FORMAT_VERSION}\0{digest}\0{data_type}\0{schema}"
+        if selection is not None:
+            key += f"\0{selection.cache_key()}"
+        return os.path.join(self.directory, hashlib.blake2b(key.encode(), digest_size=20).hexdigest() + CacheConstants.ENTRY_SUFFIX)
+
+    @staticmethod
+    def _record_builder(keys: tuple[str, ...]) -> Callable[..., dict]:
+        """Compile a function building a record from one value per key, much faster than dict(zip())."""
+        parameters = [f"v{index}" for index in range(len(keys))]
+        items = ", ".join(f"{key!r}: {parameter}" for key, parameter in zip(keys, parameters))
+        return eval(f"lambda {', '.join(parameters)}: {{{items}}}")
+
+    @staticmethod
+    def _read_trailer(entry_path: str) -> tuple | None:
+        """
+        Read the trailer of an entry, or return None if it is missing or unreadable.
+
+        Returns:
+            tuple: (offset where the records end, record count, rejection counts,
+            rejected records, whether rejected records were kept)
+        """
+        try:
+            with open(entry_path, "rb") as file:
+                file.seek(-CacheConstants.TRAILER_OFFSET_BYTES, os.SEEK_END)
+                records_end = int.from_bytes(file.read(CacheConstants.TRAILER_OFFSET_BYTES), "little")
+                file.seek(records_end)
+                record_count, counts, rejected, rejected_kept = marshal.load(file)
+            os.utime(entry_path)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        return records_end, record_count, counts, rejected, rejected_kept
+
+    @staticmethod
+    def _read_records(entry_path: str, records_end: int) -> Generator[dict, None, None]:
+        """
+        Stream the records of an entry block by block.
+
+        Raises:
+            OSError: If the entry cannot be read back
+        """
+        builders: dict[tuple[str, ...], Callable[..., dict]] = {}
+        try:
+            with open(entry_path, "rb") as file:
+                while file.tell() < records_end:
+                    keys, rows = marshal.load(file)
+                    if keys is None:
+                        yield from rows
+                    elif keys:
+                        if keys not in builders:
+                            builders[keys] = ParseCache._record_builder(keys)
+                        yield from map(builders[keys], *rows)
+        except (EOFError, ValueError, TypeError) as e:
+            raise OSError(ErrorMessages.FILE_READ_ERROR.format(entry_path)) from e
+
+    @staticmethod
+    def _encode_block(records: list[dict]) -> bytes:
+        """Marshal records column-wise when they share their keys, as they are otherwise."""
+        keys = tuple(records[0]) if records else ()
+        if all(map(keys.__eq__, map(tuple, records))):
+            return marshal.dumps((keys, [list(map(itemgetter(key), records)) for key in keys]),
+                                 CacheConstants.MARSHAL_VERSION)
+        return marshal.dumps((None, records), CacheConstants.MARSHAL_VERSION)
+
+    def _write_atomically(self, target_path: str, data: bytes) -> bool:
+        """Write data to a temporary file and move it into place; a failed write only skips caching."""
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=CacheConstants.TEMP_SUFFIX)
+        except OSError as e:
+            logger.warning(CacheConstants.LOG_CACHE_WRITE_FAILED, target_path, e)
+            return False
+
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, target_path)
+        except OSError as e:
+            os.unlink(temp_path)
+            logger.warning(CacheConstants.LOG_CACHE_WRITE_FAILED, target_path, e)
+            return False
+        return True
+
+    def evict(self) -> None:
+        """Delete the least recently used files until the cache fits in max_size."""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith((CacheConstants.ENTRY_SUFFIX, CacheConstants.KEY_SUFFIX)):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in files)
+        evicted = evicted_bytes = 0
+        for _, size, file_path in sorted(files):
+            if total <= self.max_size:
+                break
+            try:
+                os.unlink(file_path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+            evicted_bytes += size
+
+        if evicted:
+            logger.info(CacheConstants.LOG_CACHE_EVICTED, evicted, evicted_bytes)
+
+
+class _EntryWriter:
+    """A cache entry being written to a temporary file, moved into place once complete."""
+
+    def __init__(self, cache: ParseCache, entry_path: str, path: str, data_type: str):
+        self.cache = cache
+        self.entry_path = entry_path
+        self.path = path
+        self.data_type = data_type
+        self.size = 0
+        self.file = None
+        self.temp_path = None
+        try:
+            fd, self.temp_path = tempfile.mkstemp(dir=cache.directory, suffix=CacheConstants.TEMP_SUFFIX)
+            self.file = os.fdopen(fd, "wb")
+        except OSError as e:
+            logger.warning(CacheConstants.LOG_CACHE_WRITE_FAILED, entry_path, e)
+            self.discard()
+
+    def write_block(self, records: list[dict]) -> None:
+        """Append a block of records, giving the entry up if it cannot be stored or grows too large."""
+        if self.file is None or not records:
+            return
+        try:
+            data = ParseCache._encode_block(records)
+        except ValueError as e:
+            logger.info(CacheConstants.LOG_CACHE_UNCACHEABLE, self.data_type, self.path, e)
+            self.discard()
+            return
+
+        self.size += len(data)
+        if self.size > self.cache.max_size:
+            logger.info(CacheConstants.LOG_CACHE_TOO_LARGE, self.data_type, self.path, self.cache.max_size)
+            self.discard()
+            return
+        self._write(data)
+
+    def commit(self, record_count: int, counts: Counter, rejected: list, rejected_kept: bool) -> int | None:
+        """
+        Write the trailer and move the entry into place.
+
+        Returns:
+            int | None: Size of the stored entry, or None if it was given up
+        """
+        if self.file is None:
+            return None
+        records_end = self.size
+        try:
+            trailer = marshal.dumps((record_count, list(counts.items()), rejected, rejected_kept),
+                                    CacheConstants.MARSHAL_VERSION)
+        except ValueError as e:
+            logger.info(CacheConstants.LOG_CACHE_UNCACHEABLE, self.data_type, self.path, e)
+            self.discard()
+            return None
+
+        self.size += len(trailer) + CacheConstants.TRAILER_OFFSET_BYTES
+        if self.size > self.cache.max_size:
+            logger.info(CacheConstants.LOG_CACHE_TOO_LARGE, self.data_type, self.path, self.cache.max_size)
+            self.discard()
+            return None
+        self._write(trailer + records_end.to_bytes(CacheConstants.TRAILER_OFFSET_BYTES, "little"))
+        if self.file is None:
+            return None
+
+        try:
+            self.file.close()
+            self.file = None
+            os.replace(self.temp_path, self.entry_path)
+        except OSError as e:
+            logger.warning(CacheConstants.LOG_CACHE_WRITE_FAILED, self.entry_path, e)
+            self.discard()
+            return None
+        return self.size
+
+    def _write(self, data: bytes) -> None:
+        try:
+            self.file.write(data)
+        except OSError as e:
+            logger.warning(CacheConstants.LOG_CACHE_WRITE_FAILED, self.entry_path, e)
+            self.discard()
+
+    def discard(self) -> None:
+        """Give the entry up and delete its temporary file."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        if self.temp_path is not None:
+            try:
+                os.unlink(self.temp_path)
+            except FileNotFoundError:
+                pass
+            self.temp_path = None
@@ -0,0 +1,195 @@
+import logging
+import queue
+import threading
+import time
+from collections.abc import Generator, Iterable
+from itertools import islice
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from ..constants.errors_messages import ErrorMessages
+from ..constants.pipeline_constants import PipelineConstants
+
+if TYPE_CHECKING:
+    from multiprocessing.context import BaseContext
+
+logging.getLogger().setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+
+class _Failure(NamedTuple):
+    """An exception raised by a stage's source, handed over to its consumer."""
+
+    error: BaseException
+
+
+class PipelineStage:
+    """
+    Runs an iterable on a background thread and hands its items over through a bounded queue.
+
+    Items travel in batches of batch_size; once queue_depth batches are
+    waiting, the source is paused until the consumer catches up. An exception
+    raised by the source is re-raised by the consumer. Stopping the stage
+    ends its thread at the next batch and makes a waiting consumer fail
+    instead of blocking forever.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        source: Iterable[Any],
+        queue_depth: int = PipelineConstants.QUEUE_DEPTH,
+        batch_size: int = PipelineConstants.BATCH_SIZE,
+    ):
+        """
+        Start pulling items from source.
+
+        Args:
+            name: Stage name used in logs and the thread name
+            source: Items to produce
+            queue_depth: Number of batches buffered before the source is paused
+            batch_size: Number of items per batch
+        """
+        self.name = name
+        self.items = 0
+        self.blocked_seconds = 0.0
+        self.waiting_seconds = 0.0
+        self._batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_depth)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._produce, args=(source,), name=PipelineConstants.THREAD_NAME.format(name), daemon=True
+        )
+        self._thread.start()
+
+    def _put(self, item: Any) -> bool:
+        """Queue an item, giving up once the stage has been closed."""
+        start = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                try:
+                    self._queue.put(item, timeout=PipelineConstants.QUEUE_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            self.blocked_seconds += time.perf_counter() - start
+
+    def _produce(self, source: Iterable[Any]) -> None:
+        iterator = iter(source)
+        try:
+            while batch := list(islice(iterator, self._batch_size)):
+                self.items += len(batch)
+                if not self._put(batch):
+                    return
+        except BaseException as e:
+            self._put(_Failure(e))
+            return
+        finally:
+            # Run the source's cleanup on this thread, e.g. closing the files of a generator.
+            if hasattr(iterator, "close"):
+                iterator.close()
+        self._put(_END)
+
+    def _get(self) -> Any:
+        """Take the next batch, failing once the stage has been stopped."""
+        start = time.perf_counter()
+        try:
+            while True:
+                try:
+                    return self._queue.get(timeout=PipelineConstants.QUEUE_POLL_SECONDS)
+                except queue.Empty:
+                    if self._stop.is_set():
+                        raise RuntimeError(ErrorMessages.PIPELINE_STAGE_STOPPED.format(self.name))
+        finally:
+            self.waiting_seconds += time.perf_counter() - start
+
+    def __iter__(self) -> Generator[Any, None, None]:
+        while (batch := self._get()) is not _END:
+            if isinstance(batch, _Failure):
+                raise batch.error
+            yield from batch
+
+    def stop(self) -> None:
+        """Ask the thread to stop; it does so before queuing its next batch."""
+        self._stop.set()
+
+    def join(self) -> None:
+        """Wait for the thread and log the stage's timings."""
+        self._thread.join()
+        logger.info(
+            PipelineConstants.LOG_STAGE_SUMMARY, self.name, self.items, self.blocked_seconds, self.waiting_seconds
+        )
+
+
+class Pipeline:
+    """
+    A set of stages connected by bounded queues.
+
+    Each stage runs on its own thread, so reading, parsing, combining and
+    writing overlap, limited to work that releases the GIL such as file I/O
+    and (de)compression. Closing the pipeline stops every stage first and only
+    then joins them, so no stage is left waiting on one that already stopped.
+    """
+
+    def __init__(
+        self,
+        queue_depth: int = PipelineConstants.QUEUE_DEPTH,
+        stage_queue_depths: dict[str, int] | None = None,
+        batch_size: int = PipelineConstants.BATCH_SIZE,
+    ):
+        """
+        Args:
+            queue_depth: Number of batches buffered between stages
+            stage_queue_depths: Queue depth per stage name, overriding queue_depth
+            batch_size: Number of items handed over at a time
+        """
+        self.queue_depth = queue_depth
+        self.stage_queue_depths = stage_queue_depths or {}
+        self.batch_size = batch_size
+        self.stages: list[PipelineStage] = []
+
+    @staticmethod
+    def worker_context() -> "BaseContext":
+        """
+        Multiprocessing context for starting worker processes from the current process.
+
+        Forking while other threads run (pipeline stages, compression, a
+        served index) copies locks they may hold into the child, where nothing
+        ever releases them. Once another thread is alive, workers are started
+        with the first available method of PipelineConstants.THREAD_SAFE_START_METHODS
+        instead; a process with a single thread keeps the platform default,
+        which starts workers fastest.
+        """
+        # Imported here so that runs without worker processes do not pay for multiprocessing.
+        import multiprocessing
+
+        if threading.active_count() == 1:
+            return multiprocessing.get_context()
+        available = multiprocessing.get_all_start_methods()
+        return multiprocessing.get_context(
+            next(method for method in PipelineConstants.THREAD_SAFE_START_METHODS if method in available)
+        )
+
+    def stage(self, name: str, source: Iterable[Any]) -> PipelineStage:
+        """Start a stage producing the items of source."""
+        stage = PipelineStage(
+            name, source, self.stage_queue_depths.get(name, self.queue_depth), self.batch_size
+        )
+        self.stages.append(stage)
+        return stage
+
+    def close(self) -> None:
+        """Stop and join every stage."""
+        for stage in self.stages:
+            stage.stop()
+        for stage in self.stages:
+            stage.join()
+
+    def __enter__(self) -> "Pipeline":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,182 @@
+import cProfile
+import logging
+import os
+import pstats
+import tracemalloc
+from collections.abc import Iterable, Iterator
+
+from ..constants.profiler_constants import ProfilerConstants
+
+logging.getLogger().setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class Profiler:
+    """
+    Profiles a run into a report directory.
+
+    In cpu mode the run is profiled with cProfile; the statistics are saved
+    as pstats and as collapsed stacks for flame graph tools. Only the thread
+    entering the profiler is profiled, not pipeline threads or worker
+    processes. In memory mode tracemalloc snapshots are taken at checkpoints
+    between the stages and the top allocation sites of each are reported.
+    """
+
+    def __init__(self, mode: str, report_dir: str = ProfilerConstants.DEFAULT_DIR):
+        """
+        Args:
+            mode: 'cpu' or 'memory'
+            report_dir: Directory receiving the report files, created if needed
+        """
+        self.mode = mode
+        self.report_dir = report_dir
+        self._profile: cProfile.Profile | None = None
+        self._snapshots: list[tuple[str, tracemalloc.Snapshot, tuple[int, int]]] = []
+        self._started_tracing = False
+
+    @property
+    def traces_memory(self) -> bool:
+        return self.mode == ProfilerConstants.MEMORY_MODE
+
+    def __enter__(self) -> "Profiler":
+        os.makedirs(self.report_dir, exist_ok=True)
+        if self.traces_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(ProfilerConstants.TRACEMALLOC_FRAMES)
+                self._started_tracing = True
+            self.checkpoint(ProfilerConstants.START_CHECKPOINT)
+        else:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self._profile is not None:
+            self._profile.disable()
+            self._write_cpu_report()
+        else:
+            self.checkpoint(ProfilerConstants.EXPORTED_CHECKPOINT)
+            self._write_memory_report()
+            if self._started_tracing:
+                tracemalloc.stop()
+
+    def checkpoint(self, name: str) -> None:
+        """In memory mode, snapshot the traced allocations as checkpoint name."""
+        if not self.traces_memory:
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+            + [tracemalloc.Filter(False, file_name) for file_name in ProfilerConstants.IGNORED_TRACE_FILES]
+        )
+        self._snapshots.append((name, snapshot, tracemalloc.get_traced_memory()))
+
+    def checkpoint_before(self, items: Iterable, name: str) -> Iterable:
+        """Take checkpoint name when the first item is pulled; items is returned unchanged outside memory mode."""
+        if not self.traces_memory:
+            return items
+        return self._checkpoint_before(items, name)
+
+    def checkpoint_after(self, items: Iterable, name: str) -> Iterable:
+        """Take checkpoint name once items is exhausted; items is returned unchanged outside memory mode."""
+        if not self.traces_memory:
+            return items
+        return self._checkpoint_after(items, name)
+
+    def _checkpoint_before(self, items: Iterable, name: str) -> Iterator:
+        iterator = iter(items)
+        for item in iterator:
+            self.checkpoint(name)
+            yield item
+            break
+        yield from iterator
+
+    def _checkpoint_after(self, items: Iterable, name: str) -> Iterator:
+        yield from items
+        self.checkpoint(name)
+
+    def _write_cpu_report(self) -> None:
+        """Save the pstats file and the collapsed stacks derived from it."""
+        pstats_path = os.path.join(self.report_dir, ProfilerConstants.PSTATS_FILE_NAME)
+        self._profile.dump_stats(pstats_path)
+
+        collapsed_path = os.path.join(self.report_dir, ProfilerConstants.COLLAPSED_FILE_NAME)
+        stats = pstats.Stats(self._profile).stats
+        with open(collapsed_path, "w", encoding="utf-8") as file:
+            for stack, seconds in sorted(self.collapse_stacks(stats).items()):
+                file.write(f"{stack} {round(seconds * ProfilerConstants.MICROSECONDS)}\n")
+        logger.info(ProfilerConstants.LOG_PROFILE_WRITTEN, self.mode, self.report_dir)
+
+    @staticmethod
+    def collapse_stacks(stats: dict) -> dict[str, float]:
+        """
+        Turn cProfile statistics into collapsed stacks, as read by flamegraph.pl and speedscope.
+
+        cProfile keeps caller to callee edges rather than whole stacks, so the
+        stacks are rebuilt by walking the call graph from its roots. The time
+        of a function called from several places is split between them in
+        proportion to the time each caller spent in it; recursive calls are
+        folded into the first occurrence of the function on the stack.
+
+        Args:
+            stats: pstats.Stats(...).stats mapping
+
+        Returns:
+            dict: Semicolon-joined stack of frames to the own time, in seconds, spent at its top
+        """
+        callees: dict[tuple, list[tuple[tuple, float]]] = {}
+        for function, (_, _, _, _, callers) in stats.items():
+            for caller, (_, _, _, edge_cumulative) in callers.items():
+                callees.setdefault(caller, []).append((function, edge_cumulative))
+
+        collapsed: dict[str, float] = {}
+
+        def visit(function: tuple, frames: list[str], path: set, seconds: float) -> None:
+            own_seconds, cumulative_seconds = stats[function][2], stats[function][3]
+            share = seconds / cumulative_seconds if cumulative_seconds else 0.0
+            stack = ProfilerConstants.FRAME_SEPARATOR.join(frames)
+            if own_seconds * share >= ProfilerConstants.MIN_COLLAPSED_SECONDS:
+                collapsed[stack] = collapsed.get(stack, 0.0) + own_seconds * share
+            for callee, edge_cumulative in callees.get(function, []):
+                callee_seconds = edge_cumulative * share
+                if callee in path or callee_seconds < ProfilerConstants.MIN_COLLAPSED_SECONDS:
+                    continue
+                path.add(callee)
+                frames.append(Profiler._frame_name(callee))
+                visit(callee, frames, path, callee_seconds)
+                frames.pop()
+                path.discard(callee)
+
+        for function, (_, _, _, cumulative_seconds, callers) in stats.items():
+            if not callers:
+                visit(function, [Profiler._frame_name(function)], {function}, cumulative_seconds)
+        return collapsed
+
+    @staticmethod
+    def _frame_name(function: tuple) -> str:
+        file_name, line, name = function
+        if file_name == ProfilerConstants.BUILTIN_FILE_NAME:
+            frame = name
+        else:
+            frame = f"{name} ({os.path.basename(file_name)}:{line})"
+        return frame.replace(ProfilerConstants.FRAME_SEPARATOR, ",")
+
+    def _write_memory_report(self) -> None:
+        """Save every snapshot and a text report of the top allocation sites at each checkpoint."""
+        lines = []
+        previous_name, previous = None, None
+        for index, (name, snapshot, (traced, peak)) in enumerate(self._snapshots):
+            snapshot.dump(os.path.join(self.report_dir, ProfilerConstants.SNAPSHOT_FILE_NAME.format(index, name)))
+
+            lines.append(ProfilerConstants.REPORT_CHECKPOINT.format(index, name, traced / 1e6, peak / 1e6))
+            lines.append(ProfilerConstants.REPORT_TOP_SITES)
+            lines.extend(map(str, snapshot.statistics("lineno")[:ProfilerConstants.TOP_ALLOCATIONS]))
+            if previous is not None:
+                lines.append(ProfilerConstants.REPORT_TOP_CHANGES.format(previous_name))
+                lines.extend(map(str, snapshot.compare_to(previous, "lineno")[:ProfilerConstants.TOP_ALLOCATIONS]))
+            lines.append("")
+            previous_name, previous = name, snapshot
+
+        with open(os.path.join(self.report_dir, ProfilerConstants.MEMORY_REPORT_FILE_NAME), "w",
+                  encoding="utf-8") as file:
+            file.write("\n".join(lines))
+        logger.info(ProfilerConstants.LOG_PROFILE_WRITTEN, self.mode, self.report_dir)
@@ -0,0 +1,157 @@
+import json
+import logging
+import threading
+from collections import Counter
+from typing import Any, Sequence
+
+from ..constants.validation_constants import RejectionConstants, ValidationReasons
+
+logging.getLogger().setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class RejectionSink:
+    """
+    Collects rejected records instead of logging each one.
+
+    Rejections are counted per data type and reason, only every n-th one is
+    logged, and all of them can be written to a quarantine NDJSON file.
+    Records skipped by a room selection are only counted.
+    Several threads may report to the same sink.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = RejectionConstants.DEFAULT_SAMPLE_RATE,
+        quarantine_path: str | None = None,
+        keep_rejected: bool = False,
+    ):
+        """
+        Set up the sink.
+
+        Args:
+            sample_rate: Fraction of rejections to log, from 0 (none) to 1 (all)
+            quarantine_path: NDJSON file receiving every rejected record
+            keep_rejected: Keep rejected records in memory so drain() can hand
+                them to another sink (used by worker processes)
+        """
+        self.sample_rate = sample_rate
+        self.keep_rejected = keep_rejected
+        self.counts: Counter = Counter()
+        self.quarantine_path = quarantine_path
+        self._sample_every = round(1 / sample_rate) if sample_rate > 0 else 0
+        self._seen = 0
+        self._rejected: list[tuple[str, Any, int]] = []
+        self._quarantined = 0
+        self._lock = threading.Lock()
+        self._quarantine = (
+            open(quarantine_path, "w", encoding="utf-8", buffering=RejectionConstants.QUARANTINE_BUFFER_SIZE)
+            if quarantine_path else None
+        )
+
+    def reject_batch(self, data_type: str, items: Sequence[Any], reasons: Sequence[int]) -> None:
+        """
+        Record the rejected items of a validated batch.
+
+        Args:
+            data_type: What kind of data the items are ('student' or 'room')
+            items: The whole batch
+            reasons: ValidationReasons code per item; VALID items are ignored
+        """
+        rejected = [(item, reason) for item, reason in zip(items, reasons) if reason != ValidationReasons.VALID]
+        if not rejected:
+            return
+
+        with self._lock:
+            self._record(data_type, rejected)
+
+    def skip(self, data_type: str, count: int) -> None:
+        """
+        Count records left out on purpose; they are neither logged nor quarantined.
+
+        Args:
+            data_type: What kind of data the records are ('student' or 'room')
+            count: Number of records left out
+        """
+        with self._lock:
+            self.counts[(data_type, ValidationReasons.NOT_SELECTED)] += count
+
+    @property
+    def rejection_counts(self) -> Counter:
+        """Counts per (data_type, reason) of the records that were rejected, without the skipped ones."""
+        return Counter({key: count for key, count in self.counts.items() if key[1] != ValidationReasons.NOT_SELECTED})
+
+    def _record(self, data_type: str, rejected: list[tuple[Any, int]]) -> None:
+        """Count, sample and keep or quarantine rejected items; the caller holds the lock."""
+        self.counts.update((data_type, reason) for _, reason in rejected)
+
+        if self._sample_every:
+            first = -self._seen % self._sample_every
+            for item, reason in rejected[first::self._sample_every]:
+                logger.warning(
+                    RejectionConstants.LOG_SKIPPING_ITEM, data_type, item, ValidationReasons.DESCRIPTIONS[reason]
+                )
+        self._seen += len(rejected)
+
+        if self._quarantine is not None:
+            self._write_quarantine(data_type, rejected)
+        elif self.keep_rejected:
+            self._rejected.extend((data_type, item, reason) for item, reason in rejected)
+
+    def _write_quarantine(self, data_type: str, rejected: list[tuple[Any, int]]) -> None:
+        """Append rejected records to the quarantine file in one write."""
+        self._quarantine.write("".join(
+            json.dumps({
+                RejectionConstants.TYPE_FIELD: data_type,
+                RejectionConstants.REASON_FIELD: ValidationReasons.DESCRIPTIONS[reason],
+                RejectionConstants.RECORD_FIELD: item,
+            }, default=str) + "\n"
+            for item, reason in rejected
+        ))
+        self._quarantined += len(rejected)
+
+    def drain(self) -> tuple[Counter, list[tuple[str, Any, int]]]:
+        """Hand over the counts and kept records collected so far, and reset them."""
+        with self._lock:
+            state = (self.counts, self._rejected)
+            self.counts, self._rejected = Counter(), []
+        return state
+
+    def merge(self, counts: Counter, rejected: list[tuple[str, Any, int]]) -> None:
+        """
+        Add the drained state of another sink, without logging its records again.
+
+        Args:
+            counts: Rejection counts per (data_type, reason)
+            rejected: Kept (data_type, item, reason) records
+        """
+        with self._lock:
+            self.counts.update(counts)
+            self._seen += sum(
+                count for (_, reason), count in counts.items() if reason != ValidationReasons.NOT_SELECTED
+            )
+            if self._quarantine is not None:
+                for data_type, item, reason in rejected:
+                    self._write_quarantine(data_type, [(item, reason)])
+
+    def log_summary(self) -> None:
+        """Log how many records of each type were rejected and why, and how many were skipped."""
+        if not self.rejection_counts:
+            logger.info(RejectionConstants.LOG_NO_REJECTIONS)
+        for (data_type, reason), count in sorted(self.counts.items()):
+            if reason == ValidationReasons.NOT_SELECTED:
+                logger.info(
+                    RejectionConstants.LOG_SKIPPED_SUMMARY, count, data_type, ValidationReasons.DESCRIPTIONS[reason]
+                )
+            else:
+                logger.warning(
+                    RejectionConstants.LOG_REJECTION_SUMMARY, count, data_type, ValidationReasons.DESCRIPTIONS[reason]
+                )
+        if self.quarantine_path:
+            logger.warning(RejectionConstants.LOG_QUARANTINE_WRITTEN, self._quarantined, self.quarantine_path)
+
+    def close(self) -> None:
+        """Flush and close the quarantine file."""
+        if self._quarantine is not None:
+            self._quarantine.close()
+            self._quarantine = None
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from itertools import compress, islice
+from typing import Any, NamedTuple, Sequence
+
+from .rejection_sink import RejectionSink
+from ..constants.data_item_constants import ItemConstants
+from ..constants.validation_constants import FilterConstants
+
+
+class RoomSelection(NamedTuple):
+    """
+    The rooms an export is limited to, checked on records straight from the parser.
+
+    Rooms are matched on their id and name, students on the id of their room,
+    so that records outside the selection are dropped before they are
+    validated, cached, sent between processes or grouped. A record whose
+    fields cannot be compared is left to validation, which rejects it.
+    """
+
+    room_ids: frozenset | None = None
+    low: int | None = None
+    high: int | None = None
+    name_prefix: str | None = None
+
+    @staticmethod
+    def from_arguments(
+        room_ids: Iterable[int] | None = None,
+        room_id_range: Sequence[int | None] | None = None,
+        room_name_prefix: str | None = None,
+    ) -> RoomSelection | None:
+        """
+        Build the selection asked for by the command line or a manifest job.
+
+        Args:
+            room_ids: Ids of the selected rooms
+            room_id_range: Inclusive (low, high) bounds of the selected room ids, either may be None
+            room_name_prefix: Prefix of the selected room names
+
+        Returns:
+            RoomSelection | None: The selection, or None when every room is selected
+        """
+        low, high = room_id_range if room_id_range is not None else (None, None)
+        selection = RoomSelection(
+            frozenset(room_ids) if room_ids is not None else None, low, high, room_name_prefix or None
+        )
+        return selection if selection != RoomSelection() else None
+
+    def cache_key(self) -> str:
+        """The same text for equal selections, whatever order their room ids were given in."""
+        room_ids = sorted(self.room_ids, key=repr) if self.room_ids is not None else None
+        return repr((room_ids, self.low, self.high, self.name_prefix))
+
+    def for_students(self, rooms: Iterable[dict[str, Any]]) -> tuple[Iterable[dict[str, Any]], RoomSelection]:
+        """
+        Derive the selection of students from this selection of rooms.
+
+        Students are matched on the id of their room. A name prefix cannot be
+        checked on students, so with one the selected rooms are read first and
+        students are matched on the ids of those rooms.
+
+        Args:
+            rooms: The rooms kept by this selection
+
+        Returns:
+            tuple: The rooms, to use instead of the ones passed in, and the selection of students
+        """
+        if self.name_prefix is None:
+            return rooms, self
+        rooms = list(rooms)
+        return rooms, RoomSelection(frozenset(room[ItemConstants.ID_FIELD] for room in rooms))
+
+    def mask(self, records: Sequence[Any], data_type: str) -> list[bool]:
+        """
+        Tell which records of a batch are inside the selection.
+
+        Args:
+            records: Parsed, not yet validated records
+            data_type: What kind of data the records are ('student' or 'room')
+
+        Returns:
+            list: True per record that is selected or cannot be judged
+        """
+        key = ItemConstants.ID_FIELD if data_type == ItemConstants.ROOM_STRATEGY else ItemConstants.ROOM_FIELD
+        name_prefix = self.name_prefix if data_type == ItemConstants.ROOM_STRATEGY else None
+        room_ids, low, high = self.room_ids, self.low, self.high
+
+        def selected(record: Any) -> bool:
+            try:
+                value = record[key]
+                if room_ids is not None and value not in room_ids:
+                    return False
+                if (low is not None and value < low) or (high is not None and value > high):
+                    return False
+                if name_prefix is not None:
+                    name = record[ItemConstants.NAME_FIELD]
+                    return not isinstance(name, str) or name.startswith(name_prefix)
+            except (KeyError, TypeError):
+                pass
+            return True
+
+        return [selected(record) for record in records]
+
+    def select(
+        self,
+        records: Iterable[Any],
+        data_type: str,
+        sink: RejectionSink,
+        batch_size: int = FilterConstants.DEFAULT_BATCH_SIZE,
+    ) -> Iterator[Any]:
+        """
+        Yield the records inside the selection, counting the others as skipped.
+
+        Args:
+            records: Stream of records
+            data_type: What kind of data the records are ('student' or 'room')
+            sink: Where the number of skipped records is reported
+            batch_size: How many records are checked together
+
+        Yields:
+            The selected records, in input order
+        """
+        records = iter(records)
+        while batch := list(islice(records, batch_size)):
+            selected = list(compress(batch, self.mask(batch, data_type)))
+            if len(selected) < len(batch):
+                sink.skip(data_type, len(batch) - len(selected))
+            yield from selected
@@ -0,0 +1,395 @@
+import json
+import logging
+import os
+import socketserver
+import stat
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .cli_parser import CLIArguments
+from .data_combiner import DataCombiner
+from .deduplicator import Deduplicator
+from .file_loader import FileLoader
+from .parallel_loader import ParallelLoader
+from .parse_cache import ParseCache
+from .rejection_sink import RejectionSink
+from .room_selection import RoomSelection
+from ..constants.cache_constants import CacheConstants
+from ..constants.data_item_constants import ItemConstants
+from ..constants.errors_messages import ErrorMessages
+from ..constants.service_constants import ServiceConstants
+from ..exporters.exporter_factory import ExporterFactory
+
+logging.getLogger().setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class RoomIndex:
+    """
+    Valid rooms and grouped students of one version of the input files, indexed for lookups.
+
+    An index is never changed once built, so requests can keep reading an
+    index while a newer one is loaded. Full exports are rendered once per
+    format and kept; rendering one format does not hold up requests for another.
+    """
+
+    def __init__(self, rooms: Iterable[dict[str, Any]], students: Iterable[dict[str, Any]]):
+        """
+        Args:
+            rooms: Valid rooms
+            students: Valid students
+        """
+        self._student_rooms: dict[Any, Any] = {}
+        self._more_student_rooms: dict[Any, list[Any]] = {}
+        self._students = DataCombiner.group_students_by_room_id(self._index_students(students))
+        self.rooms = list(rooms)
+        self._room_positions = {room[ItemConstants.ID_FIELD]: position for position, room in enumerate(self.rooms)}
+        self._exports: dict[str, bytes] = {}
+        self._export_locks: dict[str, threading.Lock] = {}
+        self._export_lock = threading.Lock()
+
+    def _index_students(self, students: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        """Pass students on to grouping while remembering the room of each student id."""
+        for student in students:
+            student_id, room_id = student.get(ItemConstants.ID_FIELD), student.get(ItemConstants.ROOM_FIELD)
+            if student_id in self._student_rooms:
+                self._more_student_rooms.setdefault(student_id, []).append(room_id)
+            else:
+                self._student_rooms[student_id] = room_id
+            yield student
+
+    @property
+    def student_count(self) -> int:
+        return len(self._student_rooms) + sum(map(len, self._more_student_rooms.values()))
+
+    @staticmethod
+    def load(arguments: CLIArguments) -> "RoomIndex":
+        """
+        Load and index the input files of arguments, with the same loading options as an export.
+
+        Raises:
+            ValueError: If an input file is not valid JSON
+            OSError: If an input file cannot be read
+        """
+        backend = FileLoader.resolve_backend(arguments.ijson_backend)
+        cache = None
+        if arguments.use_cache:
+            try:
+                cache = ParseCache(arguments.cache_dir, arguments.cache_max_size)
+            except OSError as e:
+                logger.warning(CacheConstants.LOG_CACHE_UNAVAILABLE, arguments.cache_dir, e)
+
+        selection = RoomSelection.from_arguments(
+            arguments.room_ids, arguments.room_id_range, arguments.room_name_prefix
+        )
+        sink = RejectionSink(arguments.rejection_sample_rate, arguments.quarantine_file)
+        try:
+            rooms = ParallelLoader.load_valid_data(
+                arguments.room_file_path, "room",
+                arguments.workers, arguments.preserve_order,
+                backend, arguments.read_buffer_size, arguments.use_mmap,
+                arguments.validation_batch_size, sink, cache, selection,
+            )
+            student_selection = None
+            if selection is not None:
+                rooms, student_selection = selection.for_students(rooms)
+            students = ParallelLoader.load_valid_data(
+                arguments.student_file_path, "student",
+                arguments.workers, arguments.preserve_order,
+                backend, arguments.read_buffer_size, arguments.use_mmap,
+                arguments.validation_batch_size, sink, cache, student_selection,
+            )
+            deduplicator = None
+            if arguments.dedup_policy:
+                deduplicator = Deduplicator(arguments.dedup_policy, sink)
+                rooms = deduplicator.deduplicate(rooms, "room")
+                students = deduplicator.deduplicate(students, "student")
+            index = RoomIndex(rooms, students)
+            sink.log_summary()
+            if deduplicator is not None:
+                deduplicator.log_summary()
+        finally:
+            sink.close()
+        return index
+
+    def room(self, room_id: Any) -> dict[str, Any] | None:
+        """The combined record of a room, or None if there is no such room."""
+        position = self._room_positions.get(room_id)
+        if position is None:
+            return None
+        return next(DataCombiner.attach_students(self._students, iter([self.rooms[position]])))
+
+    def rooms_of_student(self, student_id: Any) -> list[dict[str, Any]] | None:
+        """
+        The rooms a student id is placed in, or None if there is no such student.
+
+        Args:
+            student_id: Student id; an id used by several students can be in several rooms
+
+        Returns:
+            list: Rooms as {"id": ..., "name": ...}, leaving out rooms that are not in the rooms file
+        """
+        if student_id not in self._student_rooms:
+            return None
+        room_ids = [self._student_rooms[student_id], *self._more_student_rooms.get(student_id, [])]
+        return [
+            {
+                ItemConstants.ID_FIELD: self.rooms[position][ItemConstants.ID_FIELD],
+                ItemConstants.NAME_FIELD: self.rooms[position][ItemConstants.NAME_FIELD],
+            }
+            for position in map(self._room_positions.get, dict.fromkeys(room_ids)) if position is not None
+        ]
+
+    def export(self, format_type: str) -> bytes:
+        """
+        All combined rooms in a format, byte for byte what the exporter's export_file writes.
+
+        Raises:
+            ValueError: If the format is not supported or its exporter cannot render rooms one at a time
+            RuntimeError: If the exporter fails while rendering the rooms
+        """
+        format_type = format_type.lower()
+        exporter = ExporterFactory.create_exporter(format_type)
+        if not exporter.supports_fragments:
+            raise ValueError(ErrorMessages.SERVED_EXPORT_UNSUPPORTED_FORMAT.format(format_type))
+
+        with self._export_lock:
+            format_lock = self._export_locks.setdefault(format_type, threading.Lock())
+        with format_lock:
+            if format_type not in self._exports:
+                combined = DataCombiner.attach_students(self._students, iter(self.rooms))
+                try:
+                    self._exports[format_type] = (
+                        exporter.encode_header()
+                        + exporter.item_separator.join(map(exporter.encode_room, combined))
+                        + exporter.encode_footer()
+                    )
+                except Exception as e:
+                    raise RuntimeError(ErrorMessages.SERVED_EXPORT_FAILED.format(format_type, e)) from e
+            return self._exports[format_type]
+
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _RoomRequestHandler(BaseHTTPRequestHandler):
+    """
+    Answers GET requests from the service's current index:
+        /health                 numbers of rooms and students, and when they were loaded
+        /rooms/<id>             combined record of a room
+        /students/<id>/rooms    rooms of a student
+        /export?format=<name>   all combined rooms in an export format (json by default)
+    """
+
+    protocol_version = ServiceConstants.PROTOCOL_VERSION
+
+    def do_GET(self) -> None:
+        service: RoomService = self.server.service
+        index = service.index
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.split("/") if part]
+
+        if url.path == ServiceConstants.HEALTH_PATH:
+            self._send_json(HTTPStatus.OK, {
+                ServiceConstants.ROOMS_PATH: len(index.rooms),
+                ServiceConstants.STUDENTS_PATH: index.student_count,
+                "loaded_at": service.loaded_at,
+            })
+        elif len(parts) == 2 and parts[0] == ServiceConstants.ROOMS_PATH:
+            room = index.room(self._parse_id(parts[1]))
+            if room is None:
+                self._send_error(HTTPStatus.NOT_FOUND, ServiceConstants.ROOM_NOT_FOUND.format(parts[1]))
+            else:
+                self._send_json(HTTPStatus.OK, room)
+        elif len(parts) == 3 and parts[0] == ServiceConstants.STUDENTS_PATH and parts[2] == ServiceConstants.ROOMS_PATH:
+            rooms = index.rooms_of_student(self._parse_id(parts[1]))
+            if rooms is None:
+                self._send_error(HTTPStatus.NOT_FOUND, ServiceConstants.STUDENT_NOT_FOUND.format(parts[1]))
+            else:
+                self._send_json(HTTPStatus.OK, rooms)
+        elif url.path == ServiceConstants.EXPORT_PATH:
+            query = parse_qs(url.query)
+            format_type = query.get(ServiceConstants.FORMAT_PARAMETER, [ServiceConstants.DEFAULT_FORMAT])[0]
+            try:
+                body = index.export(format_type)
+            except ValueError as e:
+                self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+                return
+            except Exception as e:
+                logger.exception(ServiceConstants.LOG_EXPORT_FAILED, format_type)
+                self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+                return
+            self._send(HTTPStatus.OK, body, ServiceConstants.CONTENT_TYPES.get(
+                format_type.lower(), ServiceConstants.DEFAULT_CONTENT_TYPE
+            ))
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, ServiceConstants.NOT_FOUND)
+
+    @staticmethod
+    def _parse_id(text: str) -> Any:
+        """Ids in the input files are integers; anything else is looked up as given."""
+        try:
+            return int(text)
+        except ValueError:
+            return text
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        self._send_json(status, {ServiceConstants.ERROR_FIELD: message})
+
+    def _send_json(self, status: HTTPStatus, payload: Any) -> None:
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode(), ServiceConstants.JSON_CONTENT_TYPE)
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # Unix socket clients have no address.
+        return str(self.client_address[0]) if self.client_address else ServiceConstants.UNIX_CLIENT
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.info(ServiceConstants.LOG_REQUEST, self.address_string(), format % args)
+
+
+class RoomService:
+    """
+    Serves lookups and exports of the input files from memory.
+
+    The files are loaded and indexed once, then watched: when their size or
+    modification time changes and has stayed the same for one more poll,
+    they are loaded into a new index that replaces the old one. Requests
+    already running finish on the old index; a failed reload keeps it.
+    """
+
+    def __init__(self, arguments: CLIArguments):
+        """
+        Load the input files of arguments.
+
+        Args:
+            arguments: serve_address, watch_interval and the options used to load the input files
+        """
+        self.arguments = arguments
+        self._signature = self._input_signature()
+        self.index = RoomIndex.load(arguments)
+        self.loaded_at = time.time()
+        self._stop = threading.Event()
+        self.server: socketserver.BaseServer | None = None
+
+    def _input_signature(self) -> tuple:
+        """Size and modification time of both input files, None for a missing file."""
+        signature = []
+        for path in (self.arguments.room_file_path, self.arguments.student_file_path):
+            try:
+                file_stat = os.stat(path)
+                signature.append((file_stat.st_size, file_stat.st_mtime_ns))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def reload_if_changed(self, previous_signature: tuple | None = None) -> bool:
+        """
+        Load a new index if the input files changed and are no longer changing.
+
+        Args:
+            previous_signature: Signature seen at the previous poll; the files are
+                only reloaded once it matches the current one. None reloads any change at once.
+
+        Returns:
+            bool: True if a new index was loaded
+        """
+        signature = self._input_signature()
+        if signature == self._signature or None in signature:
+            return False
+        if previous_signature is not None and signature != previous_signature:
+            return False
+
+        start = time.perf_counter()
+        try:
+            index = RoomIndex.load(self.arguments)
+        except (ValueError, OSError) as e:
+            logger.error(ServiceConstants.LOG_RELOAD_FAILED, e)
+            self._signature = signature
+            return False
+
+        self.index, self._signature, self.loaded_at = index, signature, time.time()
+        logger.info(
+            ServiceConstants.LOG_RELOADED, self.arguments.room_file_path, self.arguments.student_file_path,
+            time.perf_counter() - start, len(index.rooms), index.student_count,
+        )
+        return True
+
+    def _watch(self) -> None:
+        # Whatever a reload raises, the previous index keeps being served and the files keep being watched.
+        previous_signature = self._signature
+        while not self._stop.wait(self.arguments.watch_interval):
+            signature = self._input_signature()
+            try:
+                self.reload_if_changed(previous_signature)
+            except Exception:
+                logger.exception(ServiceConstants.LOG_WATCH_FAILED)
+            previous_signature = signature
+
+    def create_server(self) -> socketserver.BaseServer:
+        """
+        Bind serve_address: a Unix socket for a path, otherwise HOST:PORT or PORT on TCP.
+
+        A port of 0 binds any free port; server.server_address tells which. A
+        socket file left behind at the path is replaced; any other file is kept.
+
+        Raises:
+            FileExistsError: If the Unix socket path is taken by something that is not a socket
+            OSError: If the address cannot be bound
+        """
+        address = self.arguments.serve_address
+        if os.sep in address or address.endswith(ServiceConstants.UNIX_SOCKET_SUFFIX):
+            try:
+                mode = os.stat(address).st_mode
+            except FileNotFoundError:
+                mode = None
+            if mode is not None:
+                if not stat.S_ISSOCK(mode):
+                    raise FileExistsError(ErrorMessages.SERVE_ADDRESS_NOT_SOCKET.format(address))
+                os.remove(address)
+            server = _ThreadingUnixHTTPServer(address, _RoomRequestHandler)
+        else:
+            host, _, port = address.rpartition(ServiceConstants.ADDRESS_PORT_SEPARATOR)
+            server = ThreadingHTTPServer((host or ServiceConstants.DEFAULT_HOST, int(port)), _RoomRequestHandler)
+            server.daemon_threads = True
+        server.service = self
+        self.server = server
+        return server
+
+    def serve_forever(self) -> None:
+        """Serve requests and watch the input files until interrupted."""
+        server = self.create_server()
+        watcher = None
+        if self.arguments.watch_interval > 0:
+            watcher = threading.Thread(target=self._watch, name=ServiceConstants.WATCH_THREAD_NAME, daemon=True)
+            watcher.start()
+
+        logger.info(ServiceConstants.LOG_SERVING, len(self.index.rooms), self.index.student_count,
+                    self.arguments.serve_address)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown(server, watcher)
+
+    def shutdown(self, server: socketserver.BaseServer, watcher: threading.Thread | None = None) -> None:
+        """Stop watching, close the server and remove its Unix socket file."""
+        self._stop.set()
+        if watcher is not None:
+            watcher.join()
+        server.server_close()
+        if isinstance(server, socketserver.UnixStreamServer) and os.path.exists(server.server_address):
+            os.remove(server.server_address)
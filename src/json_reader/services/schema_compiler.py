@@ -0,0 +1,67 @@
+import math
+from collections.abc import Callable
+from typing import Any
+
+from ..constants.errors_messages import ErrorMessages
+from ..constants.validation_constants import ValidationReasons
+
+
+class SchemaCompiler:
+    """Turns a declarative entity schema into a specialised check function."""
+
+    _types = {"int": int, "float": (int, float), "str": str, "bool": bool}
+
+    @staticmethod
+    def _field_conditions(rule: dict[str, Any], variable: str) -> list[str]:
+        """
+        Build the failure conditions of one field rule as Python expressions.
+
+        Raises:
+            ValueError: If the rule uses an unknown type or a bound that is not a finite number
+        """
+        if rule.get("type") not in SchemaCompiler._types:
+            raise ValueError(ErrorMessages.UNKNOWN_FIELD_TYPE.format(rule.get("type")))
+
+        conditions = [f"not isinstance({variable}, _{rule['type']})"]
+        for bound, operator in (("min", "<"), ("max", ">")):
+            if rule.get(bound) is not None:
+                # repr() of nan and inf is not valid source, and no value compares usefully against them
+                if type(rule[bound]) not in (int, float) or not math.isfinite(rule[bound]):
+                    raise ValueError(ErrorMessages.INVALID_FIELD_BOUND.format(rule[bound]))
+                conditions.append(f"{variable} {operator} {rule[bound]!r}")
+        if rule.get("non_empty"):
+            conditions.append(f"not {variable}.strip()" if rule["type"] == "str" else f"not {variable}")
+        return conditions
+
+    @staticmethod
+    def compile(schema: dict[str, Any]) -> Callable[[Any], int]:
+        """
+        Generate a function returning the ValidationReasons code of an item.
+
+        The generated code fetches every field once and runs only the checks
+        the schema asks for, in declaration order.
+
+        Args:
+            schema: Entity schema, see EntitySchemas
+
+        Returns:
+            Callable: check(item) -> reason code, VALID for good items
+        """
+        fields = schema["fields"]
+        lines = ["def check(item):", "    try:"]
+        lines += [f"        value_{index} = item[{rule['name']!r}]" for index, rule in enumerate(fields)]
+        lines += [
+            "    except (KeyError, TypeError, IndexError):",
+            f"        return {ValidationReasons.INCOMPLETE}",
+        ]
+        for index, rule in enumerate(fields):
+            conditions = SchemaCompiler._field_conditions(rule, f"value_{index}")
+            lines += [
+                f"    if {' or '.join(conditions)}:",
+                f"        return {int(rule.get('reason', ValidationReasons.INVALID_FIELD))}",
+            ]
+        lines.append(f"    return {ValidationReasons.VALID}")
+
+        namespace = {f"_{name}": field_type for name, field_type in SchemaCompiler._types.items()}
+        exec(compile("\n".join(lines), f"<schema {id(schema):x}>", "exec"), namespace)
+        return namespace["check"]
@@ -0,0 +1,136 @@
+from array import array
+from collections import Counter
+from collections.abc import Container, Iterable, Iterator, Mapping
+from itertools import accumulate, islice
+from operator import itemgetter
+from typing import Any
+
+from ..constants.combiner_constants import CombinerConstants
+from ..constants.data_item_constants import ItemConstants
+from ..constants.errors_messages import ErrorMessages
+
+_student_fields = itemgetter(ItemConstants.ROOM_FIELD, ItemConstants.ID_FIELD, ItemConstants.NAME_FIELD)
+
+
+class CompactStudentGroups(Mapping):
+    """
+    Students grouped by room ID, stored as columns instead of per-student dicts.
+
+    Student ids live in an int64 array and names in one UTF-8 byte pool indexed
+    by offsets. Students are ordered by room (keeping input order within a room)
+    through a permutation array, so each room is a contiguous range of it.
+    The {"id": ..., "name": ...} dicts are only built when a room is looked up.
+    Students whose id or name does not fit the columns are kept as-is on the side.
+    """
+
+    def __init__(self, students: Iterable[dict[str, Any]], room_ids: Container | None = None):
+        """
+        Build the columns from a stream of students.
+
+        Args:
+            students: Student dictionaries to group.
+            room_ids: When given, students of other rooms are dropped instead of stored.
+
+        Raises:
+            ValueError: If a student record is missing required keys.
+        """
+        self._room_index: dict[Any, int] = {}
+        self._ids = array("q")
+        self._name_offsets = array("q", [0])
+        self._names = bytearray()
+        self._irregular: dict[int, dict[str, Any]] = {}
+        student_rooms = array("l")
+
+        students = iter(students)
+        while batch := list(islice(students, CombinerConstants.COMPACT_BATCH_SIZE)):
+            try:
+                if room_ids is not None:
+                    batch = [student for student in batch if student[ItemConstants.ROOM_FIELD] in room_ids]
+                    if not batch:
+                        continue
+                batch_room_ids, ids, names = zip(*map(_student_fields, batch))
+            except KeyError as e:
+                raise ValueError(ErrorMessages.STUDENT_MISSING_KEY.format(e)) from e
+
+            for room_id in dict.fromkeys(batch_room_ids):
+                if room_id not in self._room_index:
+                    self._room_index[room_id] = len(self._room_index)
+            student_rooms.extend(map(self._room_index.__getitem__, batch_room_ids))
+
+            if not self._append_columns(ids, names):
+                for student_id, name in zip(ids, names):
+                    self._append_columns((student_id,), (name,)) or self._append_irregular(student_id, name)
+
+        room_sizes = Counter(student_rooms)
+        self._room_starts = array("q", accumulate(
+            (room_sizes[index] for index in range(len(self._room_index))), initial=0
+        ))
+        # Counting sort: each student goes to the next free slot of its room, in input order,
+        # so no list of positions and sort keys is built next to the columns.
+        next_slots = self._room_starts[:-1]
+        self._order = array("q", [0]) * len(student_rooms)
+        for position, room in enumerate(student_rooms):
+            self._order[next_slots[room]] = position
+            next_slots[room] += 1
+
+    def _append_columns(self, ids: tuple, names: tuple) -> bool:
+        """Append students to the columns; return False without changes if any of them does not fit."""
+        if set(map(type, ids)) != {int} or set(map(type, names)) != {str}:
+            return False
+        try:
+            ids = array("q", ids)
+        except OverflowError:
+            return False
+
+        text = "".join(names)
+        encoded = text.encode(CombinerConstants.NAME_ENCODING, CombinerConstants.NAME_ENCODING_ERRORS)
+        if len(encoded) == len(text):
+            lengths = map(len, names)
+        else:
+            lengths = (
+                len(name.encode(CombinerConstants.NAME_ENCODING, CombinerConstants.NAME_ENCODING_ERRORS))
+                for name in names
+            )
+
+        self._ids.extend(ids)
+        self._name_offsets.extend(accumulate(lengths, initial=len(self._names)))
+        self._name_offsets.pop(-len(names) - 1)
+        self._names += encoded
+        return True
+
+    def _append_irregular(self, student_id: Any, name: Any) -> bool:
+        """Keep a student that does not fit the columns as a plain dict."""
+        self._irregular[len(self._ids)] = {ItemConstants.ID_FIELD: student_id, ItemConstants.NAME_FIELD: name}
+        self._ids.append(0)
+        self._name_offsets.append(len(self._names))
+        return True
+
+    def __getitem__(self, room_id: Any) -> list[dict[str, Any]]:
+        """Materialize the students of a room, in input order."""
+        index = self._room_index[room_id]
+        order = self._order[self._room_starts[index]:self._room_starts[index + 1]]
+        ids, names, offsets = self._ids, self._names, self._name_offsets
+
+        students = [
+            {
+                ItemConstants.ID_FIELD: ids[position],
+                ItemConstants.NAME_FIELD: names[offsets[position]:offsets[position + 1]].decode(
+                    CombinerConstants.NAME_ENCODING, CombinerConstants.NAME_ENCODING_ERRORS
+                ),
+            }
+            for position in order
+        ]
+        if self._irregular:
+            for slot, position in enumerate(order):
+                if position in self._irregular:
+                    students[slot] = dict(self._irregular[position])
+        return students
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._room_index)
+
+    def __len__(self) -> int:
+        return len(self._room_index)
+
+    def __contains__(self, room_id: Any) -> bool:
+        return room_id in self._room_index
@@ -1,8 +1,10 @@
+import sys
+
 from json_reader import application
 
 
 def main():
-    application.start_application()
+    sys.exit(application.start_application())
 
 
 if __name__ == "__main__":
@@ -1,14 +1,48 @@
+import argparse
+import bz2
+import csv
+import gzip
+import lzma
 import unittest
 import tempfile
 import json
 import os
+import subprocess
+import sys
+import threading
+import urllib.error
+import urllib.request
 from pathlib import Path
 from unittest.mock import patch
-from src.json_reader.services.cli_parser import CLIParser
+from src.json_reader import application
+from src.json_reader.services.batch_runner import BatchRunner, SharedRoomFiles
+from src.json_reader.services.cli_parser import CLIArguments, CLIParser
 from src.json_reader.services.data_validator import ValidatorContext
 from src.json_reader.services.data_combiner import DataCombiner
+from src.json_reader.services.data_filter import DataFilter
+from src.json_reader.services.deduplicator import Deduplicator, IdBitmap
+from src.json_reader.services.file_loader import FileLoader
+from src.json_reader.services.join_planner import JoinPlanner
+from src.json_reader.services.metrics import RunMetrics
+from src.json_reader.services.parallel_loader import ParallelLoader
+from src.json_reader.services.parse_cache import ParseCache
+from src.json_reader.services.pipeline import Pipeline
+from src.json_reader.services.profiler import Profiler
+from src.json_reader.services.rejection_sink import RejectionSink
+from src.json_reader.services.room_selection import RoomSelection
+from src.json_reader.services.room_service import RoomIndex, RoomService
+from src.json_reader.constants.cache_constants import CacheConstants
+from src.json_reader.constants.combiner_constants import CombinerConstants
+from src.json_reader.constants.loader_constants import LoaderConstants
+from src.json_reader.constants.pipeline_constants import PipelineConstants
+from src.json_reader.constants.validation_constants import ValidationReasons
 from src.json_reader.exporters.exporter_factory import ExporterFactory
-from src.json_reader.exporters.exporter import JSONExporter, XMLExporter
+from src.json_reader.exporters.incremental_exporter import IncrementalExporter, IncrementalStats
+from src.json_reader.exporters.parallel_exporter import ParallelExporter
+from src.json_reader.exporters.sharded_exporter import ShardedExporter
+from src.json_reader.exporters.exporter import (
+    CSVExporter, ElementTreeXMLExporter, Exporter, JSONExporter, NDJSONExporter, XMLExporter
+)
 
 
 class TestDataValidator(unittest.TestCase):
@@ -39,6 +73,257 @@ class TestDataValidator(unittest.TestCase):
         invalid_room = {"id": 0, "name": ""}  # Invalid values
         self.assertFalse(validator.execute_validation(invalid_room))
 
+    @patch.dict(ValidatorContext._strategies)
+    def test_registered_schema(self):
+        ValidatorContext.register_schema('course', {"fields": [
+            {"name": "code", "type": "str", "non_empty": True},
+            {"name": "credits", "type": "int", "min": 1, "max": 10},
+        ]})
+        validator = ValidatorContext('course')
+
+        mask, reasons = validator.validate_batch([
+            {"code": "CS101", "credits": 5},
+            {"code": "CS102", "credits": 11},
+            {"code": ""},
+        ])
+
+        self.assertEqual(mask, [True, False, False])
+        self.assertEqual(reasons[1], ValidationReasons.INVALID_FIELD)
+        self.assertEqual(reasons[2], ValidationReasons.INCOMPLETE)
+        for bound in (float("nan"), float("inf"), True, "1"):
+            with self.assertRaises(ValueError):
+                ValidatorContext.register_schema('course', {"fields": [{"name": "credits", "type": "int", "min": bound}]})
+
+    def test_validate_batch_matches_single_validation(self):
+        validator = ValidatorContext('student')
+        students = [
+            {"id": 1, "name": "Alice", "room": 101},
+            {"id": 1, "name": "Alice"},
+            {"id": "1", "name": "Alice", "room": 101},
+            {"id": 2, "name": "  ", "room": 101},
+            {"id": 3, "name": "Carol", "room": -1},
+            {"id": 2 ** 70, "name": "Dan", "room": 101},
+        ]
+
+        mask, reasons = validator.validate_batch(students)
+
+        self.assertEqual(mask, [validator.execute_validation(student) for student in students])
+        self.assertEqual(reasons, [
+            ValidationReasons.VALID, ValidationReasons.INCOMPLETE, ValidationReasons.INVALID_ID,
+            ValidationReasons.INVALID_NAME, ValidationReasons.INVALID_ROOM_ID, ValidationReasons.VALID,
+        ])
+
+
+class TestRejectionSink(unittest.TestCase):
+    """Test aggregated reporting of rejected records"""
+
+    def test_counts_samples_and_quarantines(self):
+        students = [{"id": -i, "name": "x", "room": 1} for i in range(1, 11)] + [{"id": 1, "name": "ok", "room": 1}]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            quarantine_path = os.path.join(temp_dir, "rejected.ndjson")
+            sink = RejectionSink(sample_rate=0.5, quarantine_path=quarantine_path)
+
+            with self.assertLogs('src.json_reader.services.rejection_sink', level='WARNING') as logs:
+                valid = list(DataFilter.filter_data((s for s in students), 'student', batch_size=4, sink=sink))
+            sink.close()
+
+            with open(quarantine_path) as f:
+                quarantined = [json.loads(line) for line in f]
+
+        self.assertEqual(valid, students[-1:])
+        self.assertEqual(sink.counts[('student', ValidationReasons.INVALID_ID)], 10)
+        self.assertEqual(len(logs.output), 5)
+        self.assertEqual([line["record"] for line in quarantined], students[:10])
+        self.assertEqual(quarantined[0]["reason"], "invalid id")
+
+
+class TestParseCache(unittest.TestCase):
+    """Test the on-disk cache of validated records"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = ParseCache(os.path.join(self.temp_dir, "cache"))
+        self.path = os.path.join(self.temp_dir, "students.json")
+        self.students = [{"id": 1, "name": "Ålice", "room": 101}, {"id": -2, "name": "bad", "room": 101},
+                         {"id": 3, "name": "Bob", "room": 102, "extra": [1, None]}]
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.students, f, ensure_ascii=False)
+
+    def load(self, cache, selection=None):
+        sink = RejectionSink(sample_rate=0)
+        with patch.object(ParallelLoader, 'load_valid_data', wraps=ParallelLoader.load_valid_data) as loader:
+            records = list(loader(self.path, 'student', 1, sink=sink, cache=cache, selection=selection))
+        return records, sink.counts, loader.call_count
+
+    def test_hit_returns_records_and_rejections_without_parsing(self):
+        expected = [self.students[0], self.students[2]]
+        self.assertEqual(self.load(self.cache), (expected, {('student', ValidationReasons.INVALID_ID): 1}, 2))
+        self.assertEqual(self.load(self.cache), (expected, {('student', ValidationReasons.INVALID_ID): 1}, 1))
+
+    def test_selection_is_cached_apart(self):
+        skipped = {('student', ValidationReasons.NOT_SELECTED): 2}
+        for room_ids, calls in (([102, 103], 2), ([103, 102], 1)):
+            selection = RoomSelection.from_arguments(room_ids)
+            with patch.object(DataFilter, 'filter_data', wraps=DataFilter.filter_data) as filter_data:
+                self.assertEqual(self.load(self.cache, selection), ([self.students[2]], skipped, calls))
+            if calls == 2:
+                self.assertEqual(filter_data.call_args.args[-1], selection)
+
+        expected = [self.students[0], self.students[2]]
+        self.assertEqual(self.load(self.cache), (expected, {('student', ValidationReasons.INVALID_ID): 1}, 2))
+
+    def test_changed_file_is_parsed_again(self):
+        self.load(self.cache)
+        with open(self.path, 'w') as f:
+            json.dump(self.students[:1], f)
+        records, _, calls = self.load(self.cache)
+        self.assertEqual((records, calls), (self.students[:1], 2))
+
+    def test_blocks_and_quarantined_rejections(self):
+        expected = [self.students[0], self.students[2]]
+        with patch.object(CacheConstants, "BLOCK_SIZE", 1):
+            self.assertEqual(self.load(self.cache)[::2], (expected, 2))
+            self.assertEqual(self.load(self.cache)[::2], (expected, 1))
+
+            # the entry holds no rejected records, so a quarantining run parses again and caches them
+            quarantine_path = os.path.join(self.temp_dir, "rejected.ndjson")
+            for calls in (2, 1):
+                sink = RejectionSink(sample_rate=0, quarantine_path=quarantine_path)
+                with patch.object(ParallelLoader, 'load_valid_data', wraps=ParallelLoader.load_valid_data) as loader:
+                    self.assertEqual(list(loader(self.path, 'student', 1, sink=sink, cache=self.cache)), expected)
+                sink.close()
+                self.assertEqual(loader.call_count, calls)
+                with open(quarantine_path, encoding='utf-8') as f:
+                    self.assertEqual([json.loads(line)["record"] for line in f], [self.students[1]])
+
+    def test_eviction_keeps_cache_within_max_size(self):
+        self.cache.max_size = 1
+        self.load(self.cache)
+        self.assertEqual(os.listdir(self.cache.directory), [])
+        self.assertEqual(self.load(self.cache)[2], 2)
+
+
+class TestPipeline(unittest.TestCase):
+    """Test stages connected by bounded queues"""
+
+    def test_stages_keep_order(self):
+        with Pipeline(queue_depth=1, stage_queue_depths={"double": 3}, batch_size=7) as pipeline:
+            numbers = pipeline.stage("numbers", range(100))
+            doubled = pipeline.stage("double", (number * 2 for number in numbers))
+            self.assertEqual(list(doubled), [number * 2 for number in range(100)])
+        self.assertEqual([stage.items for stage in pipeline.stages], [100, 100])
+
+    def test_source_errors_reach_consumer(self):
+        def failing():
+            yield 1
+            raise ValueError("broken input")
+
+        with Pipeline() as pipeline:
+            with self.assertRaisesRegex(ValueError, "broken input"):
+                list(pipeline.stage("failing", failing()))
+
+    def test_close_stops_unfinished_stages(self):
+        def endless():
+            number = 0
+            while True:
+                yield number
+                number += 1
+
+        pipeline = Pipeline(queue_depth=2, batch_size=10)
+        numbers = iter(pipeline.stage("endless", endless()))
+        squares = iter(pipeline.stage("squares", (number * number for number in numbers)))
+        self.assertEqual(next(squares), 0)
+        pipeline.close()
+        self.assertFalse(any(stage._thread.is_alive() for stage in pipeline.stages))
+
+    @patch.object(LoaderConstants, 'MAX_CHUNK_SIZE', 200)
+    @patch.object(LoaderConstants, 'MIN_CHUNK_SIZE', 100)
+    def test_workers_are_not_forked_from_running_stages(self):
+        rooms = [{"id": room_id, "name": f"Room {room_id}", "students": []} for room_id in range(20)]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            rooms_path = os.path.join(temp_dir, "rooms.json")
+            Path(rooms_path).write_text(json.dumps([{"id": room["id"], "name": room["name"]} for room in rooms]))
+            expected_path = os.path.join(temp_dir, "expected.json")
+            JSONExporter().export_file(iter(rooms), expected_path)
+            output_path = os.path.join(temp_dir, "parallel.json")
+
+            with Pipeline() as pipeline:
+                loaded = pipeline.stage("rooms", ParallelLoader.load_valid_data(rooms_path, "room", workers=2))
+                self.assertIn(Pipeline.worker_context().get_start_method(), PipelineConstants.THREAD_SAFE_START_METHODS)
+                combined = ({**room, "students": []} for room in loaded)
+                ParallelExporter(JSONExporter(), workers=2, batch_size=4).export_file(combined, output_path)
+
+            self.assertEqual(Path(output_path).read_bytes(), Path(expected_path).read_bytes())
+
+
+class TestRunMetrics(unittest.TestCase):
+    """Test per-stage timings and counters"""
+
+    def test_stage_time_excludes_pulled_stages(self):
+        metrics = RunMetrics(batch_size=3)
+        numbers = metrics.track("load", range(10), "number")
+        rooms = metrics.track(
+            "combine", ({"students": [number] * number} for number in numbers), "rooms", ("students", "students")
+        )
+        with metrics.measure("export"):
+            self.assertEqual(len(list(rooms)), 10)
+
+        snapshot = metrics.snapshot(RejectionSink(0))
+        self.assertEqual(snapshot["stages"]["load"]["items"], 10)
+        self.assertEqual(snapshot["stages"]["combine"]["items"], 10)
+        self.assertEqual(snapshot["students_emitted"], sum(range(10)))
+        stage_seconds = sum(stage["wall_seconds"] for stage in snapshot["stages"].values())
+        self.assertLessEqual(stage_seconds, snapshot["wall_seconds"])
+
+    def test_write_json_and_prometheus(self):
+        metrics = RunMetrics()
+        list(metrics.track("load_students", [{"id": 1}], "student"))
+        sink = RejectionSink(0)
+        sink.reject_batch("student", [{"id": -1}], [ValidationReasons.INVALID_ID])
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            json_path = os.path.join(temp_dir, "metrics.json")
+            metrics.write(json_path, sink)
+            with open(json_path) as file:
+                self.assertEqual(
+                    json.load(file)["records"]["student"], {"read": 2, "valid": 1, "rejected": 1, "skipped": 0}
+                )
+
+            prometheus_path = os.path.join(temp_dir, "metrics.prom")
+            metrics.write(prometheus_path, sink)
+            with open(prometheus_path) as file:
+                text = file.read()
+            self.assertIn('json_reader_records{type="student",outcome="rejected"} 1\n', text)
+            self.assertIn('json_reader_stage_items{stage="load_students"} 1\n', text)
+
+
+class TestProfiler(unittest.TestCase):
+    """Test the cpu and memory profiling reports"""
+
+    def test_collapse_stacks_splits_shared_callees(self):
+        main, left, right, shared = ("a.py", 1, "main"), ("a.py", 2, "left"), ("a.py", 3, "right"), ("a.py", 4, "shared")
+        stats = {
+            main: (1, 1, 0.1, 1.0, {}),
+            left: (1, 1, 0.1, 0.4, {main: (1, 1, 0.1, 0.4)}),
+            right: (1, 1, 0.2, 0.5, {main: (1, 1, 0.2, 0.5)}),
+            shared: (2, 2, 0.6, 0.6, {left: (1, 1, 0.3, 0.3), right: (1, 1, 0.3, 0.3)}),
+        }
+        collapsed = Profiler.collapse_stacks(stats)
+        self.assertAlmostEqual(collapsed["main (a.py:1)"], 0.1)
+        self.assertAlmostEqual(collapsed["main (a.py:1);left (a.py:2);shared (a.py:4)"], 0.3)
+        self.assertAlmostEqual(collapsed["main (a.py:1);right (a.py:3);shared (a.py:4)"], 0.3)
+        self.assertAlmostEqual(sum(collapsed.values()), 1.0)
+
+    def test_memory_checkpoints(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with Profiler("memory", temp_dir) as profiler:
+                numbers = profiler.checkpoint_after(range(3), "counted")
+                self.assertEqual(list(profiler.checkpoint_before(numbers, "first")), [0, 1, 2])
+            with open(os.path.join(temp_dir, "memory.txt")) as file:
+                checkpoints = [line.split()[2].strip("():") for line in file if line.startswith("==")]
+            self.assertEqual(checkpoints, ["start", "first", "counted", "exported"])
+            self.assertTrue(os.path.exists(os.path.join(temp_dir, "memory_1_first.snapshot")))
+
 
 class TestDataCombiner(unittest.TestCase):
     """Test data combination logic"""
@@ -68,6 +353,269 @@ class TestDataCombiner(unittest.TestCase):
         self.assertEqual(len(result[1]["students"]), 0)  # Physics Lab empty
         self.assertEqual(result[0]["students"][0]["name"], "Alice")
 
+    def test_grouped_students_keep_values_and_order(self):
+        students = [
+            {"id": 1, "name": "Ålice", "room": 101},
+            {"id": 2 ** 70, "name": "Big", "room": 102},
+            {"id": 3, "name": "\ud800 lone surrogate", "room": 101},
+            {"id": True, "name": None, "room": 102},
+            {"id": 5, "name": "Eve", "room": 101},
+        ]
+        result = DataCombiner.group_students_by_room_id(student for student in students)
+
+        self.assertEqual(list(result), [101, 102])
+        self.assertEqual(result[101], [{"id": s["id"], "name": s["name"]} for s in students if s["room"] == 101])
+        self.assertEqual(result[102], [{"id": 2 ** 70, "name": "Big"}, {"id": True, "name": None}])
+        self.assertIs(result[102][1]["id"], True)
+        self.assertEqual(result.get(999, []), [])
+
+    def test_combine_with_memory_budget_matches_in_memory(self):
+        students = [{"id": i, "name": f"Student {i}", "room": (i * 7) % 50} for i in range(5000)]
+        rooms = [{"id": room_id, "name": f"Room {room_id}"} for room_id in range(60)]
+
+        expected = list(DataCombiner.combine_students_with_rooms(
+            (student for student in students), (room for room in rooms)
+        ))
+        spilled = list(DataCombiner.combine_students_with_rooms(
+            (student for student in students), (room for room in rooms), max_memory=1
+        ))
+        with patch.object(CombinerConstants, "MAX_MERGE_FAN_IN", 2):
+            merged_in_passes = list(DataCombiner.combine_students_with_rooms(
+                (student for student in students), (room for room in rooms), max_memory=1
+            ))
+
+        self.assertEqual(spilled, expected)
+        self.assertEqual(merged_in_passes, expected)
+
+    def test_join_strategies_match_on_sorted_inputs(self):
+        students = sorted(
+            ({"id": i, "name": f"Student {i}", "room": (i * 7) % 70} for i in range(500)),
+            key=lambda student: student["room"],
+        )
+        rooms = [{"id": room_id, "name": f"Room {room_id}"} for room_id in (0, 1, 1, *range(5, 60))]
+
+        expected = list(DataCombiner.combine_students_with_rooms(iter(students), iter(rooms)))
+        for strategy in ("hash-rooms", "merge", "spill"):
+            with self.subTest(strategy=strategy):
+                combined = list(DataCombiner.combine_students_with_rooms(
+                    iter(students), iter(rooms), max_memory=1, strategy=strategy
+                ))
+                self.assertEqual(combined, expected)
+                self.assertIsNot(combined[1]["students"], combined[2]["students"])
+
+        with self.assertRaisesRegex(ValueError, "students are not sorted"):
+            list(DataCombiner.merge_students_with_rooms(iter(students[::-1]), iter(rooms)))
+        with self.assertRaisesRegex(ValueError, "rooms are not sorted"):
+            list(DataCombiner.merge_students_with_rooms(iter(students), iter(rooms[::-1])))
+
+    def test_join_planner(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            students_path, rooms_path = os.path.join(temp_dir, "students.json"), os.path.join(temp_dir, "rooms.json")
+            Path(students_path).write_text("[" + "0," * 100 + "0]")
+            Path(rooms_path).write_text("[0]")
+
+            self.assertEqual(JoinPlanner.plan(students_path, rooms_path), "hash-rooms")
+            self.assertEqual(JoinPlanner.plan(rooms_path, students_path), "hash-students")
+            self.assertEqual(JoinPlanner.plan(students_path, rooms_path, max_memory=1024), "spill")
+            self.assertEqual(JoinPlanner.plan(students_path, rooms_path, sorted_by_room=True, max_memory=1024), "merge")
+            self.assertEqual(JoinPlanner.plan(students_path, "missing.json"), "hash-students")
+
+    def test_parse_memory_size(self):
+        self.assertEqual(CLIParser._parse_memory_size("512M"), 512 * 1024 ** 2)
+        self.assertEqual(CLIParser._parse_memory_size("2g"), 2 * 1024 ** 3)
+        self.assertEqual(CLIParser._parse_memory_size("4096"), 4096)
+        for value in ("inf", "nan", "-1", "abc"):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                CLIParser._parse_memory_size(value)
+
+
+class TestDeduplicator(unittest.TestCase):
+    """Test duplicate id detection"""
+
+    def test_policies(self):
+        records = [
+            {"id": 1, "name": "a"}, {"id": 2 ** 40, "name": "b"}, {"id": 1, "name": "c"},
+            {"id": 3, "name": "d"}, {"id": 2 ** 40, "name": "e"}, {"id": 1, "name": "f"},
+        ]
+        expected = {"keep-first": "abd", "keep-last": "def", "reject": "d"}
+        for policy, names in expected.items():
+            with self.subTest(policy=policy):
+                sink = RejectionSink(sample_rate=0)
+                deduplicator = Deduplicator(policy, sink)
+
+                kept = list(deduplicator.deduplicate(iter(records), "student"))
+
+                self.assertEqual("".join(record["name"] for record in kept), names)
+                self.assertEqual(sink.counts[("student", ValidationReasons.DUPLICATE_ID)], len(records) - len(names))
+                unique, duplicates, bitmap_bytes, _ = deduplicator.footprints["student"]
+                self.assertEqual((unique, duplicates), (3, len(records) - len(names)))
+                self.assertGreater(bitmap_bytes, 0)
+
+    def test_id_bitmap(self):
+        bitmap = IdBitmap()
+        self.assertTrue(bitmap.add(0))
+        self.assertTrue(bitmap.add(100_000))
+        self.assertEqual(bitmap.bitmap_bytes, 100_000 // 8 + 1)
+        self.assertEqual(bitmap.overflow_bytes, 0)
+        self.assertTrue(bitmap.add(-5))
+        self.assertTrue(bitmap.add("7"))
+        self.assertTrue(bitmap.add(2 ** 40))
+        self.assertFalse(bitmap.add(100_000))
+        self.assertFalse(bitmap.add(-5))
+        self.assertFalse(bitmap.add("7"))
+        self.assertFalse(bitmap.add(2 ** 40))
+        self.assertIn(0, bitmap)
+        self.assertIn(-5, bitmap)
+        self.assertNotIn(7, bitmap)
+        self.assertNotIn(-6, bitmap)
+        self.assertNotIn(10 ** 9, bitmap)
+        self.assertEqual(bitmap.overflow_bytes,
+                         sys.getsizeof({"7", 2 ** 40}) + sys.getsizeof("7") + sys.getsizeof(2 ** 40))
+
+    def test_id_bitmap_offsets_large_ids(self):
+        bitmap = IdBitmap()
+        first = 10 ** 9
+        ids = [first + 2 * n for n in range(50_000)] + [first - 1000, first + 10 ** 6]
+        self.assertTrue(all(map(bitmap.add, ids)))
+        self.assertFalse(any(map(bitmap.add, ids)))
+        self.assertNotIn(first + 1, bitmap)
+        self.assertEqual(bitmap.overflow_bytes, 0)
+        self.assertLess(bitmap.bitmap_bytes, 2 * (10 ** 6 + 1000) // 8)
+
+
+class TestRoomSelection(unittest.TestCase):
+    """Test skipping rooms and students outside a room selection"""
+
+    def test_selection_skips_before_validation(self):
+        rooms = [
+            {"id": 1, "name": "Lab A"}, {"id": 2, "name": "Hall"}, {"id": 5, "name": "Lab B"},
+            {"id": 9, "name": "Lab C"}, {"id": "x", "name": "Lab D"},
+        ]
+        students = [
+            {"id": 10, "name": "a", "room": 1}, {"id": 11, "name": "b", "room": 2},
+            {"id": 12, "name": "c", "room": 5}, {"id": 13, "name": "d", "room": 9}, {"id": 14, "name": "e"},
+        ]
+        selection = RoomSelection.from_arguments(None, (1, 5), "Lab")
+        sink = RejectionSink(sample_rate=0)
+
+        selected_rooms = DataFilter.filter_data(iter(rooms), "room", 2, sink, selection)
+        selected_rooms, student_selection = selection.for_students(selected_rooms)
+        selected_students = list(DataFilter.filter_data(iter(students), "student", 2, sink, student_selection))
+
+        self.assertEqual([room["id"] for room in selected_rooms], [1, 5])
+        self.assertEqual(student_selection, RoomSelection(frozenset({1, 5})))
+        self.assertEqual([student["id"] for student in selected_students], [10, 12])
+        # records that cannot be matched are left to validation
+        self.assertEqual(sink.counts[("room", ValidationReasons.INVALID_ID)], 1)
+        self.assertEqual(sink.counts[("student", ValidationReasons.INCOMPLETE)], 1)
+        self.assertEqual(sink.counts[("room", ValidationReasons.NOT_SELECTED)], 2)
+        self.assertEqual(sink.counts[("student", ValidationReasons.NOT_SELECTED)], 2)
+        self.assertNotIn(("room", ValidationReasons.NOT_SELECTED), sink.rejection_counts)
+        self.assertIsNone(RoomSelection.from_arguments())
+
+    def test_parse_room_selection(self):
+        self.assertEqual(CLIParser._parse_room_ids("3, 17,42"), (3, 17, 42))
+        self.assertEqual(CLIParser._parse_room_id_range("100-199"), (100, 199))
+        self.assertEqual(CLIParser._parse_room_id_range("100-"), (100, None))
+        self.assertEqual(CLIParser._parse_room_id_range("-199"), (None, 199))
+        for value in ("", "1,a"):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                CLIParser._parse_room_ids(value)
+        for value in ("100", "-", "9-1", "a-b"):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                CLIParser._parse_room_id_range(value)
+
+
+class TestFileLoader(unittest.TestCase):
+    """Test file loading and ijson backend selection"""
+
+    def setUp(self):
+        self.items = [{"id": 1, "name": "Ålice", "room": 101}, {"id": 2, "name": "Bob", "room": 102}]
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as f:
+            json.dump(self.items, f, ensure_ascii=False)
+            self.temp_path = f.name
+
+    def tearDown(self):
+        os.unlink(self.temp_path)
+
+    def test_load_with_mmap_and_small_buffer(self):
+        result = list(FileLoader.load_file_data(self.temp_path, 'python', buffer_size=8, use_mmap=True))
+        self.assertEqual(result, self.items)
+
+    def test_backend_from_environment(self):
+        with patch.dict(os.environ, {LoaderConstants.IJSON_BACKEND_ENV_VAR: 'python'}):
+            self.assertEqual(FileLoader.resolve_backend(), 'python')
+
+    def test_unavailable_backend(self):
+        with self.assertRaises(ValueError):
+            FileLoader.resolve_backend('no_such_backend')
+
+    def test_load_compressed_files(self):
+        payload = json.dumps(self.items, ensure_ascii=False).encode()
+        temp_dir = tempfile.mkdtemp()
+        files = {
+            'rooms.json.gz': gzip.compress(payload),
+            'rooms.json.bz2': bz2.compress(payload),
+            'rooms.json.xz': lzma.compress(payload),
+            'gzip_without_extension.json': gzip.compress(payload),
+        }
+        for name, content in files.items():
+            path = os.path.join(temp_dir, name)
+            with open(path, 'wb') as f:
+                f.write(content)
+            with self.subTest(name=name):
+                self.assertEqual(list(FileLoader.load_file_data(path, buffer_size=8)), self.items)
+                self.assertEqual(list(ParallelLoader.load_valid_data(path, 'student', workers=2)), self.items)
+
+    def test_corrupt_compressed_file(self):
+        data = json.dumps([{"id": index, "name": "x" * 50} for index in range(500)]).encode()
+        cases = [
+            ('.json.gz', gzip.compress(b'[{"id": 1}]')[:-8] + b'garbage!'),
+            ('.json.gz', gzip.compress(data)[:30] + bytes(50) + gzip.compress(data)[80:]),
+            ('.json.bz2', bz2.compress(data)[:-100]),
+            ('.json.xz', lzma.compress(data)[:-100]),
+        ]
+        for index, (suffix, content) in enumerate(cases):
+            with self.subTest(case=index, suffix=suffix):
+                with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+                    f.write(content)
+                    path = f.name
+                try:
+                    with self.assertRaises(OSError):
+                        list(FileLoader.load_file_data(path))
+                finally:
+                    os.unlink(path)
+
+
+class TestParallelLoader(unittest.TestCase):
+    """Test parallel loading against the sequential loader"""
+
+    def setUp(self):
+        tricky_names = ['a},{"id": 1, "name": "x", "room": 2},{', 'quo\\"te\\\\', '[[{', ']}', 'ü∑', '']
+        self.students = [
+            {"id": i if i % 5 else -i, "name": tricky_names[i % len(tricky_names)] + str(i), "room": i % 30}
+            for i in range(2000)
+        ]
+        self.students[7]["extra"] = {"nested": [1, {"a": "]},"}]}
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            json.dump(self.students, f, indent=1)
+            self.temp_path = f.name
+
+    def tearDown(self):
+        os.unlink(self.temp_path)
+
+    @patch.object(LoaderConstants, 'MAX_CHUNK_SIZE', 1000)
+    @patch.object(LoaderConstants, 'MIN_CHUNK_SIZE', 100)
+    def test_parallel_matches_sequential(self):
+        expected = list(DataFilter.filter_data(FileLoader.load_file_data(self.temp_path), 'student'))
+
+        ordered = list(ParallelLoader.load_valid_data(self.temp_path, 'student', 3))
+        unordered = list(ParallelLoader.load_valid_data(self.temp_path, 'student', 3, preserve_order=False))
+
+        self.assertEqual(ordered, expected)
+        self.assertCountEqual(unordered, expected)
+
 
 class TestExporterFactory(unittest.TestCase):
     """Test exporter factory functionality"""
@@ -89,6 +637,33 @@ class TestExporterFactory(unittest.TestCase):
         formats = ExporterFactory.get_supported_formats()
         self.assertIn('json', formats)
         self.assertIn('xml', formats)
+        self.assertIn('ndjson', formats)
+        self.assertIn('csv', formats)
+
+    def test_only_selected_exporter_is_imported(self):
+        script = (
+            "import sys\n"
+            "from src.json_reader.exporters.exporter_factory import ExporterFactory\n"
+            "ExporterFactory.create_exporter('csv')\n"
+            "print(sorted(name for name in sys.modules if name.endswith('_exporter') or name == 'xml.etree.ElementTree'))"
+        )
+        completed = subprocess.run(
+            [sys.executable, "-c", script], cwd=Path(__file__).parent.parent, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(completed.stdout.strip(), "['src.json_reader.exporters.csv_exporter']")
+
+    def test_register_plugin_by_path(self):
+        with patch.dict(ExporterFactory._exporters), patch.object(
+            ExporterFactory, '_entry_points', {'semicolon': 'src.json_reader.exporters.csv_exporter:CSVExporter'}
+        ):
+            ExporterFactory.register('TABLE', 'src.json_reader.exporters.csv_exporter.CSVExporter')
+            self.assertIsInstance(ExporterFactory.create_exporter('table'), CSVExporter)
+            self.assertIsInstance(ExporterFactory.create_exporter('semicolon'), CSVExporter)
+            self.assertIn('semicolon', ExporterFactory.get_supported_formats())
+
+            ExporterFactory.register('broken', 'src.json_reader.exporters.no_such_module:Exporter')
+            with self.assertRaisesRegex(ValueError, "cannot be loaded"):
+                ExporterFactory.create_exporter('broken')
 
 
 class TestExporters(unittest.TestCase):
@@ -117,6 +692,56 @@ class TestExporters(unittest.TestCase):
         finally:
             os.unlink(temp_path)
 
+    def test_json_export_small_chunks_and_compact(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            default_path = os.path.join(temp_dir, "default.json")
+            compact_path = os.path.join(temp_dir, "compact.json")
+
+            exporter = JSONExporter(write_chunk_size=16)
+            exporter.export_file((item for item in self.test_data), default_path)
+            JSONExporter(compact=True).export_file((item for item in self.test_data), compact_path)
+
+            self.assertEqual(Path(default_path).read_text(), "[" + ",".join(json.dumps(r) for r in self.test_data) + "]")
+            self.assertEqual(json.loads(Path(compact_path).read_text()), self.test_data)
+            self.assertNotIn(", ", Path(compact_path).read_text())
+            self.assertEqual(exporter.last_export_stats.rooms, 2)
+            self.assertEqual(exporter.last_export_stats.bytes_written, os.path.getsize(default_path))
+
+    def test_ndjson_and_csv_export(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ndjson_path = os.path.join(temp_dir, "rooms.ndjson")
+            csv_path = os.path.join(temp_dir, "rooms.csv")
+            NDJSONExporter().export_file((item for item in self.test_data), ndjson_path)
+            CSVExporter().export_file((item for item in self.test_data), csv_path)
+
+            with open(ndjson_path) as f:
+                self.assertEqual([json.loads(line) for line in f], self.test_data)
+            with open(csv_path, newline='') as f:
+                rows = list(csv.reader(f))
+
+        self.assertEqual(rows, [
+            ["room_id", "room_name", "student_id", "student_name"],
+            ["101", "Math Lab", "1", "Alice"],
+            ["102", "Physics Lab", "", ""],
+        ])
+
+    def test_compressed_export_matches_plain(self):
+        exporters = [JSONExporter(write_chunk_size=16), NDJSONExporter(), CSVExporter(), XMLExporter()]
+        openers = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for exporter in exporters:
+                plain_path = os.path.join(temp_dir, "rooms" + exporter.extension)
+                exporter.export_file((item for item in self.test_data), plain_path)
+                with open(plain_path, 'rb') as f:
+                    expected = f.read()
+
+                for suffix, opener in openers.items():
+                    with self.subTest(extension=exporter.extension, compression=suffix):
+                        path = plain_path + suffix
+                        exporter.export_file((item for item in self.test_data), path)
+                        with opener(path, 'rb') as f:
+                            self.assertEqual(f.read(), expected)
+
     def test_xml_export(self):
         with tempfile.NamedTemporaryFile(mode='w', suffix='.xml', delete=False) as f:
             temp_path = f.name
@@ -136,6 +761,203 @@ class TestExporters(unittest.TestCase):
         finally:
             os.unlink(temp_path)
 
+    def test_streaming_xml_matches_element_tree(self):
+        rooms = self.test_data + [
+            {"id": 103, "name": 'R&D <"lab"> \'quoted\'', "students": [
+                {"id": 2, "name": "a<b>&c\r\n\t\"d\" ü"},
+                {"id": 'x"\r\n\t<&>', "name": ""},
+            ]},
+        ]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            streaming_path = os.path.join(temp_dir, "streaming.xml")
+            reference_path = os.path.join(temp_dir, "reference.xml")
+            XMLExporter().export_file((room for room in rooms), streaming_path)
+            ElementTreeXMLExporter().export_file((room for room in rooms), reference_path)
+
+            self.assertEqual(Path(streaming_path).read_bytes(), Path(reference_path).read_bytes())
+
+
+class TestIncrementalExporter(unittest.TestCase):
+    """Test exports that only render the rooms changed since the last run"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.state_path = os.path.join(self.temp_dir, "state.json")
+        self.rooms = [
+            {"id": room_id, "name": f"Room & {room_id}", "students": [{"id": room_id * 10, "name": "<Ann>"}]}
+            for room_id in range(1, 6)
+        ]
+        self.changed_rooms = self.rooms[:1] + [{**self.rooms[1], "name": "Renamed"}] + self.rooms[3:] + [
+            {"id": 9, "name": "New", "students": []}
+        ]
+
+    def test_exporter_without_fragments_is_rejected(self):
+        class WholeFileExporter(Exporter):
+            extension = ".txt"
+
+            def export_file(self, data_generator, output_path):
+                pass
+
+        class CountingExporter(JSONExporter):
+            def encode_room(self, room_data):
+                return super().encode_room(room_data)
+
+        exporter = WholeFileExporter()
+        self.assertFalse(exporter.supports_fragments)
+        self.assertTrue(ElementTreeXMLExporter().supports_fragments)
+        self.assertTrue(CountingExporter().supports_fragments)
+        for make in (
+            lambda: IncrementalExporter(exporter, self.state_path),
+            lambda: ShardedExporter(exporter, shards=2),
+            lambda: ParallelExporter(exporter, workers=2),
+        ):
+            with self.assertRaisesRegex(ValueError, "WholeFileExporter"):
+                make()
+
+    def test_fragments_match_export_file(self):
+        for exporter in [JSONExporter(compact=True), NDJSONExporter(), CSVExporter(), XMLExporter()]:
+            path = os.path.join(self.temp_dir, "rooms" + exporter.extension)
+            exporter.export_file(iter(self.rooms), path)
+            fragments = (exporter.encode_header()
+                         + exporter.item_separator.join(map(exporter.encode_room, self.rooms))
+                         + exporter.encode_footer())
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), fragments, exporter.signature())
+
+    def test_patched_output_matches_full_export(self):
+        exporter = XMLExporter()
+        path = os.path.join(self.temp_dir, "rooms.xml")
+        incremental = IncrementalExporter(exporter, self.state_path)
+        self.assertEqual(incremental.export_file(iter(self.rooms), path), IncrementalStats(5, 0, 0, 0))
+
+        with patch.object(exporter, 'encode_room', wraps=exporter.encode_room) as encode_room:
+            stats = incremental.export_file(iter(self.changed_rooms), path)
+        self.assertEqual(stats, IncrementalStats(1, 1, 1, 3))
+        self.assertEqual(encode_room.call_count, 2)
+
+        expected_path = os.path.join(self.temp_dir, "expected.xml")
+        exporter.export_file(iter(self.changed_rooms), expected_path)
+        with open(path, 'rb') as patched, open(expected_path, 'rb') as expected:
+            self.assertEqual(patched.read(), expected.read())
+
+    def test_modified_output_is_rendered_again(self):
+        exporter = JSONExporter()
+        path = os.path.join(self.temp_dir, "rooms.json")
+        incremental = IncrementalExporter(exporter, self.state_path)
+        incremental.export_file(iter(self.rooms), path)
+        with open(path, 'a') as f:
+            f.write(" ")
+
+        incremental.export_file(iter(self.rooms), path)
+        with open(path) as f:
+            self.assertEqual(json.load(f), self.rooms)
+
+    def test_delta_lists_changes_only(self):
+        incremental = IncrementalExporter(JSONExporter(), self.state_path)
+        incremental.export_file(iter(self.rooms), os.path.join(self.temp_dir, "rooms.json"))
+
+        delta_path = os.path.join(self.temp_dir, "delta.ndjson")
+        self.assertEqual(incremental.export_delta(iter(self.changed_rooms), delta_path), IncrementalStats(1, 1, 1, 3))
+        with open(delta_path) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(lines, [
+            {"op": "changed", "room": self.changed_rooms[1]},
+            {"op": "added", "room": self.changed_rooms[-1]},
+            {"op": "removed", "id": 3},
+        ])
+
+
+class TestShardedExporter(unittest.TestCase):
+    """Test exports split into several files"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.rooms = [
+            {"id": room_id, "name": f"Room {room_id}", "students": [{"id": room_id * 10, "name": "Ann"}]}
+            for room_id in range(1, 41)
+        ]
+
+    def test_hash_shards_hold_every_room_once(self):
+        path = os.path.join(self.temp_dir, "rooms.json")
+        shards = ShardedExporter(JSONExporter(), shards=3, writer_threads=2).export_file(iter(self.rooms), path)
+
+        self.assertEqual([os.path.basename(shard.path) for shard in shards],
+                         ["rooms-00000.json", "rooms-00001.json", "rooms-00002.json"])
+        rooms = []
+        for index, shard in enumerate(shards):
+            with open(shard.path) as f:
+                shard_rooms = json.load(f)
+            self.assertEqual(len(shard_rooms), shard.rooms)
+            self.assertTrue(all(ShardedExporter.shard_index(room["id"], 3) == index for room in shard_rooms))
+            rooms.extend(shard_rooms)
+        self.assertEqual(sorted(rooms, key=lambda room: room["id"]), self.rooms)
+
+        with open(os.path.join(self.temp_dir, "rooms.json.manifest.json")) as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest["partitioning"], "hash")
+        self.assertEqual([(entry["path"], entry["rooms"], entry["bytes"]) for entry in manifest["shards"]],
+                         [(os.path.basename(shard.path), shard.rooms, shard.bytes) for shard in shards])
+
+    def test_size_shards_concatenate_to_the_single_file(self):
+        exporter = CSVExporter(write_chunk_size=100)
+        single_path = os.path.join(self.temp_dir, "single.csv")
+        exporter.export_file(iter(self.rooms), single_path)
+        path = os.path.join(self.temp_dir, "rooms.csv")
+        ShardedExporter(exporter, shards=8).export_file(iter(self.rooms), path)
+
+        shards = ShardedExporter(exporter, max_shard_size=300).export_file(iter(self.rooms), path)
+
+        self.assertGreater(len(shards), 3)
+        self.assertTrue(all(shard.bytes <= 300 for shard in shards))
+        header = exporter.encode_header()
+        with open(single_path, "rb") as f:
+            expected = f.read()
+        contents = []
+        for shard in shards:
+            with open(shard.path, "rb") as f:
+                contents.append(f.read().removeprefix(header))
+        self.assertEqual(header + b"".join(contents), expected)
+        self.assertEqual(sorted(os.listdir(self.temp_dir)),
+                         sorted(["single.csv", "rooms.csv.manifest.json"] + [os.path.basename(s.path) for s in shards]))
+
+
+    def test_braces_in_output_path(self):
+        directory = os.path.join(self.temp_dir, "run{1}")
+        path = os.path.join(directory, "rooms{x}.json.gz")
+        for options in ({"shards": 2}, {"max_shard_size": 300}):
+            with self.subTest(**options):
+                shards = ShardedExporter(JSONExporter(), **options).export_file(iter(self.rooms), path)
+
+                self.assertEqual(os.path.basename(shards[0].path), "rooms{x}-00000.json.gz")
+                self.assertTrue(all(os.path.dirname(shard.path) == directory for shard in shards))
+                rooms = []
+                for shard in shards:
+                    with gzip.open(shard.path, "rt") as f:
+                        rooms.extend(json.load(f))
+                self.assertEqual(sorted(rooms, key=lambda room: room["id"]), self.rooms)
+                self.assertTrue(os.path.exists(os.path.join(directory, "rooms{x}.json.manifest.json")))
+
+class TestParallelExporter(unittest.TestCase):
+    """Test exports rendered on a process pool"""
+
+    def test_output_matches_export_file(self):
+        rooms = [
+            {"id": room_id, "name": f"Room & {room_id}", "students": [{"id": room_id * 10, "name": "<Ann>"}] * room_id}
+            for room_id in range(1, 30)
+        ]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for exporter in [JSONExporter(), JSONExporter(compact=True), NDJSONExporter(), CSVExporter(), XMLExporter()]:
+                for room_count in (0, len(rooms)):
+                    with self.subTest(exporter=exporter.signature(), rooms=room_count):
+                        expected_path = os.path.join(temp_dir, "expected" + exporter.extension)
+                        exporter.export_file(iter(rooms[:room_count]), expected_path)
+                        path = os.path.join(temp_dir, "parallel" + exporter.extension)
+                        ParallelExporter(exporter, workers=2, batch_size=4).export_file(iter(rooms[:room_count]), path)
+
+                        with open(path, "rb") as f, open(expected_path, "rb") as expected:
+                            self.assertEqual(f.read(), expected.read())
+                        self.assertEqual(exporter.last_export_stats.rooms, room_count)
+
 
 class TestCLIParser(unittest.TestCase):
     """Test CLI parsing and validation"""
@@ -164,6 +986,23 @@ class TestCLIParser(unittest.TestCase):
         result = CLIParser.parse_cli()
         self.assertEqual(result[2], 'json')  # output_format
         self.assertEqual(result[3], '/output')  # output_destination
+        self.assertTrue(result.use_cache)
+
+    def test_stage_queue_depth(self):
+        self.assertEqual(CLIParser._parse_stage_queue_depth("rooms=64"), ("rooms", 64))
+        for value in ("rooms", "export=2", "rooms=0", "rooms=x"):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                CLIParser._parse_stage_queue_depth(value)
+
+    def test_output_format_from_extension(self):
+        self.assertEqual(CLIParser._resolve_output_format(None, "out/rooms.ndjson"), "ndjson")
+        self.assertEqual(CLIParser._resolve_output_format("xml", "out/rooms.xml.gz"), "xml")
+        self.assertEqual(CLIParser._resolve_output_format("csv", "out/rooms.csv"), "csv")
+        self.assertEqual(CLIParser._resolve_output_format(None, "/output"), "json")
+        with self.assertRaises(ValueError):
+            CLIParser._resolve_output_format("xml", "out/rooms.json")
+        with self.assertRaises(ValueError):
+            CLIParser._resolve_output_format(None, "out/rooms.txt")
 
     def test_validate_output_path_creates_directory(self):
         output_path = Path(self.temp_dir) / "new_dir" / "output.json"
@@ -171,6 +1010,218 @@ class TestCLIParser(unittest.TestCase):
         self.assertTrue(output_path.parent.exists())
 
 
+class TestBatchRunner(unittest.TestCase):
+    """Test manifest-driven batch runs"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.temp_dir, "students.json"), 'w') as f:
+            json.dump([{"id": 1, "name": "Alice", "room": 101}, {"id": -1, "name": "bad", "room": 101}], f)
+        with open(os.path.join(self.temp_dir, "rooms.json"), 'w') as f:
+            json.dump([{"id": 101, "name": "Math Lab"}], f)
+        self.defaults = CLIArguments(None, None, None, "/output", use_cache=False, rejection_sample_rate=0)
+
+    def write_manifest(self, name, content):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_load_toml_manifest(self):
+        path = self.write_manifest("jobs.toml", """
+[[jobs]]
+name = "east"
+student_file_path = "students.json"
+room_file_path = "rooms.json"
+output_destination = "out/east.csv"
+write_chunk_size = "64K"
+
+room_id_range = [100, 199]
+stage_queue_depths = {export = 2}
+
+[[jobs]]
+student_file_path = "students.json"
+room_file_path = "rooms.json"
+workerz = 2
+""")
+        east, broken = BatchRunner.load_manifest(path, self.defaults)
+        self.assertEqual(east.name, "east")
+        self.assertEqual(east.arguments.room_file_path, os.path.join(self.temp_dir, "rooms.json"))
+        self.assertEqual(east.arguments.write_chunk_size, 64 * 1024)
+        self.assertEqual(east.arguments.room_id_range, [100, 199])
+        self.assertIsNone(broken.arguments)
+        self.assertIn("workerz", broken.error)
+
+    def test_manifest_values_are_type_checked(self):
+        path = self.write_manifest("typed.json", json.dumps([
+            {"student_file_path": "s.json", "room_file_path": "r.json", "output_destination": "o.json", **option}
+            for option in ({"workers": "2"}, {"compact_json": "yes"}, {"workers": True}, {"max_memory": "lots"},
+                           {"room_ids": [1, "2"]}, {"rejection_sample_rate": 1}, {"room_id_range": [1, None]})
+        ]))
+        jobs = BatchRunner.load_manifest(path, self.defaults)
+        self.assertEqual([job.arguments is None for job in jobs], [True, True, True, True, True, False, False])
+        self.assertIn("workers", jobs[0].error)
+
+    def test_jobs_report_separately(self):
+        jobs = [
+            {"name": "json", "student_file_path": "students.json", "room_file_path": "rooms.json",
+             "output_destination": "out/rooms.json"},
+            {"name": "missing", "student_file_path": "nope.json", "room_file_path": "rooms.json",
+             "output_destination": "out/missing.json"},
+            {"name": "xml", "student_file_path": "students.json", "room_file_path": "rooms.json",
+             "output_destination": "out/rooms.xml"},
+        ]
+        path = self.write_manifest("jobs.json", json.dumps({"jobs": jobs}))
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                results = BatchRunner.run(BatchRunner.load_manifest(path, self.defaults), workers, application.run_job)
+                self.assertEqual([(r.name, r.succeeded) for r in results],
+                                 [("json", True), ("missing", False), ("xml", True)])
+                self.assertEqual(BatchRunner.exit_status(results), 1)
+                with open(os.path.join(self.temp_dir, "out", "rooms.json")) as f:
+                    self.assertEqual(json.load(f)[0]["students"], [{"id": 1, "name": "Alice"}])
+
+    def test_shared_room_files_load_once(self):
+        arguments = self.defaults._replace(room_file_path=os.path.join(self.temp_dir, "rooms.json"))
+        shared_rooms = SharedRoomFiles()
+        sinks = [RejectionSink(sample_rate=0), RejectionSink(sample_rate=0)]
+        with patch.object(ParallelLoader, 'load_valid_data', wraps=ParallelLoader.load_valid_data) as loader:
+            loaded = [list(shared_rooms.load(arguments, sink)) for sink in sinks]
+        self.assertEqual(loaded[0], loaded[1])
+        self.assertEqual(loader.call_count, 1)
+
+
+class TestRoomService(unittest.TestCase):
+    """Test lookups served from an in-memory index"""
+
+    def setUp(self):
+        self.rooms = [{"id": 1, "name": "Room 1"}, {"id": 2, "name": "Room 2"}]
+        self.students = [
+            {"id": 10, "name": "Alice", "room": 1},
+            {"id": 11, "name": "Bob", "room": 2},
+            {"id": 10, "name": "Alice again", "room": 2},
+        ]
+
+    def test_index_lookups_and_export(self):
+        index = RoomIndex(iter(self.rooms), iter(self.students))
+        self.assertEqual(index.room(2)["students"], [{"id": 11, "name": "Bob"}, {"id": 10, "name": "Alice again"}])
+        self.assertIsNone(index.room(3))
+        self.assertEqual([room["id"] for room in index.rooms_of_student(10)], [1, 2])
+        self.assertIsNone(index.rooms_of_student(12))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "rooms.xml")
+            XMLExporter().export_file(DataCombiner.combine_students_with_rooms(iter(self.students), iter(self.rooms)),
+                                      output_path)
+            self.assertEqual(index.export("xml"), Path(output_path).read_bytes())
+
+    def test_serves_requests_and_reloads_changed_files(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            rooms_path = os.path.join(temp_dir, "rooms.json")
+            students_path = os.path.join(temp_dir, "students.json")
+            Path(rooms_path).write_text(json.dumps(self.rooms))
+            Path(students_path).write_text(json.dumps(self.students))
+
+            service = RoomService(CLIArguments(
+                students_path, rooms_path, "json", "/output", use_cache=False, serve_address="127.0.0.1:0",
+            ))
+            server = service.create_server()
+            thread = threading.Thread(target=server.serve_forever)
+            thread.start()
+            try:
+                url = "http://127.0.0.1:{}".format(server.server_address[1])
+                with urllib.request.urlopen(url + "/students/11/rooms") as response:
+                    self.assertEqual(json.load(response), [{"id": 2, "name": "Room 2"}])
+                with self.assertRaises(urllib.error.HTTPError) as context:
+                    urllib.request.urlopen(url + "/rooms/3")
+                self.assertEqual(context.exception.code, 404)
+
+                Path(rooms_path).write_text(json.dumps(self.rooms + [{"id": 3, "name": "Room 3"}]))
+                os.utime(rooms_path, ns=(0, 0))
+                self.assertTrue(service.reload_if_changed())
+                with urllib.request.urlopen(url + "/rooms/3") as response:
+                    self.assertEqual(json.load(response), {"id": 3, "name": "Room 3", "students": []})
+            finally:
+                server.shutdown()
+                thread.join()
+                service.shutdown(server)
+
+    def test_failed_export_is_a_server_error(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            rooms_path = os.path.join(temp_dir, "rooms.json")
+            students_path = os.path.join(temp_dir, "students.json")
+            Path(rooms_path).write_text(json.dumps(self.rooms))
+            Path(students_path).write_text(json.dumps(self.students))
+
+            service = RoomService(CLIArguments(
+                students_path, rooms_path, "json", "/output", use_cache=False, serve_address="127.0.0.1:0",
+            ))
+            server = service.create_server()
+            thread = threading.Thread(target=server.serve_forever)
+            thread.start()
+            try:
+                url = "http://127.0.0.1:{}".format(server.server_address[1])
+                with self.assertRaises(urllib.error.HTTPError) as context:
+                    urllib.request.urlopen(url + "/export?format=yaml")
+                self.assertEqual(context.exception.code, 400)
+                with patch.object(XMLExporter, "encode_room", side_effect=ValueError("broken")), \
+                        self.assertLogs(level="ERROR"):
+                    with self.assertRaises(urllib.error.HTTPError) as context:
+                        urllib.request.urlopen(url + "/export?format=xml")
+                self.assertEqual(context.exception.code, 500)
+                with urllib.request.urlopen(url + "/export?format=xml") as response:
+                    self.assertTrue(response.read().startswith(b"<?xml"))
+            finally:
+                server.shutdown()
+                thread.join()
+                service.shutdown(server)
+
+    def test_unix_socket_path_must_be_a_socket(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            rooms_path = os.path.join(temp_dir, "rooms.json")
+            students_path = os.path.join(temp_dir, "students.json")
+            Path(rooms_path).write_text(json.dumps(self.rooms))
+            Path(students_path).write_text(json.dumps(self.students))
+            socket_path = os.path.join(temp_dir, "rooms.sock")
+            Path(socket_path).write_text("not a socket")
+
+            service = RoomService(CLIArguments(
+                students_path, rooms_path, "json", "/output", use_cache=False, serve_address=socket_path,
+            ))
+            with self.assertRaises(FileExistsError):
+                service.create_server()
+            self.assertEqual(Path(socket_path).read_text(), "not a socket")
+
+            os.remove(socket_path)
+            service.create_server().server_close()
+            self.assertTrue(os.path.exists(socket_path))
+            service.shutdown(service.create_server())
+            self.assertFalse(os.path.exists(socket_path))
+
+    def test_watch_survives_failed_reloads(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            rooms_path = os.path.join(temp_dir, "rooms.json")
+            students_path = os.path.join(temp_dir, "students.json")
+            Path(rooms_path).write_text(json.dumps(self.rooms))
+            Path(students_path).write_text(json.dumps(self.students))
+
+            service = RoomService(CLIArguments(
+                students_path, rooms_path, "json", "/output", use_cache=False, watch_interval=0.01,
+            ))
+            calls = []
+
+            def reload_if_changed(previous_signature=None):
+                calls.append(previous_signature)
+                if len(calls) == 3:
+                    service._stop.set()
+                raise RuntimeError("broken")
+
+            with patch.object(service, "reload_if_changed", side_effect=reload_if_changed), \
+                    self.assertLogs(level="ERROR"):
+                service._watch()
+            self.assertEqual(len(calls), 3)
+
+
 class TestIntegration(unittest.TestCase):
     """Integration tests for complete workflow"""
 